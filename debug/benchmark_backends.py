@@ -0,0 +1,84 @@
+"""
+benchmark_backends.py
+
+Compare the feature backends of find_sift (SIFT, ORB, AKAZE) on recorded frames.
+For every frame and backend the screen features are extracted once (as the bot does) and every
+template is matched against them. The report shows the screen extraction cost per frame and,
+per template, the hit rate and mean matching latency of each backend, so cheap backends can be
+assigned to the hot templates (FEATURE_BACKENDS in .env).
+
+Usage:
+    python debug/benchmark_backends.py --replay debug_screenshots/ --frames 50
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import time
+from shared_state import shared_state
+from utils.ocr_utils import OCRUtils
+from utils.feature_cache import BACKENDS
+
+
+def benchmark(templates, frames, backends, min_match_count):
+    ocr = OCRUtils()
+    # Only the explicit refresh below may advance the replay
+    ocr.frame_bus.max_age_ms = float("inf")
+    images = {os.path.basename(path): shared_state.load_image(path) for path in templates}
+    extract_ms = {backend: 0.0 for backend in backends}
+    # (template, backend) -> [total ms, hits]
+    stats = {(name, backend): [0.0, 0] for name in images for backend in backends}
+    count = 0
+
+    for _ in range(frames):
+        frame = ocr.frame_bus.get_frame(max_age_ms=0)
+        if frame is None:
+            break
+        count += 1
+        bbox = frame.clip(ocr.window_coords)
+        for backend in backends:
+            start = time.perf_counter()
+            ocr.get_screen_features(frame, bbox, backend)
+            extract_ms[backend] += (time.perf_counter() - start) * 1000
+            for name, image in images.items():
+                if image is None:
+                    continue
+                # Template features are cached after the first frame, like in the bot
+                start = time.perf_counter()
+                point = ocr.find_sift(image, min_match_count=min_match_count, backend=backend)
+                stats[(name, backend)][0] += (time.perf_counter() - start) * 1000
+                stats[(name, backend)][1] += 1 if point else 0
+
+    if not count:
+        print("No frames.")
+        return
+    print(f"\nScreen feature extraction ({count} frames)")
+    for backend in backends:
+        print(f"  {backend:<8} {extract_ms[backend] / count:>9.2f} ms/frame")
+
+    print(f"\n{'template':<25} {'backend':<8} {'hit rate':>9} {'match ms':>9}")
+    print("-" * 55)
+    for name in images:
+        for backend in backends:
+            total, hits = stats[(name, backend)]
+            print(f"{name:<25} {backend:<8} {hits / count:>8.0%} {total / count:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare SIFT/ORB/AKAZE feature matching on recorded frames.")
+    parser.add_argument("--replay", required=True, help="PNG directory or video file (read by shared_state)")
+    parser.add_argument("--window", help="Window title (read by shared_state)")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--min-match-count", type=int, default=8, help="Same default as OCRUtils.find")
+    parser.add_argument(
+        "--templates",
+        nargs="+",
+        default=[
+            os.path.join(shared_state.current_path, "images", name)
+            for name in ("go.png", "in-home-icon.png", "autoroll.png", "build.png")
+        ],
+    )
+    args = parser.parse_args()
+    benchmark(args.templates, args.frames, args.backends, args.min_match_count)
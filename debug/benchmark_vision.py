@@ -0,0 +1,90 @@
+"""
+benchmark_vision.py
+
+Benchmark detection and OCR throughput against a recorded session, headless.
+
+Usage:
+    python debug/benchmark_vision.py --replay debug_screenshots/ --frames 50
+    python debug/benchmark_vision.py --replay session.mp4 --templates images/go.png images/in-home-icon.png
+
+--replay is read by shared_state (same as FRAME_SOURCE in .env), so every vision path below runs
+on the recorded frames instead of the live BlueStacks window.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import time
+from shared_state import shared_state
+from utils.ocr_utils import OCRUtils
+from utils.ocr_cache import ocr_cache
+from utils.location_memory import location_memory
+
+# Same regions as PlayerInfo (see regions.json)
+OCR_REGIONS = ("money", "rolls", "multiplier")
+
+
+def timed(stats, key, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = (time.perf_counter() - start) * 1000
+    total, hits, count = stats.get(key, (0.0, 0, 0))
+    stats[key] = (total + elapsed, hits + (1 if result else 0), count + 1)
+    return result
+
+
+def benchmark(templates, frames, skip_ocr):
+    ocr = OCRUtils()
+    print(f"Frame source: {ocr.frame_bus.source.name}")
+    print(f"Frame geometry: {ocr.window}")
+    images = {os.path.basename(path): shared_state.load_image(path) for path in templates}
+    stats = {}
+    # Only the explicit refresh below may advance the replay
+    ocr.frame_bus.max_age_ms = float("inf")
+
+    for _ in range(frames):
+        # Force a new frame for every iteration, then every call below shares it
+        if ocr.frame_bus.get_frame(max_age_ms=0) is None:
+            break
+        for name, image in images.items():
+            if image is None:
+                continue
+            timed(stats, f"find_template {name}", ocr.find_template, image)
+            timed(stats, f"find_sift     {name}", ocr.find_sift, image)
+            # find() checks the last known location first (see location_memory.py)
+            timed(stats, f"find          {name}", ocr.find, image)
+        if not skip_ocr:
+            for name in OCR_REGIONS:
+                timed(stats, f"ocr_region    {name}", ocr.ocr_region, name)
+            # Same regions in a single batched call (answers also land in the OCR cache, so run it last)
+            timed(stats, "ocr_regions   all", ocr.ocr_regions, OCR_REGIONS)
+
+    print(f"\n{'call':<45} {'mean ms':>9} {'hits':>6} {'calls':>6}")
+    print("-" * 70)
+    for key, (total, hits, count) in stats.items():
+        print(f"{key:<45} {total / count:>9.2f} {hits:>6} {count:>6}")
+    print(f"\nCaptures: {ocr.frame_bus.captures}, frame requests: {ocr.frame_bus.requests}")
+    print(f"OCR cache: {ocr_cache.hits} hits, {ocr_cache.misses} misses ({ocr_cache.hit_rate:.0%})")
+    print(
+        f"Location memory: {location_memory.hits} hits, {location_memory.misses} misses "
+        f"({location_memory.hit_rate:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vision paths on recorded frames.")
+    parser.add_argument("--replay", required=True, help="PNG directory or video file (read by shared_state)")
+    parser.add_argument("--window", help="Window title (read by shared_state)")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument(
+        "--templates",
+        nargs="+",
+        default=[
+            os.path.join(shared_state.current_path, "images", name)
+            for name in ("go.png", "in-home-icon.png", "autoroll.png", "build.png")
+        ],
+    )
+    parser.add_argument("--skip-ocr", action="store_true", help="Skip Tesseract (if not installed)")
+    args = parser.parse_args()
+    benchmark(args.templates, args.frames, args.skip_ocr)
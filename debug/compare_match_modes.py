@@ -0,0 +1,81 @@
+"""
+compare_match_modes.py
+
+Check the coarse-to-fine ("pyramid") template matching mode against the exhaustive mode on recorded frames.
+For every frame and template both modes are run on the same frame; the report shows, per template,
+how often they agree (both miss, or both hit within TOLERANCE_PX of each other) and their mean latency.
+
+Usage:
+    python debug/compare_match_modes.py --replay debug_screenshots/ --frames 50
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import time
+from shared_state import shared_state
+from utils.ocr_utils import OCRUtils
+
+TOLERANCE_PX = 3
+
+
+def compare(templates, frames, threshold, force_sweep):
+    ocr = OCRUtils()
+    # Only the explicit refresh below may advance the replay
+    ocr.frame_bus.max_age_ms = float("inf")
+    images = {os.path.basename(path): shared_state.load_image(path) for path in templates}
+    results = {name: {"agree": 0, "total": 0, "hits": [0, 0], "ms": [0.0, 0.0]} for name in images}
+
+    for _ in range(frames):
+        if ocr.frame_bus.get_frame(max_age_ms=0) is None:
+            break
+        for name, image in images.items():
+            if image is None:
+                continue
+            points = []
+            for i, mode in enumerate(("exhaustive", "pyramid")):
+                start = time.perf_counter()
+                point = ocr.find_template(image, threshold=threshold, mode=mode, force_sweep=force_sweep)
+                results[name]["ms"][i] += (time.perf_counter() - start) * 1000
+                results[name]["hits"][i] += 1 if point else 0
+                points.append(point)
+            exhaustive, pyramid = points
+            agree = (exhaustive is None and pyramid is None) or (
+                exhaustive is not None
+                and pyramid is not None
+                and abs(exhaustive[0] - pyramid[0]) <= TOLERANCE_PX
+                and abs(exhaustive[1] - pyramid[1]) <= TOLERANCE_PX
+            )
+            results[name]["agree"] += 1 if agree else 0
+            results[name]["total"] += 1
+
+    print(f"\n{'template':<25} {'agree':>8} {'hits ex/py':>12} {'ms ex':>8} {'ms py':>8} {'speedup':>8}")
+    print("-" * 75)
+    for name, r in results.items():
+        if not r["total"]:
+            continue
+        ms_ex, ms_py = r["ms"][0] / r["total"], r["ms"][1] / r["total"]
+        print(
+            f"{name:<25} {r['agree'] / r['total']:>7.0%} {r['hits'][0]:>5}/{r['hits'][1]:<6}"
+            f" {ms_ex:>8.2f} {ms_py:>8.2f} {ms_ex / max(ms_py, 1e-6):>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare pyramid and exhaustive template matching.")
+    parser.add_argument("--replay", required=True, help="PNG directory or video file (read by shared_state)")
+    parser.add_argument("--window", help="Window title (read by shared_state)")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=0.65)
+    parser.add_argument("--sweep", action="store_true", help="Sweep all scales instead of the calibrated one")
+    parser.add_argument(
+        "--templates",
+        nargs="+",
+        default=[
+            os.path.join(shared_state.current_path, "images", name)
+            for name in ("go.png", "in-home-icon.png", "autoroll.png", "build.png")
+        ],
+    )
+    args = parser.parse_args()
+    compare(args.templates, args.frames, args.threshold, args.sweep)
@@ -0,0 +1,151 @@
+"""
+train_glyphs.py
+
+Build the glyph templates of the numeric recognizer (utils/glyph_ocr.py) from labeled crops.
+
+Crops are organised like for debug/tune_ocr.py: one folder per field, each with a labels.json mapping
+crop files to their text, and a folder reads with the settings (charset, text polarity) of the region
+with its name, or of the first region ending in "_<name>" (cost -> building1_cost):
+    debug_screenshots/glyphs/
+        money/labels.json       {"money_01.png": "7,405,483", ...}
+        rolls/labels.json       {"rolls_01.png": "0/50", ...}
+        multiplier/labels.json  {"multiplier_01.png": "x1", ...}
+        cost/labels.json        {"cost_01.png": "449K", ...}
+Crops are raw captures of a field (e.g. cut from debug_screenshots/ or sampled by the debug sink). Each
+crop is segmented exactly like at runtime; crops whose glyph count does not match their label are reported
+and skipped. Up to --max-per-glyph distinct samples per character and field (the fields render the font at
+different sizes) are written to images/glyphs/, then
+every crop is read back to report accuracy and latency per field.
+
+--heldout takes a second folder laid out the same way, with crops never used for the templates
+(debug_screenshots/glyphs_heldout/): its report is the accuracy to expect on new captures. A wrong read
+there is a misread value at runtime; an unread field only costs a Tesseract fallback.
+
+Usage:
+    python debug/train_glyphs.py --crops debug_screenshots/glyphs --heldout debug_screenshots/glyphs_heldout
+    python debug/train_glyphs.py --crops debug_screenshots/glyphs --evaluate-only
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import json
+import time
+import cv2
+from utils.glyph_ocr import GlyphOCR, GLYPH_DIR, binarize, segment, normalize_glyph, label_to_name, text_is_bright
+
+REGIONS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "regions.json")
+# Samples more similar than this to an already kept sample of the same character are dropped
+DUPLICATE_SCORE = 0.98
+# Latency is measured over this many reads of every crop
+REPEATS = 20
+
+
+def region_for(field, regions):
+    if field in regions:
+        return regions[field]
+    for name, region in regions.items():
+        if name.endswith(f"_{field}"):
+            return region
+    return None
+
+
+def load_fields(crops_dir, regions_file):
+    """
+    Returns:
+        dict: field -> (region settings, [(crop path, image, text)])
+    """
+    with open(regions_file, "r") as f:
+        regions = json.load(f)
+    fields = {}
+    for field in sorted(os.listdir(crops_dir)):
+        labels_path = os.path.join(crops_dir, field, "labels.json")
+        if not os.path.isfile(labels_path):
+            continue
+        region = region_for(field, regions)
+        if region is None or not region.get("charset"):
+            print(f"[SKIP] No region with a charset named '{field}' or '*_{field}' in {regions_file}")
+            continue
+        with open(labels_path, "r") as f:
+            labels = json.load(f)
+        crops = []
+        for file, text in labels.items():
+            path = os.path.join(crops_dir, field, file)
+            image = cv2.imread(path)
+            if image is None:
+                print(f"[SKIP] Cannot read {path}")
+                continue
+            crops.append((path, image, text))
+        fields[field] = (region, crops)
+    return fields
+
+
+def train(fields, glyph_dir, max_per_glyph):
+    os.makedirs(glyph_dir, exist_ok=True)
+    for file in os.listdir(glyph_dir):
+        if file.lower().endswith(".png"):
+            os.remove(os.path.join(glyph_dir, file))
+    samples = {}
+    for field, (region, crops) in fields.items():
+        for path, image, text in crops:
+            glyphs = [glyph for glyph in segment(binarize(image, text_is_bright(region))) if not glyph[4]]
+            characters = [c for c in text if c not in " .,"]
+            if len(glyphs) != len(characters):
+                print(f"[SKIP] {path}: {len(glyphs)} glyphs for '{text}'")
+                continue
+            for character, (_, _, _, _, _, glyph) in zip(characters, glyphs):
+                kept = samples.setdefault(character, [])
+                if sum(1 for _, _, kept_field in kept if kept_field == field) >= max_per_glyph:
+                    continue
+                vector = normalize_glyph(glyph)
+                if any(float(vector @ other) > DUPLICATE_SCORE for other, _, _ in kept):
+                    continue
+                kept.append((vector, glyph, field))
+
+    for character, kept in sorted(samples.items()):
+        for i, (_, glyph, _) in enumerate(kept):
+            cv2.imwrite(os.path.join(glyph_dir, f"{label_to_name(character)}_{i}.png"), glyph * 255)
+        print(f"'{character}': {len(kept)} samples")
+
+
+def evaluate(fields, glyph_dir, title):
+    recognizer = GlyphOCR(glyph_dir)
+    print(f"\n{title}")
+    print(f"{'field':<12} {'correct':>8} {'wrong':>6} {'unread':>7} {'mean ms':>8}")
+    print("-" * 45)
+    for field, (region, crops) in fields.items():
+        correct = wrong = unread = 0
+        elapsed = 0.0
+        charset, bright_text = region["charset"], text_is_bright(region)
+        for path, image, text in crops:
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                result = recognizer.recognize(image, charset, bright_text)
+            elapsed += (time.perf_counter() - start) / REPEATS
+            if result is None:
+                unread += 1
+            elif result == text:
+                correct += 1
+            else:
+                wrong += 1
+                print(f"[WRONG] {os.path.basename(path)}: read '{result}', expected '{text}'")
+        if crops:
+            print(f"{field:<12} {correct:>5}/{len(crops):<2} {wrong:>6} {unread:>7} {elapsed / len(crops) * 1000:>8.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the numeric glyph recognizer from labeled crops.")
+    parser.add_argument("--crops", required=True, help="Folder with one labeled folder per field")
+    parser.add_argument("--heldout", help="Folder with labeled crops to evaluate only, laid out like --crops")
+    parser.add_argument("--glyph-dir", default=GLYPH_DIR)
+    parser.add_argument("--regions", default=REGIONS_FILE)
+    parser.add_argument("--max-per-glyph", type=int, default=5)
+    parser.add_argument("--evaluate-only", action="store_true")
+    args = parser.parse_args()
+    fields = load_fields(args.crops, args.regions)
+    if not args.evaluate_only:
+        train(fields, args.glyph_dir, args.max_per_glyph)
+    evaluate(fields, args.glyph_dir, "Training crops")
+    if args.heldout:
+        evaluate(load_fields(args.heldout, args.regions), args.glyph_dir, "Held-out crops")
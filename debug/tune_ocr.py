@@ -0,0 +1,187 @@
+"""
+tune_ocr.py
+
+Search OCR preprocessing and Tesseract settings for the regions of regions.json against labeled crops.
+
+Crops are organised in one folder per field, each with a labels.json mapping crop files to their text
+(same format as debug/train_glyphs.py):
+    debug_screenshots/ocr_tuning/
+        money/labels.json       {"money_01.png": "1,250,300", ...}
+        rolls/labels.json       {"rolls_01.png": "35/50", ...}
+        cost/labels.json        {"cost_01.png": "1.2M", ...}
+        wait_time/labels.json   {"wait_01.png": "57:52", ...}
+A folder tunes the region with its name, or every region ending in "_<name>" (cost -> building1_cost ...).
+
+Every combination of threshold, invert, scale factor and page segmentation mode is evaluated in a
+process pool (the region's whitelist is kept). The fastest combination reaching --target accuracy is
+written to regions.json, which the handlers load at startup, and a per-region accuracy/latency report is
+printed (current settings vs. best). Latencies are measured with all workers busy: compare them with
+each other, not with the bot.
+
+Usage:
+    python debug/tune_ocr.py --crops debug_screenshots/ocr_tuning
+    python debug/tune_ocr.py --crops debug_screenshots/ocr_tuning --fields money rolls --target 0.98 --dry-run
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import argparse
+import itertools
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+from pytesseract import pytesseract
+from utils.preprocess import Pipeline
+from utils.ocr_engine import create_ocr_engine
+
+pytesseract.tesseract_cmd = r"C:\\Program Files\\Tesseract-OCR\\tesseract.exe"
+
+REGIONS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "regions.json")
+THRESHOLDS = (None, 75, 100, 125, 150, 175, 200)
+SCALE_FACTORS = (1, 2, 3, 4)
+PSMS = (6, 7, 8, 13)
+
+# Per worker process: the OCR engine and field -> [(crop, label)]
+_engine = None
+_dataset = None
+
+
+def load_crops(folder):
+    with open(os.path.join(folder, "labels.json"), "r") as f:
+        labels = json.load(f)
+    crops = []
+    for path, text in labels.items():
+        image = cv2.imread(os.path.join(folder, path))
+        if image is None:
+            print(f"[SKIP] Cannot read {os.path.join(folder, path)}")
+            continue
+        crops.append((image, text))
+    return crops
+
+
+def normalize(text):
+    return re.sub(r"\s+", "", text or "")
+
+
+def with_psm(ocr_settings, psm):
+    """
+    Replace the page segmentation mode of a config string, keeping everything else (e.g. the whitelist).
+    """
+    return (re.sub(r"--psm\s+\d+", "", ocr_settings or "").strip() + f" --psm {psm}").strip()
+
+
+def init_worker(dataset):
+    global _engine, _dataset
+    _engine = create_ocr_engine()
+    _dataset = dataset
+
+
+def evaluate(field, process_settings, ocr_settings):
+    """
+    Read every crop of a field with one configuration.
+
+    Returns:
+        tuple: (field, process_settings, ocr_settings, accuracy, mean ms per crop, [(read, expected)] errors)
+    """
+    pipeline = Pipeline(**(process_settings or {}))
+    correct = 0
+    errors = []
+    elapsed = 0.0
+    crops = _dataset[field]
+    for image, label in crops:
+        start = time.perf_counter()
+        text = _engine.recognize(pipeline(image), ocr_settings)
+        elapsed += time.perf_counter() - start
+        if normalize(text) == normalize(label):
+            correct += 1
+        else:
+            errors.append((text.strip(), label))
+    return field, process_settings, ocr_settings, correct / len(crops), elapsed / len(crops) * 1000, errors
+
+
+def candidates(ocr_settings):
+    for threshold, invert, scale, psm in itertools.product(THRESHOLDS, (False, True), SCALE_FACTORS, PSMS):
+        process_settings = {"threshold_value": threshold, "invert": invert, "scale_factor": scale}
+        yield process_settings, with_psm(ocr_settings, psm)
+
+
+def regions_for(field, regions):
+    if field in regions:
+        return [field]
+    return [name for name in regions if name.endswith(f"_{field}")]
+
+
+def tune(crops_dir, fields, target, workers, regions_file, dry_run):
+    with open(regions_file, "r") as f:
+        regions = json.load(f)
+    fields = fields or sorted(
+        name for name in os.listdir(crops_dir) if os.path.isfile(os.path.join(crops_dir, name, "labels.json"))
+    )
+    dataset, targets = {}, {}
+    for field in fields:
+        names = regions_for(field, regions)
+        if not names:
+            print(f"[SKIP] No region named '{field}' or '*_{field}' in {regions_file}")
+            continue
+        crops = load_crops(os.path.join(crops_dir, field))
+        if not crops:
+            continue
+        dataset[field] = crops
+        targets[field] = names
+
+    # field -> [result]; the first task of every field is its current configuration
+    results = {field: [] for field in dataset}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(dataset,)) as pool:
+        futures = []
+        for field in dataset:
+            current = regions[targets[field][0]]
+            futures.append(pool.submit(evaluate, field, current.get("process_settings"), current.get("ocr_settings")))
+            for process_settings, ocr_settings in candidates(current.get("ocr_settings")):
+                futures.append(pool.submit(evaluate, field, process_settings, ocr_settings))
+        for future in futures:
+            result = future.result()
+            results[result[0]].append(result)
+
+    print(f"\n{'field':<12} {'config':<8} {'accuracy':>9} {'ms':>8}  settings")
+    print("-" * 100)
+    changed = False
+    for field, field_results in results.items():
+        current = field_results[0]
+        passing = [result for result in field_results if result[3] >= target]
+        if passing:
+            best = min(passing, key=lambda result: result[4])
+        else:
+            best = max(field_results, key=lambda result: (result[3], -result[4]))
+        for label, (_, process_settings, ocr_settings, accuracy, ms, errors) in (("current", current), ("best", best)):
+            print(f"{field:<12} {label:<8} {accuracy:>9.1%} {ms:>8.2f}  {process_settings} '{ocr_settings}'")
+        for read, expected in best[5][:5]:
+            print(f"{'':<12} {'':<8} read '{read}', expected '{expected}'")
+        if not passing:
+            print(f"{'':<12} no configuration reaches {target:.0%}, {targets[field]} left unchanged")
+            continue
+        if best is current:
+            continue
+        for name in targets[field]:
+            regions[name]["process_settings"] = best[1]
+            regions[name]["ocr_settings"] = best[2]
+        changed = True
+
+    if changed and not dry_run:
+        with open(regions_file, "w") as f:
+            json.dump(regions, f, indent=4)
+        print(f"\nUpdated {regions_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the OCR settings of regions.json on labeled crops.")
+    parser.add_argument("--crops", required=True, help="Folder with one labeled crop folder per field")
+    parser.add_argument("--fields", nargs="+", help="Fields to tune (default: every folder in --crops)")
+    parser.add_argument("--target", type=float, default=1.0, help="Minimum accuracy of the chosen settings")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--regions-file", default=REGIONS_FILE)
+    parser.add_argument("--dry-run", action="store_true", help="Only print the report")
+    args = parser.parse_args()
+    tune(args.crops, args.fields, args.target, args.workers, args.regions_file, args.dry_run)
@@ -19,7 +19,8 @@ class AutoRollHandler:
     This class manages the autoroller and disable_autoroller threads.
     """
 
-    def __init__(self):
+    def __init__(self, frame_source=None):
+        self.frame_source = frame_source
         self.autoroller_running_condition = shared_state.autoroller_running_condition
         self.disable_autoroller_running_condition = (
             shared_state.disable_autoroller_running_condition
@@ -42,25 +43,17 @@ class AutoRollHandler:
         """
         Set the autoroller_running flag.
         """
-        with self.autoroller_running_condition:
-            self.autoroller_running = autoroller_running
-            shared_state.autoroller_running = autoroller_running
-            logger.debug(
-                f"Updated autoroller_running to {autoroller_running}. Notifying..."
-            )
-            self.autoroller_running_condition.notify_all()
+        self.autoroller_running = autoroller_running
+        shared_state.autoroller_running = autoroller_running
+        logger.debug(f"Updated autoroller_running to {autoroller_running}.")
 
     def set_disable_autoroller_running(self, running):
         """
         Set the disable_autoroller_running flag.
         """
-        with self.disable_autoroller_running_condition:
-            self.disable_autoroller_running = running
-            shared_state.disable_autoroller_running = running
-            logger.debug(
-                f"Updated disable_autoroller_running to {running}. Notifying..."
-            )
-            self.disable_autoroller_running_condition.notify_all()
+        self.disable_autoroller_running = running
+        shared_state.disable_autoroller_running = running
+        logger.debug(f"Updated disable_autoroller_running to {running}.")
 
     # start the autoroll thread of autoroller.py
     def start_autoroller(self):
@@ -73,7 +66,10 @@ class AutoRollHandler:
             )
         if not shared_state.autoroller_running:
             self.autoroller_thread = Thread(
-                target=AutoRoller.run, daemon=True, name="autoroller"
+                target=AutoRoller.run,
+                kwargs={"frame_source": self.frame_source},
+                daemon=True,
+                name="autoroller",
             )
             self.set_autoroller_running(True)
             self.autoroller_thread.start()
@@ -105,7 +101,10 @@ class AutoRollHandler:
             )
         if not shared_state.disable_autoroller_running:
             self.disable_autoroller_thread = Thread(
-                target=DisableAutoRoller.run, daemon=True, name="disable_autoroller"
+                target=DisableAutoRoller.run,
+                kwargs={"frame_source": self.frame_source},
+                daemon=True,
+                name="disable_autoroller",
             )
             self.set_disable_autoroller_running(True)
             self.disable_autoroller_thread.start()
@@ -131,14 +130,8 @@ class AutoRollHandler:
         Update the autoroller_running and disable_autoroller_running flags.
         """
         while True:
-            with shared_state.autoroller_running_condition:
-                shared_state.autoroller_running = self.autoroller_running
-                shared_state.autoroller_running_condition.notify_all()
-            with shared_state.disable_autoroller_running_condition:
-                shared_state.disable_autoroller_running = (
-                    self.disable_autoroller_running
-                )
-                shared_state.disable_autoroller_running_condition.notify_all()
+            shared_state.autoroller_running = self.autoroller_running
+            shared_state.disable_autoroller_running = self.disable_autoroller_running
             break
 
     def run(self):
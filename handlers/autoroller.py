@@ -12,7 +12,8 @@ ocr_utils = OCRUtils()
 
 class AutoRoller:
     @staticmethod
-    def run() -> bool:
+    def run(frame_source=None) -> bool:
+        vision = OCRUtils(frame_source) if frame_source is not None else ocr_utils
         current_path = shared_state.current_path
         go_path = os.path.join(current_path, "images", "go.png")
         go_image = shared_state.load_image(go_path)
@@ -40,7 +41,7 @@ class AutoRoller:
                 break
 
             # Check for GO button
-            if ocr_utils.find(go_image) is not None:
+            if vision.find(go_image) is not None:
                 logger.debug("[AUTOROLL] GO button found during startup. Proceeding to main loop.")
                 break
             
@@ -76,9 +77,7 @@ class AutoRoller:
                 logger.debug(f"[AUTOROLL] Popup detected ({consecutive_popups}/10).")
                 if consecutive_popups >= 10:
                     logger.info("[AUTOROLL] 10 consecutive popups detected. Assuming NO DICE.")
-                    with shared_state.rolls_condition:
-                        shared_state.rolls = 0
-                        shared_state.rolls_condition.notify_all()
+                    shared_state.rolls = 0
                     break
             else:
                 pass 
@@ -87,7 +86,7 @@ class AutoRoller:
             # Just look for GO button. If found, we are good.
             
             logger.debug("[AUTOROLL] Searching for GO button...")
-            point = ocr_utils.find(go_image)
+            point = vision.find(go_image)
             
             if point is not None:
                 logger.debug(f"[AUTOROLL] GO button found at ({point[0]}, {point[1]}). Executing Long Press...")
@@ -131,9 +130,7 @@ class AutoRoller:
             
             if consecutive_popups >= 10:
                 logger.info("[AUTOROLL] 10 consecutive popups detected. Assuming NO DICE.")
-                with shared_state.rolls_condition:
-                    shared_state.rolls = 0
-                    shared_state.rolls_condition.notify_all()
+                shared_state.rolls = 0
                 break
                 
             with shared_state.rolling_condition:
@@ -7,6 +7,7 @@ from time import sleep
 from shared_state import shared_state
 import os
 from utils.logger import logger
+from utils.rate_governor import rate_governor
 
 ocr_utils = OCRUtils()
 
@@ -14,7 +15,8 @@ ocr_utils = OCRUtils()
 import random
 
 class BankHeistHandler:
-    def __init__(self):
+    def __init__(self, frame_source=None):
+        self.ocr_utils = OCRUtils(frame_source) if frame_source is not None else ocr_utils
         self.current_path = shared_state.current_path
         self.bh_door_path = os.path.join(self.current_path, "images", "bank-heist-door.png")
         self.bh_match_path = os.path.join(self.current_path, "images", "heist-match.png")
@@ -27,12 +29,15 @@ class BankHeistHandler:
             # then a Heist cannot be active. Skip unnecessary OCR.
             if shared_state.in_home_status:
                 # logger.debug("[HEIST] Player in Home (HUD visible), skipping Heist check.")
-                sleep(2)
+                rate_governor.set_minigame(False)
+                rate_governor.sleep("heist", 2)
                 continue
 
             # 1. First check if we are actually in the Heist Minigame
             # STRICT CHECK: Higher threshold to avoid false positives
-            if self.is_heist_active(threshold=0.8):
+            heist_active = self.is_heist_active(threshold=0.8)
+            rate_governor.set_minigame(heist_active)
+            if heist_active:
                 # 2. Try to find a door to click
                 door_point = self.detect_door()
                 
@@ -48,20 +53,13 @@ class BankHeistHandler:
                 sleep(2)
             else:
                 # Not in heist mode, wait before checking again
-                sleep(1)
+                rate_governor.sleep("heist", 1)
 
     def is_heist_active(self, threshold=None):
         """Checks for 'MATCH 3' or 'STEAL' text at the top."""
         # Using OCR instead of Image Matching for better reliability
-        # Coordinates: (33.09, 23.45, 36.01, 3.09)
-        # ocr_to_str args: left, top, right, bottom
-        text = ocr_utils.ocr_to_str(
-            33.09,
-            23.45,
-            33.09 + 36.01,
-            23.45 + 3.09,
-            ocr_settings=r'--psm 6'
-        )
+        # Region: "heist_banner" in regions.json
+        text = self.ocr_utils.ocr_region("heist_banner")
         
         logger.debug(f"[HEIST] Active Check OCR: '{text}'")
         
@@ -76,7 +74,7 @@ class BankHeistHandler:
     def detect_door(self):
         """Finds a closed door."""
         image = shared_state.load_image(self.bh_door_path)
-        return ocr_utils.find(image)
+        return self.ocr_utils.find(image)
 
     def click_point(self, point, source="Unknown"):
         print(f"[HEIST] Clicking {source} at {point}...")
@@ -14,6 +14,7 @@ from utils.input_handler import global_input
 from time import sleep
 import re
 from utils.ocr_utils import OCRUtils
+from utils.roi_registry import roi_registry
 import os
 import json
 from utils.logger import logger
@@ -38,8 +39,8 @@ class BuildingHandler:
         data (list): A list containing game data.
 
     Methods:
-        __init__(self):
-            Initializes a BuildingHandler object.
+        __init__(self, frame_source=None):
+            Initializes a BuildingHandler object. frame_source selects live capture or a recorded session.
 
         load_data(self):
             Loads game data from the game_data_file.
@@ -59,6 +60,9 @@ class BuildingHandler:
         check_menu_status(self):
             Checks if the game is in the build menu.
 
+        read_building_costs(self):
+            Reads the cost text of every building with a single batched OCR call.
+
         extract_and_convert_cost(self, cost_text):
             Extracts and converts building costs from OCR results.
 
@@ -81,7 +85,8 @@ class BuildingHandler:
             Main method that manages the building process in the game.
     """
 
-    def __init__(self):
+    def __init__(self, frame_source=None):
+        self.ocr_utils = OCRUtils(frame_source) if frame_source is not None else ocr_utils
         # Establish current path and game data file
         self.current_path = shared_state.current_path
         self.game_data_file = str(shared_state.WINDOW_TITLE.strip()) + "_game_data.json"
@@ -90,7 +95,7 @@ class BuildingHandler:
             shared_state.money_condition.wait()
         self.all_buildings_upgraded = False
         shared_state.builder_finished = False
-        self.current_money = shared_state.money
+        self.current_money = shared_state.money if shared_state.money is not None else 0
         self.minimum_money_to_continue = 1000  # Denaro minimo per continuare a costruire
         # Initialize window coordinates
         (
@@ -104,10 +109,7 @@ class BuildingHandler:
         self.buildings = [
             {
                 "name": "building1",
-                "x_percent": 8.23,
-                "y_percent": 86.53,
-                "right_percent": 18.65,
-                "bottom_percent": 89.32,
+                "region": "building1_cost",
                 "upgrade_level": 0,
                 "upgrade0": 0,
                 "upgrade1": 0,
@@ -119,10 +121,7 @@ class BuildingHandler:
             },
             {
                 "name": "building2",
-                "x_percent": 28.15,
-                "y_percent": 86.63,
-                "right_percent": 38.39,
-                "bottom_percent": 89.13,
+                "region": "building2_cost",
                 "upgrade_level": 0,
                 "upgrade0": 0,
                 "upgrade1": 0,
@@ -134,10 +133,7 @@ class BuildingHandler:
             },
             {
                 "name": "building3",
-                "x_percent": 47.53,
-                "y_percent": 86.53,
-                "right_percent": 58.13,
-                "bottom_percent": 89.22,
+                "region": "building3_cost",
                 "upgrade_level": 0,
                 "upgrade0": 0,
                 "upgrade1": 0,
@@ -149,10 +145,7 @@ class BuildingHandler:
             },
             {
                 "name": "building4",
-                "x_percent": 67.64,
-                "y_percent": 86.53,
-                "right_percent": 77.51,
-                "bottom_percent": 89.12,
+                "region": "building4_cost",
                 "upgrade_level": 0,
                 "upgrade0": 0,
                 "upgrade1": 0,
@@ -164,10 +157,7 @@ class BuildingHandler:
             },
             {
                 "name": "building5",
-                "x_percent": 87.20,
-                "y_percent": 86.63,
-                "right_percent": 97.80,
-                "bottom_percent": 89.22,
+                "region": "building5_cost",
                 "upgrade_level": 0,
                 "upgrade0": 0,
                 "upgrade1": 0,
@@ -229,26 +219,7 @@ class BuildingHandler:
         """
         Retrieves the game board name using OCR.
         """
-        board_name_region = (1, 91.7, 94.9, 95)
-        board_x_percent = board_name_region[0]
-        board_y_percent = board_name_region[1]
-        board_right_percent = board_name_region[2]
-        board_bottom_percent = board_name_region[3]
-        board_process_settings = {
-            "contrast_reduction_percentage": 0,
-            "threshold_value": 75,
-            "invert": False,
-            "scale_factor": 4,
-        }
-        board_name = None
-        board_name = ocr_utils.ocr_to_str(
-            board_x_percent,
-            board_y_percent,
-            board_right_percent,
-            board_bottom_percent,
-            ocr_settings="--psm 7 --oem 3 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789/ ",
-            process_settings=board_process_settings,
-        )
+        board_name = self.ocr_utils.ocr_region("board_name")
         board_name_proc = self.process_board_name(board_name)
         logger.debug(f"[BUILDER] Board name is {board_name_proc}.")
         return board_name_proc
@@ -267,7 +238,7 @@ class BuildingHandler:
                 logger.debug("[BUILDER] Not in menu, looking for build icon")
                 build_path = os.path.join(self.current_path, "images", "build.png")
                 build_image = shared_state.load_image(build_path)
-                location = ocr_utils.find(build_image, label_name="Build Icon")
+                location = self.ocr_utils.find(build_image, label_name="Build Icon")
                 if location:
                     logger.debug(f"[BUILDER] Found build menu icon at {location}. Clicking...")
                     logger.debug(f"[BUILDER] Found build menu icon at {location}. Clicking...")
@@ -290,7 +261,7 @@ class BuildingHandler:
         """
         exit_path = os.path.join(self.current_path, "images", "build-exit.png")
         exit_image = shared_state.load_image(exit_path)
-        location = ocr_utils.find(exit_image, label_name="Build Exit Icon")
+        location = self.ocr_utils.find(exit_image, label_name="Build Exit Icon")
         if not location:
             # logger.debug("[BUILDER] Not in build menu.")
             return False
@@ -298,6 +269,15 @@ class BuildingHandler:
             # logger.debug("[BUILDER] In build menu.")
             return True
 
+    def read_building_costs(self):
+        """
+        Reads the cost text of every building with a single batched OCR call.
+        Returns:
+            dict: Building name -> raw OCR text of its cost.
+        """
+        regions = self.ocr_utils.ocr_regions([building_info["region"] for building_info in self.buildings])
+        return {building_info["name"]: regions[building_info["region"]] for building_info in self.buildings}
+
     def extract_and_convert_cost(self, cost_text):
         """
         Extracts and converts building costs from OCR results.
@@ -442,7 +422,8 @@ class BuildingHandler:
         """
         with shared_state.money_condition:
             shared_state.money_condition.wait()
-        self.current_money = shared_state.money
+        if shared_state.money is not None:
+            self.current_money = shared_state.money
         return self.current_money >= self.minimum_money_to_continue
 
     def exit_build_menu(self):
@@ -460,7 +441,7 @@ class BuildingHandler:
             in_menu = self.check_menu_status()
             print(in_menu)
             while in_menu:
-                location = ocr_utils.find(build_exit_image, label_name="Build Exit Icon")
+                location = self.ocr_utils.find(build_exit_image, label_name="Build Exit Icon")
                 logger.debug("[BUILDER] Exiting build menu...")
                 if location:
                     global_input.safe_move_to(location[0], location[1])
@@ -516,6 +497,14 @@ class BuildingHandler:
                     if shared_state.money is not None:
                         self.current_money = shared_state.money
                     
+                # Read every building cost from the same frame in one OCR batch
+                if not self.check_menu_status():
+                    logger.debug("[BUILDER] Lost menu focus, trying to re-enter...")
+                    self.enter_build_menu()
+                cost_texts = self.read_building_costs()
+                # Set after a click or a menu re-entry: the costs left on screen are read again
+                costs_stale = False
+
                 # Iterate through buildings
                 actions_taken_in_this_cycle = 0
                 affordable_structure_found = False
@@ -529,23 +518,16 @@ class BuildingHandler:
                     if not self.check_menu_status():
                         logger.debug("[BUILDER] Lost menu focus, trying to re-enter...")
                         self.enter_build_menu()
+                        costs_stale = True
                     
                     building_name = building_info["name"]
-                    x_percent = building_info["x_percent"]
-                    y_percent = building_info["y_percent"]
-                    right_percent = building_info["right_percent"]
-                    bottom_percent = building_info["bottom_percent"]
-                    
-                    # Calculate coordinates
-                    self.x = int(self.window_x + (self.window_width * (x_percent / 100)))
-                    self.y = int(self.window_y + (self.window_height * (y_percent / 100)))
-                    self.right = int(self.window_x + (self.window_width * (right_percent / 100)))
-                    self.bottom = int(self.window_y + (self.window_height * (bottom_percent / 100)))
-                    
+                    # Compiled pixel rectangle of the building's cost region (see regions.json)
+                    self.x, self.y, self.right, self.bottom = roi_registry.rect(building_info["region"], shared_state.window)
+
                     # --- NEW: Check if building is finished ---
                     try:
                         search_bbox = (self.x - 20, self.y - 20, (self.right - self.x) + 40, (self.bottom - self.y) + 40)
-                        finished_loc = ocr_utils.find(building_finished_image, bbox=search_bbox, threshold=0.7, label_name=f"{building_name} Finished") 
+                        finished_loc = self.ocr_utils.find(building_finished_image, bbox=search_bbox, threshold=0.7, label_name=f"{building_name} Finished") 
                         
                         if finished_loc:
                             logger.debug(f"[BUILDER] {building_name} is finished (icon detected). Skipping.")
@@ -554,16 +536,10 @@ class BuildingHandler:
                         logger.warning(f"[BUILDER] Failed to check finished status: {e}")
                     # ------------------------------------------
 
-                    # Attempt OCR
-                    ocr_settings = r"--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789.MK"
-                    process_settings = {"threshold_value": 100, "invert": True, "scale_factor": 3}
-                    
-                    cost_text = ocr_utils.ocr_to_str(
-                        x_percent, y_percent, right_percent, bottom_percent,
-                        ocr_settings=ocr_settings,
-                        process_settings=process_settings
-                    )
-                    cost = self.extract_and_convert_cost(cost_text)
+                    if costs_stale:
+                        cost_texts = self.read_building_costs()
+                        costs_stale = False
+                    cost = self.extract_and_convert_cost(cost_texts.get(building_name, ""))
                     
                     should_click = False
                     
@@ -587,6 +563,7 @@ class BuildingHandler:
                         global_input.safe_move_to(self.x, self.y)
                         global_input.safe_pydirectinput_click()
                         actions_taken_in_this_cycle += 1
+                        costs_stale = True
                         sleep(1.5) # Wait for animation/potential popup
                         
                         # Check for popup
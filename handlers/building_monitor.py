@@ -11,15 +11,18 @@ from shared_state import shared_state
 from time import sleep
 from utils.logger import logger
 from utils.ocr_utils import OCRUtils
+from utils.rate_governor import rate_governor, WAITING_ROLLS
+from utils.regen_timer import regen_timer
 import re
 
 
 class BuildingMonitor:
-    def __init__(self):
+    def __init__(self, frame_source=None):
+        self.frame_source = frame_source
         self.builder_running_condition = shared_state.builder_running_condition
         self.builder_running = shared_state.builder_running
         self.minimum_money_to_build = 1000  # Denaro minimo necessario per avviare il build
-        self.ocr_utils = OCRUtils()
+        self.ocr_utils = OCRUtils(frame_source)
 
     def set_builder_running(self, value):
         """
@@ -27,11 +30,9 @@ class BuildingMonitor:
         Args:
             value (bool): The value to set the builder_running state to.
         """
-        with self.builder_running_condition:
-            self.builder_running = value
-            shared_state.builder_running = value
-            sleep(0.2)
-            self.builder_running_condition.notify_all()
+        self.builder_running = value
+        shared_state.builder_running = value
+        rate_governor.update()
         if value is True:
             shared_state.builder_event.set()
             shared_state.start_autoroller_lock.acquire(blocking=True)
@@ -64,21 +65,9 @@ class BuildingMonitor:
         Returns:
             str | None: The time string (e.g. "57:52") or None if not found.
         """
-        # Region provided by user: Left(%): 36.56, Top(%): 94.82, Width(%): 27.24, Height(%): 2.19
-        x = 36.56
-        y = 94.82
-        w = 27.24
-        h = 2.19
-        right = x + w
-        bottom = y + h
-        
         try:
-             # Expanded whitelist to include dot and colon, and potentially space
-             # psm 7 corresponds to "Treat the image as a single text line."
-             text = self.ocr_utils.ocr_to_str(
-                 x, y, right, bottom, 
-                 ocr_settings="--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789:. "
-             )
+             # Region: "wait_time" in regions.json (whitelist includes dot, colon and space)
+             text = self.ocr_utils.ocr_region("wait_time")
              logger.debug(f"[BUILD-M] Raw Wait Time OCR: '{text}'")
              
              # Regex for time format XX:XX or XX.XX (e.g. 52:10, 01:05, 57.52)
@@ -91,6 +80,30 @@ class BuildingMonitor:
             
         return None
 
+    def wait_for_regen(self, rolls) -> str | None:
+        """
+        Read the dice countdown once and, with no dice left, sleep the perception pipeline until shortly
+        before the dice regenerate (see regen_timer.py). With some dice left only the status is updated.
+        Args:
+            rolls (int | None): The current rolls (None until the first read: nothing is scheduled).
+        Returns:
+            str | None: The countdown read (e.g. "57:52") or None if not found.
+        """
+        if rolls is None:
+            return None
+        time_str = self.check_wait_time()
+        if not time_str:
+            return None
+        shared_state.bot_status = f"PAUSED (WAITING {time_str})"
+        logger.debug(f"[BUILD-M] Waiting for rolls. Time remaining: {time_str}")
+        if regen_timer.project(time_str) is None or rolls >= WAITING_ROLLS:
+            # Unparsable countdown, or the autoroller may still use the remaining dice
+            rate_governor.sleep("building_monitor", 60)
+        elif not regen_timer.sleep():
+            # Too close to the regeneration to hold the pipeline: poll until the dice show up
+            rate_governor.sleep("building_monitor", 2)
+        return time_str
+
     def run(self, ar_handler_instance):
         """
         Start the building handler when there are no more dice rolls available.
@@ -115,14 +128,14 @@ class BuildingMonitor:
                 if shared_state.rolls is None:
                     shared_state.rolls_condition.wait(timeout=2)  # Aspetta max 2s per primo aggiornamento
                 else:
-                    shared_state.rolls_condition.wait(timeout=0.5)  # Aspetta max 0.5s per aggiornamenti successivi
+                    shared_state.rolls_condition.wait(timeout=rate_governor.interval("building_monitor", 0.5))  # Aspetta max 0.5s (scalato dallo stato) per aggiornamenti successivi
                 rolls = shared_state.rolls
             
             with shared_state.money_condition:
                 if shared_state.money is None:
                     shared_state.money_condition.wait(timeout=2)  # Aspetta max 2s per primo aggiornamento
                 else:
-                    shared_state.money_condition.wait(timeout=0.5)  # Aspetta max 0.5s per aggiornamenti successivi
+                    shared_state.money_condition.wait(timeout=rate_governor.interval("building_monitor", 0.5))  # Aspetta max 0.5s (scalato dallo stato) per aggiornamenti successivi
                 money = shared_state.money
             
             # Se i valori sono None, aspetta che vengano inizializzati
@@ -183,8 +196,8 @@ class BuildingMonitor:
                     ):  # Wait for in_home_status to be updated
                         with shared_state.in_home_condition:
                             shared_state.in_home_condition.wait()
-                    building_handler_instance = (
-                        building_handler.BuildingHandler()
+                    building_handler_instance = building_handler.BuildingHandler(
+                        frame_source=self.frame_source
                     )  # Start building handler
                     if not hasattr(self, "building_handler_thread"):
                         self.building_handler_thread = Thread(
@@ -205,9 +218,7 @@ class BuildingMonitor:
                         )
                         self.building_handler_thread.start()
 
-                    with shared_state.builder_running_condition:
-                        shared_state.builder_running = self.builder_running
-                        shared_state.builder_running_condition.notify_all()
+                    shared_state.builder_running = self.builder_running
 
                     with shared_state.builder_finished_condition:  # Wait for building handler to finish
                         shared_state.builder_finished_condition.wait_for(
@@ -234,7 +245,7 @@ class BuildingMonitor:
                             if shared_state.rolls is None:
                                 shared_state.rolls_condition.wait(timeout=2)
                             else:
-                                shared_state.rolls_condition.wait(timeout=0.5)
+                                shared_state.rolls_condition.wait(timeout=rate_governor.interval("building_monitor", 0.5))
                             current_rolls = shared_state.rolls
                             
                         # If we have enough rolls (e.g. >= 5 for safety, or even >=1), we assume we can play again
@@ -244,37 +255,24 @@ class BuildingMonitor:
                              logger.debug(f"[BUILD-M] Rolls replenished ({current_rolls}). Exiting Wait Mode.")
                              break
                              
-                        # Update status
-                        wait_time_s = 2
-                        time_str = self.check_wait_time()
-                        if time_str:
-                             shared_state.bot_status = f"PAUSED (WAITING {time_str})"
-                             wait_time_s = 60 # Check again in 1 minute
-                             logger.debug(f"[BUILD-M] Waiting for rolls... ({time_str})")
-                        else:
+                        # Sleep until the projected regeneration (one countdown read), then confirm with the next rolls read
+                        if not self.wait_for_regen(current_rolls):
                              shared_state.bot_status = "PAUSED (WAITING FOR RESOURCES)"
                              logger.debug(f"[BUILD-M] Waiting for rolls... (rolls={current_rolls})")
-                        
-                        sleep(wait_time_s)
+                             rate_governor.sleep("building_monitor", 2)
                 elif (
                     not shared_state.builder_running
                     and not self.should_start_building(rolls, money)
                 ):  # Conditions not met, wait a bit and check again
-                    wait_time_s = 2
                     if rolls < 5:
                         # Attempt to read the wait time from screen
-                        time_str = self.check_wait_time()
-                        if time_str:
-                             shared_state.bot_status = f"PAUSED (WAITING {time_str})"
-                             wait_time_s = 60 # Check again in 1 minute to update status
-                             logger.debug(f"[BUILD-M] Waiting for rolls. Time remaining: {time_str}")
-                        else:
+                        if not self.wait_for_regen(rolls):
                              shared_state.bot_status = "PAUSED (WAITING FOR RESOURCES)"
                              logger.debug(f"[BUILD-M] Conditions not met (rolls={rolls}, money={money}). Waiting...")
+                             rate_governor.sleep("building_monitor", 2)
                     else:
                         logger.debug(f"[BUILD-M] Conditions not met (rolls={rolls}, money={money}). Waiting...")
-                        
-                    sleep(wait_time_s)  
+                        rate_governor.sleep("building_monitor", 2)
                 else:  # Builder is running, wait for it to finish
                     logger.debug("[BUILD-M] Builder is running, waiting...")
-                    sleep(2)
\ No newline at end of file
+                    rate_governor.sleep("building_monitor", 2)
\ No newline at end of file
@@ -15,7 +15,8 @@ ocr_utils = OCRUtils()
 
 
 class DestructionHandler:
-    def __init__(self):
+    def __init__(self, frame_source=None):
+        self.ocr_utils = OCRUtils(frame_source) if frame_source is not None else ocr_utils
         self.last_clicked_target = None
         self.target_image_path = None
         
@@ -42,7 +43,7 @@ class DestructionHandler:
                 return False
             
             # Cerca il mirino sullo schermo
-            location = ocr_utils.find(target_image, threshold=0.5)
+            location = self.ocr_utils.find(target_image, threshold=0.5)
             
             if location:
                 print(f"[DESTRUCTION] Target found. Clicking...")
@@ -11,7 +11,8 @@ ocr_utils = OCRUtils()
 
 class DisableAutoRoller:
     @staticmethod
-    def run() -> bool:
+    def run(frame_source=None) -> bool:
+        vision = OCRUtils(frame_source) if frame_source is not None else ocr_utils
         current_path = shared_state.current_path
         image_path = os.path.join(current_path, "images", "autoroll.png")
         ar_image = shared_state.load_image(image_path)
@@ -27,7 +28,7 @@ class DisableAutoRoller:
                     lambda: shared_state.in_home_status
                 )
 
-            point = ocr_utils.find(ar_image)
+            point = vision.find(ar_image)
             if point is not None:
                 logger.debug("[AUTOROLL] AutoRoll is active. Disabling autoroll...")
                 with shared_state.moveTo_lock:
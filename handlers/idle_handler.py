@@ -2,6 +2,8 @@ from shared_state import shared_state
 from utils.ocr_utils import OCRUtils
 from pyautogui import moveTo
 from utils.logger import logger
+from utils.debug_sink import debug_sink
+from utils.rate_governor import rate_governor
 from pydirectinput import click
 import re
 from time import sleep
@@ -11,7 +13,8 @@ ocr_utils = OCRUtils()
 
 
 class IdleHandler:
-    def __init__(self):
+    def __init__(self, frame_source=None):
+        self.ocr_utils = OCRUtils(frame_source) if frame_source is not None else ocr_utils
         self.window_x = shared_state.window_x
         self.window_y = shared_state.window_y
         self.window_width = shared_state.window_width
@@ -22,10 +25,6 @@ class IdleHandler:
         self.friends_button_y = self.window_y + int(self.window_height * (90.7 / 100))
         self.exit_button_x = self.window_x + int(self.window_width * (47.4 / 100))
         self.exit_button_y = self.window_y + int(self.window_height * (96.8 / 100))
-        self.invite_count_x_percent = 36.5
-        self.invite_count_y_percent = 68.6
-        self.invite_count_width_percent = 58.6
-        self.invite_count_height_percent = 71.1
         self.share_button_path = os.path.join(
             shared_state.current_path, "images", "share_button.png"
         )
@@ -39,27 +38,14 @@ class IdleHandler:
         # Calculate the coordinates of the button based on the above percentages relative to window size
 
     def gather_invite_count(self):
-        process_settings = {
-            "contrast_reduction_percentage": 0,
-            "threshold_value": 75,
-            "invert": False,
-            "scale_factor": 4,
-        }
-        invite_count = ocr_utils.ocr_to_str(
-            self.invite_count_x_percent,
-            self.invite_count_y_percent,
-            self.invite_count_width_percent,
-            self.invite_count_height_percent,
-            output_image_path="invite_count.png",
-            ocr_settings="--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789/",
-            process_settings=process_settings,
-        )
+        invite_count = self.ocr_utils.ocr_region("invite_count", output_image_path="invite_count.png")
         match = re.search(r"(\d+)/50", invite_count)
         if match:
             invite_count = int(match.group(1))
             return invite_count
         else:
             logger.debug("Failed to extract invite count")
+            debug_sink.flag("invite_count.png")
             return -1
 
     def run(self):
@@ -78,7 +64,7 @@ class IdleHandler:
             
             # Aspetta che rolls e money siano inizializzati
             if rolls is None or money is None:
-                sleep(2)
+                rate_governor.sleep("idle", 2)
                 continue
             
             if (
@@ -112,14 +98,14 @@ class IdleHandler:
                         click()
                     sleep(2)
                 # Look for invite button
-                invite_button = ocr_utils.find(self.invite_button, label_name="Invite Button")
+                invite_button = self.ocr_utils.find(self.invite_button, label_name="Invite Button")
                 while (
                     not invite_button
                 ):  # While the invite button isn't present, move to friends button and click
                     moveTo(self.friends_button_x, self.friends_button_y)
                     sleep(1)
                     click()
-                    invite_button = ocr_utils.find(
+                    invite_button = self.ocr_utils.find(
                         self.invite_button
                     )  # Check again to see if invite button has been clicked
                 sleep(2)
@@ -130,17 +116,17 @@ class IdleHandler:
                         sleep(1)
                         click()
                     sleep(2)
-                in_menu = ocr_utils.find(self.share_button, label_name="Share Button")  # Look for share button
+                in_menu = self.ocr_utils.find(self.share_button, label_name="Share Button")  # Look for share button
                 while (
                     not in_menu
                 ):  # While the share button isn't present, move to invite button and click
-                    invite_button = ocr_utils.find(self.invite_button)
+                    invite_button = self.ocr_utils.find(self.invite_button)
                     if invite_button:
                         with shared_state.moveTo_lock:
                             moveTo(invite_button)
                             sleep(1)
                             click()
-                    in_menu = ocr_utils.find(self.share_button)
+                    in_menu = self.ocr_utils.find(self.share_button)
                 while in_menu:  # While the share button is present
                     invite_count = self.gather_invite_count()  # Gather the invite count
                     while (
@@ -187,4 +173,4 @@ class IdleHandler:
                 with shared_state.money_condition:
                     shared_state.money_condition.wait()
                 sleep(1)
-            sleep(45)
+            rate_governor.sleep("idle", 45)
@@ -2,6 +2,7 @@ from shared_state import shared_state
 from pyautogui import moveTo
 from pydirectinput import click
 from utils.logger import logger
+from utils.roi_registry import roi_registry
 import time
 from time import sleep
 
@@ -12,8 +13,9 @@ class MultiplierHandler:
     It is started by MultiplierMonitor when the multiplier is incorrect.
     """
 
-    def __init__(self, correct_multiplier, timeout=30):
+    def __init__(self, correct_multiplier, timeout=30, frame_source=None):
         self.correct_multiplier = correct_multiplier
+        self.frame_source = frame_source
         self.multiplier = shared_state.multiplier
         (
             self.window_x,
@@ -22,14 +24,8 @@ class MultiplierHandler:
             self.window_height,
         ) = shared_state.window
         self.timeout = timeout
-        mp_region_percent = (61, 70.5, 71, 73.3)
-        left_percent, top_percent, right_percent, bottom_percent = mp_region_percent
-        self.center_x = (
-            self.window_x + self.window_width * (left_percent + right_percent) / 200
-        )
-        self.center_y = (
-            self.window_y + self.window_height * (top_percent + bottom_percent) / 200
-        )
+        # Center of the multiplier button ("multiplier_button" in regions.json)
+        self.center_x, self.center_y = roi_registry.center("multiplier_button", shared_state.window)
 
     def run(self):
         with shared_state.in_home_condition:
@@ -43,7 +39,7 @@ class MultiplierHandler:
         current_path = shared_state.current_path
         max_image_path = os.path.join(current_path, "images", "max.png")
         max_image = shared_state.load_image(max_image_path)
-        ocr_utils = OCRUtils()
+        ocr_utils = OCRUtils(self.frame_source)
         
         start_time = time.time()
         
@@ -51,15 +47,8 @@ class MultiplierHandler:
         # Loop until MAX image is found
         while True:
             # Check if MAX is visible using OCR
-            # Coordinates from user: (61.06, 57.29, 12.98, 3.99)
-            # ocr_to_str expects: left, top, right, bottom
-            text = ocr_utils.ocr_to_str(
-                61.06,
-                57.29,
-                61.06 + 12.98,
-                57.29 + 3.99,
-                ocr_settings=r'--psm 6' # Simple single line mode
-            )
+            # Region: "multiplier_max" in regions.json
+            text = ocr_utils.ocr_region("multiplier_max")
             
             logger.debug(f"[MP-H] OCR Text: '{text}'")
             
@@ -5,12 +5,15 @@ from time import sleep
 from utils.logger import logger
 import os
 from utils.ocr_utils import OCRUtils
+from utils.rate_governor import rate_governor
 
 ocr_utils = OCRUtils()
 
 
 class MultiplierMonitor:
-    def __init__(self):
+    def __init__(self, frame_source=None):
+        self.frame_source = frame_source
+        self.ocr_utils = OCRUtils(frame_source) if frame_source is not None else ocr_utils
         self.multiplier_handler_running_condition = (
             shared_state.multiplier_handler_running_condition
         )
@@ -18,11 +21,8 @@ class MultiplierMonitor:
         self.high_roller_event = False
 
     def update_multiplier_handler_running(self, value):
-        with self.multiplier_handler_running_condition:
-            self.multiplier_handler_running = value
-            shared_state.multiplier_handler_running = value
-            sleep(0.2)
-            shared_state.multiplier_handler_running_condition.notify_all()
+        self.multiplier_handler_running = value
+        shared_state.multiplier_handler_running = value
 
     def calculate_correct_multiplier(self, rolls, event):
         if event:
@@ -64,16 +64,12 @@ class MultiplierMonitor:
         self.ar_handler_instance = ar_handler_instance
         shared_state.thread_barrier.wait()
         logger.debug("[MP-M] Received notification! Starting...")
-        with shared_state.rolls_condition:
-            shared_state.rolls_condition.wait()
-            rolls = shared_state.rolls
+        store = shared_state.store
+        rolls_version = store.current_version("rolls")
         
         # Aspetta che rolls sia inizializzato
-        while rolls is None:
-            sleep(1)
-            with shared_state.rolls_condition:
-                shared_state.rolls_condition.wait()
-                rolls = shared_state.rolls
+        while shared_state.rolls is None:
+            rolls_version = store.wait_for_change("rolls", rolls_version, timeout=1)
         
         hr_image_path = os.path.join(
             shared_state.current_path, "images", "high-roller.png"
@@ -85,20 +81,21 @@ class MultiplierMonitor:
                 shared_state.builder_event.wait()
                 sleep(10)
             if not shared_state.builder_event.is_set():
-                with shared_state.rolls_condition:
-                    shared_state.rolls_condition.wait()
-                    rolls = shared_state.rolls
-                with shared_state.multiplier_condition:
-                    shared_state.multiplier_condition.wait()
-                    multiplier = shared_state.multiplier
+                # Re-check after every rolls change, and every few seconds anyway (e.g. for the high roller event)
+                rolls_version = store.wait_for_change(
+                    "rolls", rolls_version, timeout=rate_governor.interval("multiplier_monitor", 5)
+                )
+                snapshot = store.get_snapshot()
+                rolls = snapshot["rolls"].value
+                multiplier = snapshot["multiplier"].value
                 
                 # Aspetta che rolls e multiplier siano inizializzati
                 if rolls is None or multiplier is None:
                     sleep(1)
                     continue
                 
-                builder_running = shared_state.builder_running
-                hr_event = ocr_utils.find(hr_image)
+                builder_running = snapshot["builder_running"].value
+                hr_event = self.ocr_utils.find(hr_image)
                 if hr_event is not None:
                     self.high_roller_event = True
                 else:
@@ -120,7 +117,7 @@ class MultiplierMonitor:
                         current_time = __import__("time").time()
                         if hasattr(self, 'last_failure_time') and (current_time - self.last_failure_time < 60):
                              logger.debug("[MP-M] In cooldown (failed recently). Skipping multiplier update.")
-                             sleep(5)
+                             rate_governor.sleep("multiplier_monitor", 5)
                              continue
 
                         logger.debug(
@@ -147,7 +144,7 @@ class MultiplierMonitor:
                                     )
                         multiplier_handler_thread = Thread(
                             target=multiplier_handler.MultiplierHandler(
-                                correct_multiplier
+                                correct_multiplier, frame_source=self.frame_source
                             ).run,
                             daemon=True,
                             name="multiplier_handler",
@@ -203,12 +200,10 @@ class MultiplierMonitor:
                         not shared_state.multiplier_handler_running
                         and multiplier == correct_multiplier
                     ):
-                        with shared_state.multiplier_handler_running_condition:
-                            shared_state.multiplier_handler_running = False
-                            shared_state.multiplier_handler_running_condition.notify_all()
-                        sleep(5)
+                        shared_state.multiplier_handler_running = False
+                        rate_governor.sleep("multiplier_monitor", 5)
                 else:
                     logger.debug(
                         "[MP-M] Builder running. Waiting for builder to finish before starting multiplier handler..."
                     )
-                    sleep(5)
+                    rate_governor.sleep("multiplier_monitor", 5)
@@ -10,6 +10,9 @@ ocr_utils = OCRUtils()
 
 
 class ShutDownHandler:
+    def __init__(self, frame_source=None):
+        self.ocr_utils = OCRUtils(frame_source) if frame_source is not None else ocr_utils
+
     def run(self):
         current_path = shared_state.current_path
         sd_image_paths = [
@@ -21,7 +24,7 @@ class ShutDownHandler:
         while shared_state.shut_down_handler_running:
             for path in sd_image_paths:
                 """ sd_image = shared_state.load_image(path=path)
-                point = ocr_utils.find(sd_image)
+                point = self.ocr_utils.find(sd_image)
                 if point is not None:
                     print(
                         f"[SD] Marker detected at {point[0]}, {point[1]}. Clicking target..."
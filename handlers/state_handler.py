@@ -16,8 +16,10 @@ from utils.logger import logger
 
 
 class StateHandler:
-    def __init__(self, player_info_instance, set_console_title_instance):
-        self.ar_handler_instance = autoroll_handler.AutoRollHandler()
+    def __init__(self, player_info_instance, set_console_title_instance, frame_source=None):
+        # frame_source: live capture (default) or a recorded session, handed to every handler
+        self.frame_source = frame_source
+        self.ar_handler_instance = autoroll_handler.AutoRollHandler(frame_source)
         self.player_info = player_info_instance
         self.set_console_title = set_console_title_instance
 
@@ -86,7 +88,7 @@ class StateHandler:
             shared_state.autoroll_handler_running = True
 
     def start_building_monitor(self):
-        building_monitor_instance = building_monitor.BuildingMonitor()
+        building_monitor_instance = building_monitor.BuildingMonitor(self.frame_source)
         building_monitor_thread = Thread(
             target=building_monitor_instance.run,
             kwargs={
@@ -113,7 +115,7 @@ class StateHandler:
             shared_state.building_monitor_running = True
 
     def start_multiplier_monitor(self):
-        multiplier_monitor_instance = multiplier_monitor.MultiplierMonitor()
+        multiplier_monitor_instance = multiplier_monitor.MultiplierMonitor(self.frame_source)
         multiplier_monitor_thread = Thread(
             target=multiplier_monitor_instance.run,
             kwargs={
@@ -180,7 +182,7 @@ class StateHandler:
             "bank_heist",
             "bank_heist_handler_running",
             "bank_heist_handler_thread",
-            bank_heist_handler.BankHeistHandler().run,
+            bank_heist_handler.BankHeistHandler(self.frame_source).run,
         )
 
     def toggle_shut_down_handler(self):
@@ -188,7 +190,7 @@ class StateHandler:
             "shut_down",
             "shut_down_handler_running",
             "shut_down_handler_thread",
-            shut_down_handler.ShutDownHandler().run,
+            shut_down_handler.ShutDownHandler(self.frame_source).run,
         )
 
     def toggle_ui_handler(self):
@@ -196,7 +198,7 @@ class StateHandler:
             "ui",
             "ui_handler_running",
             "ui_handler_thread",
-            ui_handler.UIHandler().run,
+            ui_handler.UIHandler(self.frame_source).run,
         )
 
     def toggle_idle_handler(self):
@@ -204,7 +206,7 @@ class StateHandler:
             "idle",
             "idle_handler_running",
             "idle_handler_thread",
-            idle_handler.IdleHandler().run,
+            idle_handler.IdleHandler(self.frame_source).run,
         )
 
     def toggle_multiplier_monitor(self):
@@ -244,5 +246,5 @@ class StateHandler:
             "destruction",
             "destruction_handler_running",
             "destruction_handler_thread",
-            destruction_handler.DestructionHandler().run,
+            destruction_handler.DestructionHandler(self.frame_source).run,
         )
@@ -4,13 +4,15 @@ from pydirectinput import click
 from shared_state import shared_state
 import os
 from utils.logger import logger
+from utils.roi_registry import roi_registry
 from time import sleep
 
 ocr_utils = OCRUtils()
 
 
 class UIHandler:
-    def __init__(self):
+    def __init__(self, frame_source=None):
+        self.ocr_utils = OCRUtils(frame_source) if frame_source is not None else ocr_utils
         self.last_clicked_image = None
 
     def run(self):
@@ -40,22 +42,20 @@ class UIHandler:
                 random.shuffle(image_files)
                 
                 found_any = False
-                for image_path in image_files:
-                    if shared_state.idle_event.is_set():
-                        shared_state.idle_event.wait()
-                    
+                candidates = [
+                    image_path
+                    for image_path in image_files
                     # Skip specific UI elements if builder is active (e.g. build-exit lookalikes)
-                    if shared_state.builder_running and "build-exit" in image_path:
-                         continue
-
-                    if shared_state.builder_running and "friends_exit" in image_path:
-                         continue
-
-                    target_image = shared_state.load_image(image_path)
-                    
-                    # Use a slightly higher threshold for UI to avoid false positives? 
-                    # user asked for MORE tolerance, so default 0.5 is good.
-                    location = ocr_utils.find(target_image)
+                    if not (
+                        shared_state.builder_running
+                        and ("build-exit" in image_path or "friends_exit" in image_path)
+                    )
+                ]
+                # All UI templates are matched against the same frame in one batch
+                locations = self.ocr_utils.find_many(
+                    [shared_state.load_image(image_path) for image_path in candidates], first_only=True
+                )
+                for image_path, location in zip(candidates, locations):
                     if location:
                         print(f"[UI] Detected {image_path}. Clicking...")
                         with shared_state.moveTo_lock:
@@ -87,32 +87,19 @@ class UIHandler:
                         break
                 
                 # --- NEW: Check for "x" Close Button via OCR ---
-                # Region: L=45.89, T=93.81, W=8.41, H=4.79
+                # Region: "close_x" in regions.json
                 if not found_any:
                     # Skip 'x' check if builder is running (BuildingHandler manages its own exit)
                     if shared_state.builder_running:
                         continue 
 
-                    ocr_text = ocr_utils.ocr_to_str(
-                        45.89,
-                        93.81,
-                        45.89 + 8.41,
-                        93.81 + 4.79,
-                        ocr_settings=r'--psm 10' # Single character mode might be better, or 6
-                    )
+                    ocr_text = self.ocr_utils.ocr_region("close_x")
                     
                     if "x" in ocr_text.lower():
                         logger.debug(f"[UI] OCR Detected 'x' button: '{ocr_text}'. Clicking...")
                         
-                        # Calculate center of region
-                        wx, wy, ww, wh = shared_state.window
-                        
-                        # Percent to pixels
-                        cx_p = 45.89 + (8.41 / 2)
-                        cy_p = 93.81 + (4.79 / 2)
-                        
-                        target_x = wx + (ww * (cx_p / 100))
-                        target_y = wy + (wh * (cy_p / 100))
+                        # Center of the compiled region
+                        target_x, target_y = roi_registry.center("close_x", shared_state.window)
                         
                         with shared_state.moveTo_lock:
                             moveTo(target_x, target_y)
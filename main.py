@@ -5,6 +5,8 @@ from shared_state import shared_state
 from handlers.state_handler import StateHandler
 from utils.set_console_title import SetConsoleTitle
 from utils.player_info import PlayerInfo
+from utils.ocr_utils import OCRUtils
+from utils.detection_strategy import detection_strategy
 from pytesseract import pytesseract
 from time import sleep
 from pynput import keyboard
@@ -120,6 +122,9 @@ def on_key_press(key):
         print("[STATUS] Exiting...")
         logger.info("[STATUS] Exiting...")
         shared_state.save_cache("image_cache.pkl")
+        shared_state.save_pyramid_cache("template_pyramid.pkl")
+        shared_state.save_feature_cache("template_features.npz")
+        detection_strategy.save()
         exit()
 
 
@@ -129,6 +134,12 @@ def init_cache():
     else:
         shared_state.initialize_cache("images")
         shared_state.save_cache("image_cache.pkl")
+    # Resized templates are built lazily by find_template and persisted on exit
+    if os.path.exists("template_pyramid.pkl"):
+        shared_state.load_pyramid_cache("template_pyramid.pkl")
+    # SIFT features of the templates, same idea (stale entries are dropped by mtime)
+    if os.path.exists("template_features.npz"):
+        shared_state.load_feature_cache("template_features.npz")
 
 
 init_cache()
@@ -154,8 +165,18 @@ if __name__ == "__main__":
     
     state_handler.start_set_console_title()
 
+    # Learn the window scale so template matching runs at a single scale (falls back to sweeping)
+    scale = OCRUtils().calibrate_scale()
+    if scale is not None:
+        logger.info(f"Template scale calibrated: {scale:.2f}")
+    else:
+        logger.info("Template scale not calibrated yet, will learn it from the next GO/home detections")
+
     # Run visualizer (blocking until closed)
     visualizer.run()
     
     # Cleanup
     shared_state.save_cache("image_cache.pkl")
+    shared_state.save_pyramid_cache("template_pyramid.pkl")
+    shared_state.save_feature_cache("template_features.npz")
+    detection_strategy.save()
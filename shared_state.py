@@ -1,19 +1,49 @@
 from dotenv import load_dotenv
 from os import getenv as env
 from threading import Condition, Lock, Barrier, Event, RLock
-import pygetwindow as gw
-from utils.image_cache import ImageCache
+from utils.image_cache import ImageCache, TemplatePyramidCache
+from utils.feature_cache import FeatureCache
+from utils.frame_source import create_frame_source
+from utils.state_store import StateStore
+from utils.overlay_buffer import OverlayBuffer
 import os
-from pyautogui import moveTo
 import argparse
 import sys
 from utils.logger import logger
 
+try:
+    import pygetwindow as gw
+except Exception:  # pygetwindow is Windows-only; replay sources do not need it
+    gw = None
+
 load_dotenv()
 image_cache = ImageCache()
+template_pyramid = TemplatePyramidCache(image_cache)
+template_features = FeatureCache(image_cache)
+
+# Fields backed by the state store: name -> (type, initial value)
+STATE_FIELDS = {
+    "money": (int, None),  # Inizializzato a None, verrà impostato da PlayerInfo
+    "rolls": (int, None),  # Inizializzato a None, verrà impostato da PlayerInfo
+    "multiplier": (int, 1),
+    "rolling_status": (bool, False),
+    "in_home_status": (bool, True),
+    "autoroller_running": (bool, False),
+    "disable_autoroller_running": (bool, False),
+    "builder_running": (bool, False),
+    "building_monitor_running": (bool, False),
+    "multiplier_handler_running": (bool, False),
+    "multiplier_monitor_running": (bool, False),
+    "bot_status": (str, "RUNNING"),  # Current status string (e.g. "RUNNING", "PAUSED", "IDLE")
+}
+
+
+def store_field(name):
+    """
+    SharedState attribute read from and written to the state store.
+    """
+    return property(lambda self: self.store.get(name), lambda self, value: self.store.set(name, value))
 
-# Import the Global Input Accessor
-from utils.input_handler import global_input
 
 class SharedState:
     AR_MINIMUM_ROLLS = int(env("AR_MINIMUM_ROLLS", 0))
@@ -22,6 +52,21 @@ class SharedState:
     BUILD_FINISH_AMOUNT = int(env("BUILD_FINISH_AMOUNT", 0))
     # Default fallback
     DEFAULT_WINDOW_TITLE = env("WINDOW_TITLE", "BlueStacks App Player")
+    # "live" captures the window with mss; a PNG directory or a video file replays a recorded session
+    DEFAULT_FRAME_SOURCE = env("FRAME_SOURCE", "live")
+
+    money = store_field("money")
+    rolls = store_field("rolls")
+    multiplier = store_field("multiplier")
+    rolling_status = store_field("rolling_status")
+    in_home_status = store_field("in_home_status")
+    autoroller_running = store_field("autoroller_running")
+    disable_autoroller_running = store_field("disable_autoroller_running")
+    builder_running = store_field("builder_running")
+    building_monitor_running = store_field("building_monitor_running")
+    multiplier_handler_running = store_field("multiplier_handler_running")
+    multiplier_monitor_running = store_field("multiplier_monitor_running")
+    bot_status = store_field("bot_status")
 
     def __init__(self):
         # Parse arguments to get specific window title if provided
@@ -41,64 +86,80 @@ class SharedState:
         self.WINDOW_TITLE = window_title
         logger.info(f"[SHARED] Target Window Title: '{self.WINDOW_TITLE}'")
 
-        try:
-            windows = gw.getWindowsWithTitle(self.WINDOW_TITLE)
-            if not windows:
-                raise Exception(f"Window with title '{self.WINDOW_TITLE}' not found!")
-            
-            # Filter for EXACT match first
-            exact_match = None
-            for w in windows:
-                if w.title == self.WINDOW_TITLE:
-                    exact_match = w
-                    break
-            
-            if exact_match:
-                self.window_obj = exact_match
-                logger.debug(f"[SHARED] Found EXACT match for '{self.WINDOW_TITLE}'")
-            else:
-                # Fallback to first match (substring)
-                self.window_obj = windows[0]
-                logger.warning(f"[SHARED] No exact match for '{self.WINDOW_TITLE}', using '{self.window_obj.title}'")
-            
-            self.window_x = self.window_obj.left
-            self.window_y = self.window_obj.top
-            self.window_width = self.window_obj.width
-            self.window_height = self.window_obj.height
-            self.window_center_x = int(self.window_width / 2)
-            self.window_center_y = int(self.window_height / 2)
-            self.window_right = self.window_x + self.window_width
-            self.window_bottom = self.window_y + self.window_height
-            self.window = (
-                self.window_x,
-                self.window_y,
-                self.window_width,
-                self.window_height,
-            )
-            self.window_coords = (
-                self.window_x,
-                self.window_y,
-                self.window_right,
-                self.window_bottom,
-            )
-        except Exception as e:
-            logger.critical(f"[SHARED] Failed to initialize window: {e}")
-            # Initialize with dummy values to prevent immediate crash on import
-            self.window = (0, 0, 1920, 1080)
-            self.window_coords = (0, 0, 1920, 1080)
-            self.window_x = 0; self.window_y = 0; self.window_width = 1920; self.window_height=1080
+        # specific arg: --replay PATH (same manual parsing as --window)
+        frame_source_spec = self.DEFAULT_FRAME_SOURCE
+        if "--replay" in sys.argv:
+            idx = sys.argv.index("--replay")
+            if idx + 1 < len(sys.argv):
+                frame_source_spec = sys.argv[idx + 1]
+        self.FRAME_SOURCE = frame_source_spec
+
+        if self.FRAME_SOURCE == "live":
+            try:
+                if gw is None:
+                    raise Exception("pygetwindow is not available on this platform")
+                windows = gw.getWindowsWithTitle(self.WINDOW_TITLE)
+                if not windows:
+                    raise Exception(f"Window with title '{self.WINDOW_TITLE}' not found!")
+                
+                # Filter for EXACT match first
+                exact_match = None
+                for w in windows:
+                    if w.title == self.WINDOW_TITLE:
+                        exact_match = w
+                        break
+                
+                if exact_match:
+                    self.window_obj = exact_match
+                    logger.debug(f"[SHARED] Found EXACT match for '{self.WINDOW_TITLE}'")
+                else:
+                    # Fallback to first match (substring)
+                    self.window_obj = windows[0]
+                    logger.warning(f"[SHARED] No exact match for '{self.WINDOW_TITLE}', using '{self.window_obj.title}'")
+                
+                self.window_x = self.window_obj.left
+                self.window_y = self.window_obj.top
+                self.window_width = self.window_obj.width
+                self.window_height = self.window_obj.height
+                self.window_center_x = int(self.window_width / 2)
+                self.window_center_y = int(self.window_height / 2)
+                self.window_right = self.window_x + self.window_width
+                self.window_bottom = self.window_y + self.window_height
+                self.window = (
+                    self.window_x,
+                    self.window_y,
+                    self.window_width,
+                    self.window_height,
+                )
+                self.window_coords = (
+                    self.window_x,
+                    self.window_y,
+                    self.window_right,
+                    self.window_bottom,
+                )
+            except Exception as e:
+                logger.critical(f"[SHARED] Failed to initialize window: {e}")
+                # Initialize with dummy values to prevent immediate crash on import
+                self.set_window((0, 0, 1920, 1080))
+        else:
+            # Placeholder, replaced below by the geometry of the replayed frames
+            self.set_window((0, 0, 1920, 1080))
+
+        # Frame source used by the FrameBus. Replay sources define their own window geometry.
+        self.frame_source = create_frame_source(self.FRAME_SOURCE, self.window, locate=self.locate_window)
+        if not self.frame_source.live:
+            logger.info(f"[SHARED] Replaying frames from {self.frame_source.name}")
+            self.set_window(self.frame_source.window)
 
         self.current_path = os.path.dirname(os.path.abspath(__file__))
+        # Versioned state (money, rolls, running flags, ...), see utils/state_store.py
+        self.store = StateStore(STATE_FIELDS)
         # Variables
         self.autoroll_handler_running = False
-        self.autoroller_running = False
         self.autoroller_thread_is_alive = False
-        self.disable_autoroller_running = False
         self.disable_autoroller_thread_is_alive = False
         self.autoroll_monitor_running = False
 
-        self.builder_running = False
-        self.building_monitor_running = False
         self.building_handler_thread_is_alive = False
         self.builder_finished = False
 
@@ -109,24 +170,16 @@ class SharedState:
         self.destruction_handler_running = False
         self.popup_handled = False
 
-        self.multiplier_handler_running = False
-        self.multiplier_monitor_running = False
-
-        self.money = None  # Inizializzato a None, verrà impostato da PlayerInfo
-        self.rolls = None  # Inizializzato a None, verrà impostato da PlayerInfo
-        self.multiplier = 1
         self.BUILD_START_AMOUNT = 1
-        self.rolling_status = False
-        self.in_home_status = True
-        # Conditions
+        # Conditions (those of store fields are notified by the store on every write, see StateStore.field_condition)
         self.autoroll_handler_condition = Condition()
         self.autoroll_handler_running_condition = Condition()
-        self.autoroller_running_condition = Condition()
-        self.disable_autoroller_running_condition = Condition()
+        self.autoroller_running_condition = self.store.field_condition("autoroller_running")
+        self.disable_autoroller_running_condition = self.store.field_condition("disable_autoroller_running")
         self.autoroll_monitor_condition = Condition()
 
         self.building_monitor_condition = Condition()
-        self.builder_running_condition = Condition()
+        self.builder_running_condition = self.store.field_condition("builder_running")
         self.builder_finished_condition = Condition()
 
         self.bank_heist_condition = Condition()
@@ -135,15 +188,15 @@ class SharedState:
         self.idle_condition = Condition()
         self.destruction_condition = Condition()
 
-        self.multiplier_condition = Condition()
+        self.multiplier_condition = self.store.field_condition("multiplier")
         self.multiplier_monitor_condition = Condition()
-        self.multiplier_handler_running_condition = Condition()
+        self.multiplier_handler_running_condition = self.store.field_condition("multiplier_handler_running")
         self.multiplier_handler_finished_condition = Condition()
 
-        self.rolls_condition = Condition()
-        self.money_condition = Condition()
-        self.rolling_condition = Condition()
-        self.in_home_condition = Condition()
+        self.rolls_condition = self.store.field_condition("rolls")
+        self.money_condition = self.store.field_condition("money")
+        self.rolling_condition = self.store.field_condition("rolling_status")
+        self.in_home_condition = self.store.field_condition("in_home_status")
         # Locks
         self.multiplier_monitor_lock = Lock()
         self.autoroller_lock = Lock()
@@ -161,9 +214,41 @@ class SharedState:
         self.idle_event = Event()
         
         # Debug / Visualizer
-        self.debug_overlays = [] # List of tuples: (rect/point, label, timestamp)
+        self.debug_overlays = OverlayBuffer() # Ring buffer of tuples: (rect/point, label, timestamp)
         self.recent_logs = [] # List of strings
-        self.bot_status = "RUNNING" # Current status string (e.g. "RUNNING", "PAUSED", "IDLE")
+
+    def set_window(self, window):
+        """
+        Set the window geometry (x, y, width, height) and every attribute derived from it.
+        """
+        self.window_x, self.window_y, self.window_width, self.window_height = window
+        self.window_center_x = int(self.window_width / 2)
+        self.window_center_y = int(self.window_height / 2)
+        self.window_right = self.window_x + self.window_width
+        self.window_bottom = self.window_y + self.window_height
+        self.window = tuple(window)
+        self.window_coords = (
+            self.window_x,
+            self.window_y,
+            self.window_right,
+            self.window_bottom,
+        )
+
+    def locate_window(self):
+        """
+        Re-read the geometry of the live window (it may have been moved or resized) and apply it with set_window.
+
+        Returns:
+            tuple | None: The window geometry (x, y, width, height), None if there is no live window.
+        """
+        window_obj = getattr(self, "window_obj", None)
+        # A minimized window reports a placeholder geometry: keep the last one
+        if window_obj is None or window_obj.isMinimized:
+            return None
+        window = (window_obj.left, window_obj.top, window_obj.width, window_obj.height)
+        if window != self.window:
+            self.set_window(window)
+        return window
 
     def load_image(self, path: str):
         return image_cache.load_image(path)
@@ -177,13 +262,36 @@ class SharedState:
     def initialize_cache(self, directory: str, recursive=True):
         image_cache.initialize_cache(directory, recursive)
 
+    def get_image_path(self, image):
+        return image_cache.get_path(image)
+
+    def get_scaled_template(self, template, scale, color_mode="bgr", interpolation=None):
+        return template_pyramid.get(template, scale, color_mode, interpolation)
+
+    def save_pyramid_cache(self, path: str):
+        template_pyramid.save_cache(path)
+
+    def load_pyramid_cache(self, path: str):
+        template_pyramid.load_cache(path)
+
+    def get_template_features(self, template, backend="sift"):
+        return template_features.get(template, backend)
+
+    def save_feature_cache(self, path: str):
+        template_features.save_cache(path)
+
+    def load_feature_cache(self, path: str):
+        template_features.load_cache(path)
+
     def moveto_center(self):
         # Use Global Input Lock for Safe MoveTo
         # Calculate center manually or use global_input if simple move
         center_x = self.window_x + self.window_center_x
         center_y = self.window_y + self.window_center_y
         
-        # Use global input handler
+        # Use global input handler (imported lazily: it needs msvcrt, unavailable in headless replay)
+        from utils.input_handler import global_input
+
         global_input.safe_move_to(center_x, center_y, duration=0.2)
 
 
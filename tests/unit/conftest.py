@@ -0,0 +1,28 @@
+"""
+Unit tests of the vision and state utilities. They run headless: frames come from the recorded
+screenshots in debug_screenshots/ through the replay frame sources, never from the live window.
+
+    python -m pytest
+"""
+
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCREENSHOTS = os.path.join(ROOT, "debug_screenshots")
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def calibrator(monkeypatch):
+    """
+    The shared scale calibrator, uncalibrated, with the per-window data file left untouched.
+    """
+    from utils.scale_calibrator import scale_calibrator
+    from utils.window_data import window_data
+
+    monkeypatch.setattr(window_data, "save_data", lambda: None)
+    scale_calibrator.reset()
+    yield scale_calibrator
+    scale_calibrator.reset()
@@ -0,0 +1,96 @@
+import os
+import cv2
+import numpy as np
+from conftest import SCREENSHOTS
+from utils.change_detector import CHANGE_THRESHOLD, ChangeDetector
+
+ROLLS = os.path.join(SCREENSHOTS, "glyphs", "rolls")
+
+
+def crop(value=0, shape=(40, 160, 3)):
+    return np.full(shape, value, np.uint8)
+
+
+def test_first_check_reports_a_change():
+    detector = ChangeDetector(threshold=2.0, refresh_s=10)
+    assert detector.changed("rolls", crop(), now=100)
+
+
+def test_noise_below_threshold_is_no_change():
+    detector = ChangeDetector(threshold=2.0, refresh_s=10)
+    detector.changed("rolls", crop(100), now=100)
+    assert not detector.changed("rolls", crop(101), now=101)
+    assert detector.changed("rolls", crop(110), now=102)
+    assert detector.skips["rolls"] == 1
+
+
+def test_small_text_change_is_detected():
+    detector = ChangeDetector(threshold=2.0, refresh_s=10)
+    before = crop(0)
+    after = before.copy()
+    # A digit changing: a 20x16 patch of a 40x160 crop
+    after[10:30, 70:86] = 255
+    detector.changed("rolls", before, now=100)
+    assert detector.changed("rolls", after, now=101)
+
+
+def test_one_digit_change_on_real_hud_crops():
+    detector = ChangeDetector(threshold=CHANGE_THRESHOLD, refresh_s=10)
+    zero = cv2.imread(os.path.join(ROLLS, "rolls_01.png"))  # "0/50"
+    seven = cv2.imread(os.path.join(ROLLS, "rolls_02.png"))  # "7/50"
+    # The same screen captured again: a few grey levels of noise
+    noise = np.random.default_rng(0).integers(-2, 3, zero.shape)
+    recapture = np.clip(zero.astype(int) + noise, 0, 255).astype(np.uint8)
+    assert detector.changed("rolls", zero, now=100)
+    assert not detector.changed("rolls", recapture, now=101)
+    assert not detector.changed("rolls", zero.copy(), now=102)
+    # One digit out of four: the signatures differ by ~3.1 grey levels on average
+    assert detector.changed("rolls", seven, now=103)
+    assert not detector.changed("rolls", seven.copy(), now=104)
+
+
+def test_reference_follows_accepted_changes_only():
+    detector = ChangeDetector(threshold=2.0, refresh_s=10)
+    detector.changed("rolls", crop(100), now=100)
+    # Slow drift: each step is below the threshold, compared with the same reference
+    assert not detector.changed("rolls", crop(101), now=101)
+    assert not detector.changed("rolls", crop(102), now=102)
+    assert detector.changed("rolls", crop(103), now=103)
+
+
+def test_refresh_interval_forces_a_change():
+    detector = ChangeDetector(threshold=2.0, refresh_s=10)
+    detector.changed("rolls", crop(), now=100)
+    assert not detector.changed("rolls", crop(), now=109)
+    assert detector.changed("rolls", crop(), now=110)
+    assert detector.forced["rolls"] == 1
+    # The refresh made it the new reference
+    assert not detector.changed("rolls", crop(), now=111)
+
+
+def test_forget():
+    detector = ChangeDetector(threshold=2.0, refresh_s=10)
+    detector.changed("rolls", crop(), now=100)
+    detector.forget("rolls")
+    assert detector.changed("rolls", crop(), now=101)
+
+
+def test_signature_ignores_crop_size_and_channels():
+    detector = ChangeDetector(threshold=2.0, refresh_s=10)
+    detector.changed("rolls", crop(), now=100)
+    # One pixel more after a window move, or a grayscale crop: same signature
+    assert not detector.changed("rolls", crop(shape=(41, 161, 3)), now=101)
+    assert not detector.changed("rolls", crop(shape=(40, 160)), now=102)
+    # Nothing to compare: always read
+    assert detector.changed("rolls", np.zeros((0, 0, 3), np.uint8), now=103)
+
+
+def test_keys_are_independent_and_stats():
+    detector = ChangeDetector(threshold=2.0, refresh_s=10)
+    detector.changed("rolls", crop(0), now=100)
+    detector.changed("money", crop(255), now=100)
+    assert not detector.changed("rolls", crop(0), now=101)
+    assert detector.stats() == {
+        "rolls": {"checks": 2, "skipped": 1, "forced": 0, "skip_ratio": 0.5},
+        "money": {"checks": 1, "skipped": 0, "forced": 0, "skip_ratio": 0.0},
+    }
@@ -0,0 +1,37 @@
+import os
+import pytest
+from conftest import ROOT, SCREENSHOTS
+from shared_state import shared_state
+from utils.frame_source import ImageDirFrameSource
+from utils.ocr_utils import OCRUtils
+
+# Center of the GO button in playerinfo_screenshot.png, and a region around it (a full frame sweep takes seconds)
+GO_CENTER = (1264, 1084)
+GO_AREA = (900, 850, 1650, 1300)
+
+
+@pytest.fixture(scope="module")
+def ocr():
+    return OCRUtils(ImageDirFrameSource(os.path.join(SCREENSHOTS, "playerinfo_screenshot.png")))
+
+
+@pytest.fixture(scope="module")
+def go():
+    return shared_state.load_image(os.path.join(ROOT, "images", "go.png"))
+
+
+@pytest.mark.parametrize("mode", ["exhaustive", "pyramid"])
+def test_find_go_button(ocr, go, calibrator, mode):
+    x, y = ocr.find_template(go, bbox=GO_AREA, mode=mode)
+    assert abs(x - GO_CENTER[0]) <= 2 and abs(y - GO_CENTER[1]) <= 2
+
+
+def test_pyramid_matches_exhaustive(ocr, go, calibrator):
+    calibrator.lock_scale(1.0, ocr.frame_bus.get_frame().size)
+    assert ocr.find_template(go, mode="pyramid") == ocr.find_template(go, mode="exhaustive")
+
+
+@pytest.mark.parametrize("mode", ["exhaustive", "pyramid"])
+def test_absent_template(ocr, go, calibrator, mode):
+    # Top-left corner of the board, far from the GO button
+    assert ocr.find_template(go, bbox=(0, 0, 400, 300), threshold=0.8, mode=mode) is None
@@ -0,0 +1,86 @@
+import cv2
+import numpy as np
+import pytest
+from utils.frame_bus import FrameBus
+from utils.frame_source import ImageDirFrameSource, MssFrameSource, VideoFrameSource, create_frame_source
+
+# Frame i is a flat 60x40 image of value LEVELS[i], with a white marker pixel at (x=10, y=5)
+LEVELS = (40, 120, 200)
+
+
+def frame_image(level):
+    image = np.full((40, 60, 3), level, np.uint8)
+    image[5, 10] = 255
+    return image
+
+
+@pytest.fixture
+def recording(tmp_path):
+    # Written out of order: replay follows the file names
+    for i in reversed(range(len(LEVELS))):
+        cv2.imwrite(str(tmp_path / f"frame_{i:02d}.png"), frame_image(LEVELS[i]))
+    (tmp_path / "notes.txt").write_text("not a frame")
+    return tmp_path
+
+
+def test_replay_order_and_end_of_stream(recording):
+    bus = FrameBus(ImageDirFrameSource(str(recording), loop=False), max_age_ms=0)
+    assert bus.window == (0, 0, 60, 40)
+    frames = [bus.get_frame() for _ in LEVELS]
+    assert [frame.seq for frame in frames] == [1, 2, 3]
+    assert [int(frame.image[20, 30, 0]) for frame in frames] == list(LEVELS)
+    # End of the recording: no frame, and the last one is kept for fresh-enough requests
+    assert bus.get_frame() is None
+    assert bus.get_frame(max_age_ms=60000) is frames[-1]
+    assert bus.captures == 3
+
+
+def test_replay_loops(recording):
+    bus = FrameBus(ImageDirFrameSource(str(recording)), max_age_ms=0)
+    levels = [int(bus.get_frame().image[20, 30, 0]) for _ in range(len(LEVELS) + 1)]
+    assert levels == list(LEVELS) + [LEVELS[0]]
+
+
+def test_clip_and_crop(recording):
+    frame = FrameBus(ImageDirFrameSource(str(recording)), max_age_ms=0).get_frame()
+    assert frame.size == (60, 40)
+    assert frame.clip() == (0, 0, 60, 40)
+    # Regions partly or fully outside the window are clipped to it
+    assert frame.clip((50, 30, 100, 100)) == (50, 30, 60, 40)
+    assert frame.clip((-10, -10, 20, 15)) == (0, 0, 20, 15)
+    assert frame.crop((100, 100, 200, 200)).size == 0
+    crop = frame.crop((8, 4, 18, 10))
+    assert crop.shape == (6, 10, 3) and crop[1, 2, 0] == 255
+    # A view on the shared frame, not a copy
+    assert np.shares_memory(crop, frame.image)
+
+
+def test_video_replay(tmp_path):
+    path = str(tmp_path / "session.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (60, 40))
+    if not writer.isOpened():
+        pytest.skip("no video encoder in this OpenCV build")
+    for level in LEVELS:
+        writer.write(frame_image(level))
+    writer.release()
+
+    bus = FrameBus(VideoFrameSource(path, loop=False), max_age_ms=0)
+    assert bus.window == (0, 0, 60, 40)
+    levels = [int(bus.get_frame().image[20, 30, 0]) for _ in LEVELS]
+    # MJPG is lossy
+    assert levels == pytest.approx(LEVELS, abs=8)
+    assert bus.get_frame() is None
+    bus.source.close()
+
+
+def test_create_frame_source(recording):
+    window = (100, 200, 60, 40)
+    assert isinstance(create_frame_source("", window), MssFrameSource)
+    assert create_frame_source("live", window).window == window
+    assert isinstance(create_frame_source(str(recording), window), ImageDirFrameSource)
+    assert create_frame_source(str(recording / "frame_01.png"), window).files == [str(recording / "frame_01.png")]
+    with pytest.raises(ValueError):
+        create_frame_source(str(recording / "notes.txt"), window)
+    # Videos are picked by extension (opening a missing one fails)
+    with pytest.raises(ValueError, match="Unable to open video"):
+        create_frame_source(str(recording / "missing.mp4"), window)
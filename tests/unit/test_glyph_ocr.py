@@ -0,0 +1,70 @@
+import json
+import os
+import cv2
+import pytest
+from conftest import SCREENSHOTS
+from utils.glyph_ocr import GlyphOCR, text_is_bright
+from utils.roi_registry import roi_registry
+
+GLYPHS = os.path.join(SCREENSHOTS, "glyphs")
+# Labeled crops never used to build the templates
+HELDOUT = os.path.join(SCREENSHOTS, "glyphs_heldout")
+FIELDS = [("cost", "building1_cost"), ("money", "money"), ("rolls", "rolls"), ("multiplier", "multiplier")]
+
+
+def labeled(field, crops_dir=GLYPHS):
+    with open(os.path.join(crops_dir, field, "labels.json"), "r") as f:
+        return sorted(json.load(f).items())
+
+
+def read(glyph_ocr, crops_dir, field, region, file):
+    settings = roi_registry.ocr_settings(region)
+    image = cv2.imread(os.path.join(crops_dir, field, file))
+    return glyph_ocr.recognize(image, settings["charset"], text_is_bright(settings))
+
+
+@pytest.fixture(scope="module")
+def glyph_ocr():
+    return GlyphOCR()
+
+
+def test_text_polarity():
+    assert text_is_bright({})
+    assert not text_is_bright({"process_settings": {"invert": True}})
+    assert text_is_bright({"process_settings": {"invert": True}, "bright_text": True})
+    assert not text_is_bright(roi_registry.ocr_settings("money"))
+    assert not text_is_bright(roi_registry.ocr_settings("building1_cost"))
+    assert text_is_bright(roi_registry.ocr_settings("rolls"))
+
+
+@pytest.mark.parametrize("field, region", FIELDS)
+def test_reads_training_crops(glyph_ocr, field, region):
+    for file, text in labeled(field):
+        assert read(glyph_ocr, GLYPHS, field, region, file) == text, file
+
+
+def test_heldout_accuracy(glyph_ocr):
+    # An unread field falls back to Tesseract, a wrong one is a misread value: no wrong reads are accepted.
+    # rolls_01 has its top cut by the crop and money_02 touching glyphs; both are left to Tesseract.
+    results = {"correct": [], "unread": []}
+    for field, region in FIELDS:
+        for file, text in labeled(field, HELDOUT):
+            result = read(glyph_ocr, HELDOUT, field, region, file)
+            assert result in (text, None), f"{field}/{file}: read '{result}', expected '{text}'"
+            results["correct" if result == text else "unread"].append(f"{field}/{file}")
+    assert results["unread"] == ["money/money_02.png", "rolls/rolls_01.png"]
+    assert len(results["correct"]) == 5
+
+
+def test_unreadable_field_falls_back(glyph_ocr):
+    # Blank crop: no glyphs, the caller falls back to Tesseract
+    image = cv2.imread(os.path.join(GLYPHS, "cost", "cost_01.png"))
+    image[:] = 255
+    assert glyph_ocr.recognize(image, "0123456789.MK", bright_text=False) is None
+
+
+def test_money_separator(glyph_ocr):
+    # Its comma is barely taller than a dot: read with the money charset, not guessed when both are allowed
+    image = cv2.imread(os.path.join(HELDOUT, "money", "money_01.png"))
+    assert glyph_ocr.recognize(image, roi_registry.ocr_settings("money")["charset"], bright_text=False) == "716,565"
+    assert glyph_ocr.recognize(image, "0123456789,.", bright_text=False) is None
@@ -0,0 +1,41 @@
+import os
+import cv2
+import numpy as np
+from utils.image_cache import ImageCache, TemplatePyramidCache
+
+
+def template_file(tmp_path):
+    path = str(tmp_path / "button.png")
+    cv2.imwrite(path, np.random.default_rng(0).integers(0, 255, (40, 60, 3), dtype=np.uint8))
+    return path
+
+
+def test_pyramid_round_trip(tmp_path):
+    path = template_file(tmp_path)
+    images = ImageCache()
+    pyramid = TemplatePyramidCache(images)
+    resized = pyramid.get(images.load_image(path), 0.5, "gray")
+    assert resized.shape == (20, 30)
+    # Templates not loaded through the ImageCache are not persisted
+    pyramid.get(np.zeros((10, 10, 3), np.uint8), 0.5)
+    pyramid.save_cache(str(tmp_path / "pyramid.pkl"))
+
+    loaded = TemplatePyramidCache(ImageCache())
+    loaded.load_cache(str(tmp_path / "pyramid.pkl"))
+    assert list(loaded.cache) == [(path, 0.5, "gray")]
+    assert np.array_equal(loaded.cache[(path, 0.5, "gray")][2], resized)
+
+
+def test_pyramid_drops_entries_of_modified_templates(tmp_path):
+    path = template_file(tmp_path)
+    images = ImageCache()
+    pyramid = TemplatePyramidCache(images)
+    pyramid.get(images.load_image(path), 0.5)
+    pyramid.save_cache(str(tmp_path / "pyramid.pkl"))
+
+    # The template is edited in place (same size): the persisted resize is stale
+    mtime = os.path.getmtime(path)
+    os.utime(path, (mtime + 10, mtime + 10))
+    loaded = TemplatePyramidCache(ImageCache())
+    loaded.load_cache(str(tmp_path / "pyramid.pkl"))
+    assert loaded.cache == {}
@@ -0,0 +1,60 @@
+import numpy as np
+from utils.ocr_cache import OCRCache, image_digest
+
+
+def crop(value):
+    return np.full((8, 16), value, np.uint8)
+
+
+def test_digest_depends_on_pixels_and_shape():
+    assert image_digest(crop(0)) == image_digest(crop(0))
+    assert image_digest(crop(0)) != image_digest(crop(1))
+    assert image_digest(np.zeros((8, 16), np.uint8)) != image_digest(np.zeros((16, 8), np.uint8))
+    # Views are hashed by their pixels, not their memory layout
+    image = np.arange(64, dtype=np.uint8).reshape(8, 8)
+    assert image_digest(image[:, ::2]) == image_digest(image[:, ::2].copy())
+
+
+def test_key_includes_config():
+    assert OCRCache.key_for(crop(0), "--psm 7") != OCRCache.key_for(crop(0), "--psm 6")
+
+
+def test_hits_and_misses():
+    cache = OCRCache(max_entries=4)
+    key = cache.key_for(crop(0), "--psm 7")
+    assert cache.get(key) is None
+    cache.put(key, "35/50")
+    assert cache.get(key) == "35/50"
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_lru_eviction():
+    cache = OCRCache(max_entries=2)
+    a, b, c = (cache.key_for(crop(value)) for value in (1, 2, 3))
+    cache.put(a, "a")
+    cache.put(b, "b")
+    # Using a makes b the least recently used entry
+    assert cache.get(a) == "a"
+    cache.put(c, "c")
+    assert cache.get(b) is None
+    assert cache.get(a) == "a" and cache.get(c) == "c"
+    assert len(cache.entries) == 2
+
+
+def test_empty_text_is_cached():
+    cache = OCRCache()
+    key = cache.key_for(crop(0))
+    cache.put(key, "")
+    assert cache.get(key) == ""
+    assert cache.hits == 1
+
+
+def test_clear():
+    cache = OCRCache()
+    key = cache.key_for(crop(0))
+    cache.put(key, "x1")
+    cache.get(key)
+    cache.clear()
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (0, 1)
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from utils import ocr_engine
+from utils.ocr_engine import TesseractCLIEngine, parse_config, tile_images, TILE_GAP
+
+
+def test_parse_config_full():
+    psm, oem, variables = parse_config("--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789.MK")
+    assert (psm, oem) == (7, 3)
+    assert variables == {"tessedit_char_whitelist": "0123456789.MK"}
+
+
+def test_parse_config_quoted_whitelist():
+    psm, oem, variables = parse_config('--psm 6 -c tessedit_char_whitelist="0123456789/"')
+    assert (psm, oem) == (6, None)
+    assert variables == {"tessedit_char_whitelist": "0123456789/"}
+
+
+def test_parse_config_whitelist_with_space():
+    # Quoted values keep their spaces
+    _, _, variables = parse_config('--psm 7 -c "tessedit_char_whitelist=0123456789:. "')
+    assert variables["tessedit_char_whitelist"] == "0123456789:. "
+
+
+def test_parse_config_empty():
+    assert parse_config(None) == (None, None, {})
+    assert parse_config("") == (None, None, {})
+
+
+def test_parse_config_ignores_unknown_and_dangling_args():
+    assert parse_config("-l eng --psm") == (None, None, {})
+
+
+def test_tile_images():
+    dark = np.zeros((10, 30), np.uint8)
+    light = np.full((20, 50, 3), 255, np.uint8)
+    canvas, spans = tile_images([dark, light])
+    assert canvas.shape == (10 + 20 + 3 * TILE_GAP, 50 + 2 * TILE_GAP)
+    assert spans == [(TILE_GAP, TILE_GAP + 10), (2 * TILE_GAP + 10, 2 * TILE_GAP + 30)]
+    # Each tile sits on a band of its own background colour
+    assert canvas[TILE_GAP - 2, 0] == 0
+    assert canvas[spans[1][0] - 2, 0] == 255
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    """
+    A CLI engine recording its tesseract calls instead of running them.
+
+    image_to_data answers with engine.words: [(text, left, top, width, height)] on the tiled image.
+    """
+    engine = TesseractCLIEngine()
+    engine.calls = []
+    engine.words = []
+
+    def image_to_string(image, config=None):
+        engine.calls.append(("single", config))
+        return "single"
+
+    def image_to_data(image, config=None, output_type=None):
+        engine.calls.append(("tiled", config))
+        engine.canvas = image
+        data = {key: [] for key in ("text", "left", "top", "width", "height", "block_num", "par_num", "line_num")}
+        for text, left, top, width, height in engine.words:
+            for key, value in zip(("text", "left", "top", "width", "height"), (text, left, top, width, height)):
+                data[key].append(value)
+            for key in ("block_num", "par_num", "line_num"):
+                data[key].append(1)
+        # Empty entries for the page, block and line levels
+        data["text"].append("")
+        for key in ("left", "top", "width", "height", "block_num", "par_num", "line_num"):
+            data[key].append(0)
+        return data
+
+    monkeypatch.setattr(ocr_engine.pytesseract, "image_to_string", image_to_string)
+    monkeypatch.setattr(ocr_engine.pytesseract, "image_to_data", image_to_data)
+    return engine
+
+
+def test_tile_images_row():
+    canvas, spans = tile_images([np.zeros((10, 30), np.uint8), np.zeros((20, 50), np.uint8)], "row")
+    assert canvas.shape == (20 + 2 * TILE_GAP, 30 + 50 + 3 * TILE_GAP)
+    assert spans == [(TILE_GAP, TILE_GAP + 30), (2 * TILE_GAP + 30, 2 * TILE_GAP + 80)]
+
+
+def test_cli_batch_tiles_single_line_psm_in_a_row(cli):
+    config = "--psm 7 -c tessedit_char_whitelist=0123456789.MK"
+    images = [np.zeros((10, 30), np.uint8)] * 3
+    # Tiles span x = 20-50, 70-100 and 120-150; the second one is read as two words
+    cli.words = [("1.5M", 22, 25, 26, 10), ("12", 72, 25, 10, 10), ("K", 86, 25, 8, 10), ("300", 124, 24, 20, 11)]
+    assert cli.recognize_batch(images, config) == ["1.5M", "12 K", "300"]
+    # One process, the caller's config unchanged
+    assert cli.calls == [("tiled", config)]
+    assert cli.canvas.shape == (10 + 2 * TILE_GAP, 3 * 30 + 4 * TILE_GAP)
+
+
+def test_cli_batch_tiles_block_psm_in_a_column(cli):
+    images = [np.zeros((10, 30), np.uint8), np.zeros((30, 30), np.uint8)]
+    # Tiles span y = 20-30 and 50-80; words come out of tesseract in any order
+    cli.words = [("50", 40, 70, 20, 8), ("7/50", 22, 21, 25, 8), ("of", 20, 52, 10, 8)]
+    assert cli.recognize_batch(images, "--psm 6") == ["7/50", "of 50"]
+    assert cli.calls == [("tiled", "--psm 6")]
+
+
+def test_cli_batch_reads_untileable_psm_one_by_one(cli):
+    images = [np.zeros((10, 30), np.uint8)] * 2
+    assert cli.recognize_batch(images, "--psm 8") == ["single"] * 2
+    assert cli.calls == [("single", "--psm 8")] * 2
+
+
+def test_cli_many_shares_one_read_across_whitelists(cli):
+    images = [np.zeros((10, 30), np.uint8)] * 3
+    configs = [
+        "--psm 7 -c tessedit_char_whitelist=0123456789,",
+        '--psm 7 -c tessedit_char_whitelist="0123456789/"',
+        "--psm 7 --oem 3 -c tessedit_char_whitelist=x0123456789",
+    ]
+    cli.words = [("716,565", 22, 25, 26, 10), ("7/50", 72, 25, 20, 10), ("x5/", 124, 24, 20, 11)]
+    assert cli.recognize_many(list(zip(images, configs))) == ["716,565", "7/50", "x5"]
+    (kind, config), = cli.calls
+    assert kind == "tiled"
+    assert parse_config(config) == (7, 3, {"tessedit_char_whitelist": ",/0123456789x"})
+
+
+def test_cli_many_keeps_other_configs_apart(cli):
+    image = np.zeros((10, 30), np.uint8)
+    items = [(image, "--psm 6"), (image, "--psm 7"), (image, "--psm 6"), (image, "--psm 7"), (image, "--psm 8")]
+    assert cli.recognize_many(items) == ["", "", "", "", "single"]
+    assert cli.calls == [("tiled", "--psm 6"), ("tiled", "--psm 7"), ("single", "--psm 8")]
@@ -0,0 +1,42 @@
+import time
+from utils.overlay_buffer import OverlayBuffer
+
+
+def overlay(label, age_s=0.0):
+    return ((0, 0, 10, 10), label, time.time() - age_s)
+
+
+def labels(buffer):
+    return [label for _, label, _ in buffer]
+
+
+def test_keeps_insertion_order():
+    buffer = OverlayBuffer(capacity=4, ttl_s=2.0)
+    for label in "abc":
+        buffer.append(overlay(label))
+    assert labels(buffer) == ["a", "b", "c"]
+    assert len(buffer) == 3
+
+
+def test_wraps_around_overwriting_the_oldest():
+    buffer = OverlayBuffer(capacity=3, ttl_s=2.0)
+    for label in "abcde":
+        buffer.append(overlay(label))
+    assert labels(buffer) == ["c", "d", "e"]
+    assert len(buffer.slots) == 3
+    assert buffer.written == 5
+
+
+def test_expired_overlays_are_skipped():
+    buffer = OverlayBuffer(capacity=4, ttl_s=2.0)
+    buffer.append(overlay("old", age_s=3))
+    buffer.append(overlay("new"))
+    buffer.append(overlay("older", age_s=5))
+    assert labels(buffer) == ["new"]
+    assert len(buffer) == 1
+
+
+def test_empty():
+    buffer = OverlayBuffer(capacity=4)
+    assert labels(buffer) == []
+    assert len(buffer) == 0
@@ -0,0 +1,118 @@
+import logging
+import time
+import numpy as np
+import pytest
+from utils.change_detector import change_detector
+from utils.frame_bus import FrameBus
+from utils.frame_source import FrameSource
+from utils.perception_scheduler import PerceptionScheduler
+
+
+class StillSource(FrameSource):
+    """
+    Serves the same image on every read, so the HUD regions never change.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.image = np.zeros((400, 600, 3), np.uint8)
+        self.window = (0, 0, 600, 400)
+
+    def read(self):
+        return self.image.copy()
+
+
+class Task:
+    def __init__(self, result=None):
+        self.result = result
+        self.runs = 0
+        self.heartbeats = 0
+
+    def run(self):
+        self.runs += 1
+        return self.result
+
+    def heartbeat(self):
+        self.heartbeats += 1
+
+
+@pytest.fixture
+def scheduler():
+    change_detector.forget("rolls")
+    # max_age_ms=0: every tick captures a new frame
+    yield PerceptionScheduler(FrameBus(StillSource(), max_age_ms=0))
+    change_detector.forget("rolls")
+
+
+def tick(scheduler):
+    for task in scheduler.tasks:
+        task.due = 0.0
+    scheduler.tick()
+
+
+def test_unchanged_region_gets_a_heartbeat(scheduler):
+    task = Task()
+    scheduler.add("rolls", task.run, period_s=0.5, regions=("rolls",), heartbeat=task.heartbeat)
+    tick(scheduler)
+    tick(scheduler)
+    tick(scheduler)
+    assert (task.runs, task.heartbeats) == (1, 2)
+    assert scheduler.tasks[0].unchanged == 2
+
+
+def test_unreliable_read_is_retried(scheduler):
+    task = Task(result=False)
+    scheduler.add("rolls", task.run, period_s=0.5, regions=("rolls",), heartbeat=task.heartbeat)
+    tick(scheduler)
+    tick(scheduler)
+    # Each False forgot the region reference, so the unchanged region is read again
+    assert (task.runs, task.heartbeats) == (2, 0)
+    task.result = True
+    tick(scheduler)
+    tick(scheduler)
+    assert (task.runs, task.heartbeats) == (3, 1)
+
+
+def test_failing_task_counts_as_unreliable(scheduler):
+    def fail():
+        raise RuntimeError("OCR engine down")
+
+    scheduler.add("rolls", fail, period_s=0.5, regions=("rolls",))
+    tick(scheduler)
+    tick(scheduler)
+    assert scheduler.tasks[0].runs == 2
+
+
+def test_disabled_task_is_skipped(scheduler):
+    task = Task()
+    scheduler.add("rolling", task.run, period_s=0.5, enabled=lambda: False)
+    tick(scheduler)
+    assert task.runs == 0
+    assert scheduler.tasks[0].skipped == 1
+
+
+def test_task_runs_once_per_frame(scheduler):
+    task = Task()
+    scheduler.add("rolling", task.run, period_s=0.5)
+    scheduler.frame_bus.max_age_ms = float("inf")
+    tick(scheduler)
+    tick(scheduler)
+    assert task.runs == 1
+    assert scheduler.tasks[0].skipped == 1
+
+
+def test_period_follows_the_rate(scheduler):
+    task = Task()
+    scheduler.rate = lambda name, period_s: period_s * 8
+    added = scheduler.add("rolling", task.run, period_s=0.5)
+    due = added.due = time.time()
+    scheduler.tick()
+    assert added.due == pytest.approx(due + 4)
+
+
+def test_reporters_are_logged(scheduler, caplog):
+    scheduler.add_reporter("filter", lambda: {"money": {"rejection_rate": 0.25}})
+    # Numeric level: utils/logger.py renames level 15 "DEBUG"
+    with caplog.at_level(logging.DEBUG, logger="MonopolyGoBot"):
+        scheduler.log_stats()
+    assert "filter money: {'rejection_rate': 0.25}" in caplog.text
@@ -0,0 +1,70 @@
+import os
+import cv2
+import numpy as np
+import pytest
+from conftest import SCREENSHOTS
+from utils.preprocess import compile_pipeline
+from utils.roi_registry import roi_registry
+
+
+def reference_preprocess(image, target_size=None, threshold_value=None, invert=None):
+    """
+    The former OCRUtils.preprocess_image: resize the BGR crop (Lanczos), then grayscale, then threshold.
+    """
+    if target_size:
+        image = cv2.resize(image, target_size, interpolation=cv2.INTER_LANCZOS4)
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if threshold_value is not None:
+        threshold_type = cv2.THRESH_BINARY_INV if invert else cv2.THRESH_BINARY
+        return cv2.threshold(gray, threshold_value, 255, threshold_type)[1]
+    return 255 - gray if invert else gray
+
+
+def reference(image, settings):
+    scale = settings["scale_factor"]
+    size = (image.shape[1] * scale, image.shape[0] * scale)
+    return reference_preprocess(image, size, settings["threshold_value"], settings["invert"])
+
+
+@pytest.fixture(scope="module", params=["money", "rolls", "multiplier", "building1_cost"])
+def crop(request):
+    frame = cv2.imread(os.path.join(SCREENSHOTS, "playerinfo_screenshot.png"))
+    left, top, right, bottom = roi_registry.rect(request.param, (0, 0, frame.shape[1], frame.shape[0]))
+    return frame[top:bottom, left:right].copy()
+
+
+@pytest.mark.parametrize("threshold_value", [None, 75, 100])
+@pytest.mark.parametrize("invert", [False, True])
+def test_unscaled_pipeline_is_exact(crop, threshold_value, invert):
+    settings = {"scale_factor": 1, "threshold_value": threshold_value, "invert": invert}
+    assert np.array_equal(compile_pipeline(settings)(crop), reference(crop, settings))
+
+
+@pytest.mark.parametrize("invert", [False, True])
+def test_scaled_threshold_matches_reference(crop, invert):
+    # Grayscale before the resize and linear instead of Lanczos: only edge pixels may flip
+    settings = {"scale_factor": 3, "threshold_value": 100, "invert": invert}
+    output = compile_pipeline(settings)(crop)
+    expected = reference(crop, settings)
+    assert output.shape == expected.shape
+    assert np.mean(output != expected) < 0.02
+
+
+def test_scaled_gray_matches_reference(crop):
+    settings = {"scale_factor": 3, "threshold_value": None, "invert": False}
+    output = compile_pipeline(settings)(crop)
+    difference = np.abs(output.astype(int) - reference(crop, settings).astype(int))
+    assert np.mean(difference) < 1.0
+
+
+def test_output_buffer_is_reused(crop):
+    pipeline = compile_pipeline({"scale_factor": 3, "threshold_value": 100, "invert": True})
+    first = pipeline(crop)
+    assert pipeline(crop) is first
+    # A crop of another shape gets its own buffer
+    assert pipeline(crop[:, 1:]) is not first
+
+
+def test_pipelines_are_compiled_once():
+    settings = {"scale_factor": 3, "threshold_value": 100, "invert": True}
+    assert compile_pipeline(dict(settings)) is compile_pipeline(dict(settings, contrast_reduction_percentage=0))
@@ -0,0 +1,104 @@
+import time
+from threading import Thread
+import pytest
+from shared_state import shared_state, STATE_FIELDS
+from utils import rate_governor as governor_module
+from utils.rate_governor import (
+    RateGovernor, ROLLING, BUILDING, WAITING_FOR_DICE, MINIGAME, POPUP,
+    GOVERNOR_WAIT_FACTOR, MAX_INTERVAL_S, TRANSITION_S,
+)
+from utils.state_store import StateStore
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    """
+    A governor over a fresh copy of the bot state, out of its transition window.
+    """
+    monkeypatch.setattr(shared_state, "store", StateStore(STATE_FIELDS))
+    shared_state.in_home_status = True
+    shared_state.rolls = 30
+    governor = RateGovernor()
+    settle(governor)
+    return governor
+
+
+def settle(governor):
+    governor.changed_at = time.time() - TRANSITION_S
+
+
+def test_classify(governor):
+    assert governor.classify() == ROLLING
+    shared_state.rolls = 0
+    assert governor.classify() == WAITING_FOR_DICE
+    # Still rolling the last dice
+    shared_state.rolling_status = True
+    assert governor.classify() == ROLLING
+    shared_state.in_home_status = False
+    assert governor.classify() == POPUP
+    governor.minigame = True
+    assert governor.classify() == MINIGAME
+    shared_state.builder_running = True
+    assert governor.classify() == BUILDING
+
+
+def test_transition_notifies_listeners(governor):
+    changes = []
+    governor.subscribe(lambda old, new: changes.append((old, new)))
+    shared_state.rolls = 0
+    assert governor.update() == WAITING_FOR_DICE
+    # No change, no notification
+    governor.update()
+    governor.set_minigame(True)
+    assert changes == [(ROLLING, WAITING_FOR_DICE), (WAITING_FOR_DICE, MINIGAME)]
+
+
+def test_failing_listener_does_not_block_the_others(governor):
+    changes = []
+    governor.subscribe(lambda old, new: 1 / 0)
+    governor.subscribe(lambda old, new: changes.append(new))
+    shared_state.in_home_status = False
+    governor.update()
+    assert changes == [POPUP]
+
+
+def test_intervals(governor):
+    assert governor.interval("rolls", 0.5) == 0.5
+    shared_state.rolls = 0
+    governor.update()
+    # Right after a transition every loop runs at double speed
+    assert governor.interval("rolls", 0.5) == 0.25
+    settle(governor)
+    assert governor.interval("rolls", 0.5) == 0.5 * GOVERNOR_WAIT_FACTOR
+    # Capped at MAX_INTERVAL_S, unless the base itself is longer
+    assert governor.interval("autoroll_monitor", 45) == MAX_INTERVAL_S
+    assert governor.interval("slow", 120) == 120
+
+
+def test_loop_factors(governor, monkeypatch):
+    monkeypatch.setitem(governor_module.LOOP_FACTORS, "idle", {BUILDING: 2.0})
+    shared_state.builder_running = True
+    governor.update()
+    settle(governor)
+    assert governor.interval("idle", 2) == 4
+    assert governor.interval("rolls", 2) == 2
+
+
+def test_sleep_returns_on_state_change(governor):
+    shared_state.rolls = 0
+    governor.update()
+    settle(governor)
+    woken = []
+    sleeper = Thread(target=lambda: woken.append(governor.sleep("rolls", 10)))
+    start = time.time()
+    sleeper.start()
+    time.sleep(0.05)
+    shared_state.rolls = 10
+    governor.update()
+    sleeper.join(timeout=2)
+    assert woken == [True]
+    assert time.time() - start < 1
+
+
+def test_sleep_times_out(governor):
+    assert governor.sleep("rolls", 0.05) is False
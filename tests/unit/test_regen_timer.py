@@ -0,0 +1,109 @@
+import time
+from threading import Thread
+import numpy as np
+import pytest
+from utils.frame_bus import FrameBus
+from utils.frame_source import FrameSource
+from utils.perception_scheduler import PerceptionScheduler
+from utils.regen_timer import RegenTimer, parse_countdown
+
+
+@pytest.mark.parametrize(
+    "text, seconds",
+    [
+        ("57:52", 57 * 60 + 52),
+        ("57.52", 57 * 60 + 52),
+        ("0:05", 5),
+        ("Next dice in 09:30 ", 9 * 60 + 30),
+        ("60:00", 3600),
+    ],
+)
+def test_parse_countdown(text, seconds):
+    assert parse_countdown(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["", None, "57", "57:5", "12:75", "61:00", "abc"])
+def test_parse_countdown_rejects_misreads(text):
+    assert parse_countdown(text) is None
+
+
+def test_project_and_remaining():
+    timer = RegenTimer(lead_s=20)
+    assert timer.remaining() is None
+    assert timer.project("10:00", now=1000) == 1600
+    assert timer.remaining(now=1100) == 500
+    assert timer.remaining(now=2000) == 0
+    # A misread keeps the projection
+    assert timer.project("??", now=1100) is None
+    assert timer.ready_at == 1600
+
+
+def test_no_sleep_close_to_regeneration():
+    timer = RegenTimer(lead_s=20)
+    assert not timer.sleep()
+    timer.project("0:15")
+    assert not timer.sleep()
+
+
+def test_sleep_holds_listeners_until_woken():
+    timer = RegenTimer(lead_s=20)
+    holds = []
+    timer.subscribe(holds.append)
+    timer.project("10:00")
+    sleeper = Thread(target=timer.sleep)
+    sleeper.start()
+    time.sleep(0.05)
+    timer.wake()
+    sleeper.join(timeout=2)
+    assert not sleeper.is_alive()
+    assert len(holds) == 2 and holds[0] == pytest.approx(time.time() + 580, abs=2) and holds[1] is None
+    assert timer.ready_at is None
+    stats = timer.stats()
+    assert stats["holds"] == 1 and 0 < stats["held_s"] < 1 and stats["remaining_s"] is None
+
+
+class StillSource(FrameSource):
+    def __init__(self):
+        super().__init__()
+        self.window = (0, 0, 60, 40)
+
+    def read(self):
+        return np.zeros((40, 60, 3), np.uint8)
+
+
+def test_hold_only_runs_exempt_tasks():
+    scheduler = PerceptionScheduler(FrameBus(StillSource(), max_age_ms=0))
+    runs = {"in_home": 0, "rolls": 0}
+    scheduler.add("in_home", lambda: runs.update(in_home=runs["in_home"] + 1), period_s=0.02, hold_period_s=0.1)
+    scheduler.add("rolls", lambda: runs.update(rolls=runs["rolls"] + 1), period_s=0.02)
+    scheduler.hold(time.time() + 0.5)
+    scheduler.start()
+    try:
+        time.sleep(0.45)
+        held = dict(runs)
+        scheduler.hold(None)
+        time.sleep(0.1)
+    finally:
+        scheduler.stop()
+    assert held["rolls"] == 0
+    assert 2 <= held["in_home"] <= 6
+    assert runs["rolls"] >= 1
+
+
+def test_wake_right_after_the_projection_is_read_is_not_lost(monkeypatch):
+    timer = RegenTimer(lead_s=20)
+    timer.project("10:00")
+    remaining = timer.remaining
+
+    def remaining_then_woken(now=None):
+        # Dice gained another way between the projection read and the wait
+        left = remaining(now)
+        timer.wake()
+        return left
+
+    monkeypatch.setattr(timer, "remaining", remaining_then_woken)
+    sleeper = Thread(target=timer.sleep, daemon=True)
+    sleeper.start()
+    sleeper.join(timeout=2)
+    assert not sleeper.is_alive()
+    assert timer.stats()["holds"] == 1
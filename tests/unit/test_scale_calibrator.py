@@ -0,0 +1,95 @@
+import os
+import cv2
+import mss
+from conftest import ROOT, SCREENSHOTS
+from shared_state import shared_state
+from utils.frame_source import ImageDirFrameSource, MssFrameSource
+from utils.ocr_utils import OCRUtils
+from utils.scale_calibrator import FULL_SWEEP_SCALES
+
+GO = "images/go.png"
+# Part of playerinfo_screenshot.png around the GO button (the full frame takes ~25s to sweep)
+GO_AREA = (slice(880, 1280), slice(960, 1560))
+
+
+def replay(tmp_path, area=GO_AREA):
+    image = cv2.imread(os.path.join(SCREENSHOTS, "playerinfo_screenshot.png"))
+    path = str(tmp_path / "frame.png")
+    cv2.imwrite(path, image[area])
+    return OCRUtils(ImageDirFrameSource(path))
+
+
+def test_calibrate_scale_on_replay(tmp_path, calibrator):
+    ocr = replay(tmp_path)
+    assert ocr.calibrate_scale() == 1.0
+    assert calibrator.window_size == (600, 400)
+    # Locked: single-scale matching from now on
+    assert calibrator.scales_for(GO, (600, 400)) == ([1.0], False)
+
+
+def test_calibrate_scale_without_anchor(tmp_path, calibrator):
+    ocr = replay(tmp_path, area=(slice(0, 200), slice(0, 200)))
+    assert ocr.calibrate_scale() is None
+    assert calibrator.scales_for(GO, (200, 200)) == (FULL_SWEEP_SCALES, True)
+
+
+def test_resize_resets_scale(calibrator):
+    calibrator.lock_scale(1.0, (600, 400))
+    assert calibrator.scales_for(GO, (800, 400)) == (FULL_SWEEP_SCALES, True)
+    assert calibrator.scale is None
+
+
+def test_miss_streak_triggers_verification_sweep(calibrator, monkeypatch):
+    calibrator.lock_scale(1.0, (600, 400))
+    monkeypatch.setattr(calibrator, "miss_streak_limit", 3)
+    for _ in range(3):
+        calibrator.observe(GO, (600, 400), 1.0, hit=False, swept=False)
+    assert calibrator.scales_for(GO, (600, 400)) == (FULL_SWEEP_SCALES, True)
+    # Non-anchor templates keep the learned scale
+    assert calibrator.scales_for("images/build.png", (600, 400)) == ([1.0], False)
+    # The verification sweep confirms the scale
+    calibrator.observe(GO, (600, 400), 1.0, hit=True, swept=True)
+    assert calibrator.scales_for(GO, (600, 400)) == ([1.0], False)
+
+
+class FakeScreen:
+    """
+    Stands in for mss: grabs come from a recorded screenshot.
+    """
+
+    def __init__(self, screen):
+        self.screen = cv2.cvtColor(screen, cv2.COLOR_BGR2BGRA)
+
+    def grab(self, monitor):
+        top, left = monitor["top"], monitor["left"]
+        return self.screen[top : top + monitor["height"], left : left + monitor["width"]]
+
+
+def test_live_resize_recalibrates(calibrator, monkeypatch):
+    screen = cv2.imread(os.path.join(SCREENSHOTS, "playerinfo_screenshot.png"))
+    monkeypatch.setattr(mss, "mss", lambda: FakeScreen(screen))
+    # The window geometry as the OS reports it, looked up before every capture
+    geometry = {"window": (960, 880, 600, 400)}
+    source = MssFrameSource(geometry["window"], locate=lambda: geometry["window"], poll_s=0)
+    ocr = OCRUtils(source)
+    ocr.frame_bus.max_age_ms = 0
+    assert ocr.calibrate_scale() == 1.0
+    assert calibrator.window_size == (600, 400)
+
+    # The user widens the window between two calls: the capture follows it and the scale is learned again
+    geometry["window"] = (960, 880, 800, 400)
+    go = shared_state.load_image(os.path.join(ROOT, GO))
+    x, y = ocr.find_template(go)
+    assert abs(x - 1264) <= 2 and abs(y - 1084) <= 2
+    assert ocr.window_coords == (960, 880, 1760, 1280)
+    assert calibrator.scale is None
+
+
+def test_live_window_lookup_is_throttled():
+    lookups = []
+    source = MssFrameSource((0, 0, 600, 400), locate=lambda: lookups.append(1) or (0, 0, 800, 400), poll_s=60)
+    source.refresh_window()
+    assert lookups == [] and source.window == (0, 0, 600, 400)
+    source.poll_s = 0
+    source.refresh_window()
+    assert lookups == [1] and source.window == (0, 0, 800, 400)
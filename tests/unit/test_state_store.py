@@ -0,0 +1,106 @@
+import time
+from threading import Thread
+import pytest
+from utils.state_store import StateStore
+
+
+@pytest.fixture
+def store():
+    return StateStore({"rolls": (int, None), "in_home_status": (bool, True), "bot_status": (str, "RUNNING")})
+
+
+def test_initial_values(store):
+    assert store.get("rolls") is None
+    assert store.get("in_home_status") is True
+    assert store.current_version() == 0
+    assert store.current_version("rolls") == 0
+
+
+def test_versions_count_changes_only(store):
+    assert store.set("rolls", 50)
+    written_at = store.field("rolls").updated_at
+    assert not store.set("rolls", 50)
+    assert store.current_version("rolls") == 1
+    # Writing the same value refreshes updated_at only
+    assert store.field("rolls").updated_at >= written_at
+    store.set("bot_status", "PAUSED")
+    assert store.current_version() == 2
+    assert store.current_version("rolls") == 1
+
+
+def test_type_check(store):
+    with pytest.raises(TypeError):
+        store.set("rolls", "50")
+    with pytest.raises(TypeError):
+        store.set("bot_status", 1)
+    assert store.current_version("rolls") == 0
+    # None is always accepted
+    store.set("rolls", 5)
+    store.set("rolls", None)
+    assert store.current_version("rolls") == 2
+    with pytest.raises(KeyError):
+        store.set("dice", 1)
+
+
+def test_snapshot_is_consistent(store):
+    store.set("rolls", 10)
+    snapshot = store.get_snapshot()
+    store.set("rolls", 9)
+    assert snapshot["rolls"].value == 10 and snapshot["rolls"].version == 1
+    assert store.get("rolls") == 9
+
+
+def test_wait_for_change_returns_at_once_when_behind(store):
+    store.set("rolls", 10)
+    start = time.time()
+    assert store.wait_for_change("rolls", 0, timeout=5) == 1
+    assert time.time() - start < 1
+    assert store.wait_for_change("rolls", 1, timeout=0.05) == 1
+
+
+def test_wait_for_change_wakes_on_set(store):
+    versions = []
+    waiter = Thread(target=lambda: versions.append(store.wait_for_change("rolls", 0, timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    # A change of another field does not wake a field waiter
+    store.set("bot_status", "PAUSED")
+    time.sleep(0.05)
+    assert waiter.is_alive()
+    store.set("rolls", 10)
+    waiter.join(timeout=2)
+    assert versions == [1]
+
+
+def test_subscribers(store):
+    changes = []
+    store.subscribe("rolls", lambda name, old, new: changes.append((name, old, new)))
+    store.subscribe(None, lambda name, old, new: changes.append(("any", name)))
+    store.subscribe("rolls", lambda name, old, new: 1 / 0)
+    store.set("rolls", 10)
+    store.set("rolls", 10)
+    store.set("in_home_status", False)
+    assert changes == [("rolls", None, 10), ("any", "rolls"), ("any", "in_home_status")]
+
+
+def test_field_condition(store):
+    condition = store.field_condition("rolls")
+    assert store.field_condition("rolls") is condition
+    with pytest.raises(KeyError):
+        store.field_condition("money")
+    woken = []
+
+    def wait():
+        with condition:
+            woken.append(condition.wait(timeout=5))
+            woken.append(condition.wait_for(lambda: store.get("rolls") == 10, timeout=5))
+
+    waiter = Thread(target=wait)
+    waiter.start()
+    time.sleep(0.05)
+    # Plain wait() callers are woken by every write, even one that leaves the value unchanged
+    store.set("rolls", None)
+    time.sleep(0.05)
+    store.set("rolls", 10)
+    waiter.join(timeout=2)
+    assert woken == [True, True]
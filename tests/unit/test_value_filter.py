@@ -0,0 +1,91 @@
+import pytest
+from utils.value_filter import ValueFilter, text_confidence
+
+
+def test_text_confidence():
+    assert text_confidence("35/50", "0123456789/") == 1.0
+    assert text_confidence(" 3 5/50\n", "0123456789/") == 1.0
+    assert text_confidence("35/5O", "0123456789/") == pytest.approx(0.8)
+    assert text_confidence("", "0123456789") == 0.0
+    assert text_confidence(None, "0123456789") == 0.0
+
+
+def test_plausible_change_is_published_at_once():
+    money = ValueFilter("money", initial=1000, max_ratio=3)
+    assert money.update(2500, now=1) == 2500
+    assert not money.last_rejected
+    assert money.accepted == 1
+
+
+def test_isolated_misread_is_rejected():
+    money = ValueFilter("money", initial=1000, max_ratio=3)
+    # A dropped digit is off by x10
+    assert money.update(100, now=1) == 1000
+    assert money.last_rejected
+    assert money.update(1000, now=2) == 1000
+    assert money.rejected == 1
+
+
+def test_implausible_change_needs_votes():
+    rolls = ValueFilter("rolls", initial=5, votes=2, window=3)
+    assert rolls.update(55, now=1) == 5
+    assert rolls.update(55, now=2) == 55
+    assert rolls.voted == 1
+    assert rolls.published_at == 2
+
+
+def test_votes_only_count_within_the_window():
+    rolls = ValueFilter("rolls", initial=5, votes=2, window=3)
+    rolls.update(55, now=1)
+    rolls.update(7, now=2)
+    rolls.update(8, now=3)
+    # The first 55 left the window
+    assert rolls.update(55, now=4) == 5
+
+
+def test_low_confidence_and_invalid_reads_are_dropped():
+    multiplier = ValueFilter("multiplier", initial=1, valid=lambda value: value in (1, 2, 3, 5), min_confidence=0.8)
+    assert multiplier.update(2, confidence=0.5, now=1) == 1
+    assert multiplier.update(4, now=2) == 1
+    assert multiplier.update(None, now=3) == 1
+    assert multiplier.rejected == 3
+    # Dropped reads do not vote
+    assert multiplier.update(4, now=4) == 1
+
+
+def test_max_rate_scales_with_elapsed_time():
+    rolls = ValueFilter("rolls", initial=50, max_rate=1)
+    assert rolls.update(49, now=rolls.published_at + 1) == 49
+    # 5 per second at most: 10 after one second is implausible, after 10 seconds it is fine
+    rolls = ValueFilter("rolls", initial=50, max_rate=5)
+    assert rolls.update(40, now=rolls.published_at + 1) == 50
+    rolls = ValueFilter("rolls", initial=50, max_rate=5)
+    assert rolls.update(40, now=rolls.published_at + 10) == 40
+
+
+def test_callable_max_rate():
+    multiplier = {"value": 1}
+    rolls = ValueFilter("rolls", initial=50, max_rate=lambda: multiplier["value"] / 2)
+    start = rolls.published_at
+    assert rolls.update(45, now=start + 2) == 50
+    multiplier["value"] = 5
+    assert rolls.update(45, now=start + 2) == 45
+
+
+def test_bootstrap_without_initial_value_needs_votes():
+    money = ValueFilter("money", initial=None, max_ratio=3)
+    assert money.update(7405483, now=1) is None
+    assert money.update(7405483, now=2) == 7405483
+    # From then on the ratio applies
+    assert money.update(7500000, now=3) == 7500000
+
+
+def test_rejection_rate_and_stats():
+    money = ValueFilter("money", initial=1000, max_ratio=3)
+    assert money.rejection_rate == 0.0
+    money.update(1000, now=1)
+    money.update(10, now=2)
+    money.update(None, now=3)
+    money.update(1200, now=4)
+    assert money.rejection_rate == 0.5
+    assert money.stats() == {"value": 1200, "accepted": 2, "voted": 0, "rejected": 2, "rejection_rate": 0.5}
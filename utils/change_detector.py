@@ -0,0 +1,99 @@
+"""
+change_detector.py
+
+Cheap pixel-change gating for the named screen regions (see roi_registry.py).
+
+Money, rolls and multiplier only change after a roll or a build, but were read every 0.5s. Each region
+crop is reduced to a tiny grayscale signature (SIGNATURE_SIZE, area interpolation) and compared with the
+signature of the last read by mean absolute difference. The perception scheduler only runs a task when
+one of its regions changed by more than CHANGE_THRESHOLD grey levels, or when CHANGE_REFRESH_S seconds
+passed since its last read (safety net against a missed change).
+"""
+
+from threading import Lock
+from os import getenv as env
+import time
+import cv2
+import numpy as np
+
+# Mean absolute difference (0-255) above which a region counts as changed
+CHANGE_THRESHOLD = float(env("CHANGE_THRESHOLD", 2.0))
+# A region is reported as changed at least this often
+CHANGE_REFRESH_S = float(env("CHANGE_REFRESH_S", 10))
+# (width, height) of the signature
+SIGNATURE_SIZE = (32, 8)
+
+
+def signature(image: np.ndarray) -> np.ndarray:
+    """
+    Return the grayscale SIGNATURE_SIZE thumbnail of a BGR or grayscale crop, as float32.
+    """
+    small = cv2.resize(image, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small.astype(np.float32)
+
+
+class ChangeDetector:
+    def __init__(self, threshold=CHANGE_THRESHOLD, refresh_s=CHANGE_REFRESH_S):
+        """
+        Attributes:
+            signatures (dict): key -> (signature, time it was accepted).
+            checks (dict): key -> number of checks.
+            skips (dict): key -> number of checks that found no change.
+            forced (dict): key -> number of checks reported as changed by the refresh interval.
+        """
+        self.threshold = threshold
+        self.refresh_s = refresh_s
+        self.signatures = {}
+        self.checks = {}
+        self.skips = {}
+        self.forced = {}
+        self.lock = Lock()
+
+    def changed(self, key, image: np.ndarray, now=None) -> bool:
+        """
+        Compare a region crop with the last one accepted under key. A change (or the refresh interval)
+        makes this crop the new reference.
+        """
+        if image is None or image.size == 0:
+            return True
+        now = now or time.time()
+        current = signature(image)
+        with self.lock:
+            self.checks[key] = self.checks.get(key, 0) + 1
+            previous = self.signatures.get(key)
+            if previous is not None and previous[0].shape == current.shape:
+                reference, accepted_at = previous
+                if float(np.mean(np.abs(current - reference))) <= self.threshold:
+                    if now - accepted_at < self.refresh_s:
+                        self.skips[key] = self.skips.get(key, 0) + 1
+                        return False
+                    self.forced[key] = self.forced.get(key, 0) + 1
+            self.signatures[key] = (current, now)
+            return True
+
+    def forget(self, key):
+        """
+        Drop the reference of key, so its next check reports a change (e.g. the last read was unreliable).
+        """
+        with self.lock:
+            self.signatures.pop(key, None)
+
+    def skip_ratio(self, key) -> float:
+        checks = self.checks.get(key, 0)
+        return self.skips.get(key, 0) / checks if checks else 0.0
+
+    def stats(self) -> dict:
+        return {
+            key: {
+                "checks": checks,
+                "skipped": self.skips.get(key, 0),
+                "forced": self.forced.get(key, 0),
+                "skip_ratio": round(self.skip_ratio(key), 3),
+            }
+            for key, checks in self.checks.items()
+        }
+
+
+change_detector = ChangeDetector()
@@ -0,0 +1,160 @@
+"""
+debug_sink.py
+
+Asynchronous, sampled writer for debug images (OCR crops, failure screenshots).
+
+The polling threads used to cv2.imwrite their crops (proc-money.png, multi.png, ...) synchronously on
+every read. Now they hand images to the sink:
+    - offer(name, image): remembers the image; only every DEBUG_SAMPLE_EVERY-th offer of a name is written,
+    - flag(name): writes the last offered image of a name now (e.g. a read the value filter rejected),
+      as long as it is flagged before the next read of that field reuses the image buffer,
+    - submit(name, image, anomaly=True): writes an image now (e.g. a screenshot after repeated failures).
+Images are encoded and written by a single background thread. The queue is bounded and drops new images
+when full instead of blocking the caller. Files are named "<name>_<timestamp>.png" in DEBUG_SINK_DIR,
+and the oldest ones are deleted once the directory grows past DEBUG_SINK_MAX_MB.
+"""
+
+from collections import deque
+from queue import Queue, Full
+from threading import Lock, Thread
+from os import getenv as env
+import os
+import time
+import cv2
+from shared_state import shared_state
+from .logger import logger
+
+DEBUG_SINK_DIR = env("DEBUG_SINK_DIR", os.path.join(shared_state.current_path, "debug_screenshots", "artifacts"))
+DEBUG_SAMPLE_EVERY = int(env("DEBUG_SAMPLE_EVERY", 50))
+DEBUG_SINK_MAX_MB = float(env("DEBUG_SINK_MAX_MB", 50))
+# Images waiting to be written; new ones are dropped beyond this
+DEBUG_SINK_QUEUE = 16
+# A name flagged again within this many seconds is not written again (e.g. a field hidden by a popup)
+FLAG_MIN_INTERVAL_S = 5
+
+
+class DebugSink:
+    def __init__(self, directory=DEBUG_SINK_DIR, sample_every=DEBUG_SAMPLE_EVERY, max_mb=DEBUG_SINK_MAX_MB, queue_size=DEBUG_SINK_QUEUE):
+        """
+        Attributes:
+            offers (dict): name -> number of images offered.
+            last (dict): name -> the last offered image (a reference, only images written are copied).
+            flagged_at (dict): name -> when it was last flagged.
+            files (deque): (path, size) of the files written, oldest first.
+            written (int): Images written.
+            dropped (int): Images dropped because the queue was full.
+        """
+        self.directory = directory
+        self.sample_every = max(int(sample_every), 1)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.queue = Queue(maxsize=queue_size)
+        self.offers = {}
+        self.last = {}
+        self.flagged_at = {}
+        self.files = deque()
+        self.total_bytes = 0
+        self.written = 0
+        self.dropped = 0
+        self.lock = Lock()
+        self.thread = None
+
+    def offer(self, name, image) -> bool:
+        """
+        Offer a debug image that only needs to be written once in a while.
+
+        Returns:
+            bool: True if the image was queued for writing.
+        """
+        with self.lock:
+            self.last[name] = image
+            count = self.offers[name] = self.offers.get(name, 0) + 1
+        if count % self.sample_every:
+            return False
+        return self.enqueue(name, image)
+
+    def flag(self, name) -> bool:
+        """
+        Write the last offered image of a name (an anomaly was detected on it).
+        """
+        now = time.time()
+        with self.lock:
+            image = self.last.get(name)
+            if image is None or now - self.flagged_at.get(name, 0) < FLAG_MIN_INTERVAL_S:
+                return False
+            self.flagged_at[name] = now
+        return self.enqueue(name, image)
+
+    def submit(self, name, image, anomaly=False) -> bool:
+        """
+        Write an image: always if anomaly is set, otherwise sampled like offer.
+        """
+        if anomaly:
+            return self.enqueue(name, image)
+        return self.offer(name, image)
+
+    def enqueue(self, name, image) -> bool:
+        self.start()
+        if self.queue.full():
+            self.dropped += 1
+            return False
+        try:
+            # Copy: the image is often a buffer reused by the next read (see preprocess.py)
+            self.queue.put_nowait((name, image.copy(), time.time()))
+            return True
+        except Full:
+            self.dropped += 1
+            return False
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self.load_files()
+                self.thread = Thread(target=self.writer_thread, daemon=True, name="debug_sink")
+                self.thread.start()
+
+    def load_files(self):
+        """
+        Account for the files already in the directory (from previous runs), oldest first.
+        """
+        files = []
+        for file in os.listdir(self.directory):
+            path = os.path.join(self.directory, file)
+            if os.path.isfile(path):
+                files.append((os.path.getmtime(path), path, os.path.getsize(path)))
+        for _, path, size in sorted(files):
+            self.files.append((path, size))
+            self.total_bytes += size
+
+    def writer_thread(self):
+        while True:
+            name, image, timestamp = self.queue.get()
+            stem = os.path.splitext(os.path.basename(name))[0]
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(timestamp)) + f"-{int(timestamp * 1000) % 1000:03d}"
+            path = os.path.join(self.directory, f"{stem}_{stamp}.png")
+            try:
+                if not cv2.imwrite(path, image):
+                    continue
+                size = os.path.getsize(path)
+            except Exception as e:
+                logger.warning(f"[DEBUG-SINK] Failed to write {path}: {e}")
+                continue
+            self.written += 1
+            self.files.append((path, size))
+            self.total_bytes += size
+            self.rotate()
+
+    def rotate(self):
+        """
+        Delete the oldest files until the directory is back under the size cap (the newest file is kept).
+        """
+        while self.total_bytes > self.max_bytes and len(self.files) > 1:
+            path, size = self.files.popleft()
+            self.total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+debug_sink = DebugSink()
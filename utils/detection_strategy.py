@@ -0,0 +1,123 @@
+"""
+detection_strategy.py
+
+Per-template choice and order of the detection methods tried by OCRUtils.find.
+
+find used to run feature matching ("sift") and then fall back to multi-scale template matching
+("template") for every image, whichever one actually works for it. This module records, per template,
+how often each method finds the element and how long it takes, and derives the order to try them in:
+    - Only calls where the element was found by some method count towards a method's hit rate,
+      so templates that are simply absent most of the time do not penalise any method.
+    - Methods are ordered by expected cost (mean latency / smoothed hit rate), cheapest first.
+    - A method that almost never hits after MIN_SAMPLES found-calls is skipped, except in
+      EXPLORE_RATE of the calls, so it can come back if things change (e.g. new game UI).
+The stats are stored per window in window_data, so a restart keeps what was learned.
+"""
+
+from threading import RLock
+from os import getenv as env
+import os
+import random
+from .window_data import window_data
+from .logger import logger
+
+METHODS = ("sift", "template")
+MIN_SAMPLES = int(env("DETECTION_MIN_SAMPLES", 20))
+# A method hitting less than this share of the found-calls is skipped
+SKIP_HIT_RATE = 0.05
+EXPLORE_RATE = 0.05
+# Stats are written to window_data every SAVE_EVERY recorded calls (and on exit)
+SAVE_EVERY = 50
+
+
+class DetectionStrategy:
+    def __init__(self, methods=METHODS):
+        """
+        Attributes:
+            stats (dict): template file name -> method -> {"tried", "found", "hits", "ms"}:
+                tried: calls that ran the method, found: of those, calls where some method found the element,
+                hits: calls where the method itself found it, ms: total latency of the method.
+        """
+        self.methods = methods
+        self.lock = RLock()
+        self.stats = window_data.get("detection_strategy", {})
+        self.unsaved = 0
+
+    def order(self, template_path) -> list:
+        """
+        Get the methods to try for a template, in order.
+
+        Args:
+            template_path (str | None): The template path (None if the template is not cached).
+
+        Returns:
+            list: Method names, never empty.
+        """
+        if template_path is None:
+            return list(self.methods)
+        name = os.path.basename(template_path)
+        with self.lock:
+            stats = self.stats.get(name, {})
+            active, skipped = [], []
+            for method in self.methods:
+                s = stats.get(method)
+                if s and s["found"] >= MIN_SAMPLES and s["hits"] < SKIP_HIT_RATE * s["found"]:
+                    skipped.append(method)
+                else:
+                    active.append(method)
+            if not active or random.random() < EXPLORE_RATE:
+                active += skipped
+            return sorted(active, key=lambda method: self.expected_cost(stats.get(method)))
+
+    @staticmethod
+    def expected_cost(s) -> float:
+        if not s or not s["tried"]:
+            # Untried methods keep their default position (sorted() is stable)
+            return 0.0
+        hit_rate = (s["hits"] + 1) / (s["found"] + 2)
+        return (s["ms"] / s["tried"]) / hit_rate
+
+    def record(self, template_path, attempts):
+        """
+        Record the outcome of a find call.
+
+        Args:
+            template_path (str | None): The template path.
+            attempts (list): (method, latency in ms, hit) for each method run, in order.
+        """
+        if template_path is None or not attempts:
+            return
+        name = os.path.basename(template_path)
+        found = any(hit for _, _, hit in attempts)
+        with self.lock:
+            stats = self.stats.setdefault(name, {})
+            for method, ms, hit in attempts:
+                s = stats.setdefault(method, {"tried": 0, "found": 0, "hits": 0, "ms": 0.0})
+                s["tried"] += 1
+                s["ms"] += ms
+                if found:
+                    s["found"] += 1
+                if hit:
+                    s["hits"] += 1
+            self.unsaved += 1
+            if self.unsaved >= SAVE_EVERY:
+                self.save()
+
+    def save(self):
+        with self.lock:
+            self.unsaved = 0
+            window_data.set("detection_strategy", self.stats)
+            logger.debug("[STRATEGY] Saved detection stats.")
+
+    def reset(self, template_path=None):
+        """
+        Forget the stats of one template, or of all templates.
+        """
+        with self.lock:
+            if template_path is None:
+                self.stats = {}
+            else:
+                self.stats.pop(os.path.basename(template_path), None)
+
+
+detection_strategy = DetectionStrategy()
@@ -0,0 +1,222 @@
+"""
+feature_cache.py
+
+Local features (SIFT, ORB or AKAZE) of the template images, extracted once and reused by find_sift,
+and of the screen regions of a frame, extracted once per frame and shared by every template query.
+
+Templates never change while the bot runs, so their keypoints and descriptors are computed on first
+use, kept in memory and persisted to a compressed .npz file next to image_cache.pkl. Each persisted
+entry stores the template file's mtime; entries whose file was modified since are dropped on load.
+
+Feature backends:
+    - "sift": float descriptors, FLANN KD-tree index. Most robust, slowest.
+    - "orb": binary descriptors, FLANN LSH index (Hamming). Much faster, good on flat UI icons.
+    - "akaze": binary descriptors, FLANN LSH index (Hamming). Between the two.
+
+Detectors are not thread-safe, so one per backend is kept per thread. FLANN matchers are trained once
+per screen region and guarded by a lock.
+"""
+
+from threading import Lock, local
+import hashlib
+import os
+import cv2
+import numpy as np
+from .image_cache import ImageCache
+from .logger import logger
+
+# FLANN parameters
+FLANN_INDEX_KDTREE = 1
+FLANN_INDEX_LSH = 6
+FLANN_SEARCH_PARAMS = dict(checks=50)
+
+
+class FeatureBackend:
+    def __init__(self, name, create, index_params, ratio):
+        """
+        A keypoint detector/descriptor and the FLANN index suited to its descriptors.
+
+        Attributes:
+            name (str): The backend name used in configuration.
+            create (callable): Builds a new detector.
+            index_params (dict): FLANN index parameters for its descriptors.
+            ratio (float): Lowe's ratio test threshold.
+        """
+        self.name = name
+        self.create = create
+        self.index_params = index_params
+        self.ratio = ratio
+
+
+BACKENDS = {
+    "sift": FeatureBackend(
+        "sift", cv2.SIFT_create, dict(algorithm=FLANN_INDEX_KDTREE, trees=5), 0.7
+    ),
+    # Smaller border/patch than the ORB defaults (31) so small icons still get keypoints
+    "orb": FeatureBackend(
+        "orb",
+        lambda: cv2.ORB_create(nfeatures=1500, edgeThreshold=15, patchSize=15),
+        dict(algorithm=FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1),
+        0.75,
+    ),
+    "akaze": FeatureBackend(
+        "akaze",
+        cv2.AKAZE_create,
+        dict(algorithm=FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1),
+        0.75,
+    ),
+}
+DEFAULT_BACKEND = "sift"
+
+_thread_local = local()
+
+
+def get_detector(backend=DEFAULT_BACKEND):
+    """
+    Return this thread's detector for a backend.
+    """
+    detectors = getattr(_thread_local, "detectors", None)
+    if detectors is None:
+        detectors = _thread_local.detectors = {}
+    detector = detectors.get(backend)
+    if detector is None:
+        detector = detectors[backend] = BACKENDS[backend].create()
+    return detector
+
+
+class ScreenFeatures:
+    def __init__(self, image: np.ndarray, backend=DEFAULT_BACKEND):
+        """
+        Features of one screen region of one frame, shared by every template query on that frame.
+
+        The FLANN index over the screen descriptors is built on first query and reused, so any number
+        of templates (or one stacked batch of template descriptors) is matched against a single index.
+
+        Attributes:
+            points (np.ndarray): float32 (N, 2) keypoint coordinates, relative to the region.
+            descriptors (np.ndarray | None): (N, D) descriptors (float32 for SIFT, uint8 for binary backends).
+        """
+        self.backend = BACKENDS[backend]
+        keypoints, self.descriptors = get_detector(backend).detectAndCompute(image, None)
+        self.points = np.float32([kp.pt for kp in keypoints]).reshape(-1, 2)
+        self.matcher = None
+        # A trained matcher is not safe to query from several threads at once
+        self.lock = Lock()
+
+    def __len__(self):
+        return 0 if self.descriptors is None else len(self.descriptors)
+
+    def knn_match(self, query: np.ndarray, k=2) -> list:
+        """
+        Match query (template) descriptors against the screen descriptors.
+
+        Returns:
+            list: cv2.DMatch lists, one per query row (trainIdx indexes self.points). LSH may
+                return fewer than k matches for a row.
+        """
+        with self.lock:
+            if self.matcher is None:
+                self.matcher = cv2.FlannBasedMatcher(self.backend.index_params, FLANN_SEARCH_PARAMS)
+                self.matcher.add([self.descriptors])
+                self.matcher.train()
+            return self.matcher.knnMatch(query, k=k)
+
+
+class FeatureCache:
+    def __init__(self, image_cache: ImageCache):
+        """
+        Cache of template features.
+
+        Entries are keyed by (template path, backend); templates not loaded through the ImageCache
+        are keyed by a digest of their pixels instead and never persisted.
+
+        Attributes:
+            cache (dict): key -> (source shape, mtime, points, descriptors). points is a float32 (N, 2)
+                array of keypoint coordinates, descriptors an (N, D) array or None.
+        """
+        self.image_cache = image_cache
+        self.cache: dict[tuple, tuple] = {}
+        self.lock = Lock()
+
+    def key_of(self, template: np.ndarray) -> str:
+        path = self.image_cache.get_path(template)
+        if path is not None:
+            return path
+        return "digest:" + hashlib.blake2b(template.tobytes(), digest_size=16).hexdigest()
+
+    def get(self, template: np.ndarray, backend=DEFAULT_BACKEND) -> tuple:
+        """
+        Return the features of a template for a backend, extracting them on first use.
+
+        Returns:
+            tuple: (points, descriptors) as described in the class docstring.
+        """
+        key = (self.key_of(template), backend)
+        entry = self.cache.get(key)
+        # The source shape guards against a template replaced under the same path
+        if entry is not None and entry[0] == template.shape:
+            return entry[2], entry[3]
+        keypoints, descriptors = get_detector(backend).detectAndCompute(template, None)
+        points = np.float32([kp.pt for kp in keypoints]).reshape(-1, 2)
+        mtime = None
+        if not key[0].startswith("digest:"):
+            try:
+                mtime = os.path.getmtime(key[0])
+            except OSError:
+                pass
+        with self.lock:
+            self.cache[key] = (template.shape, mtime, points, descriptors)
+        return points, descriptors
+
+    def save_cache(self, path: str):
+        try:
+            arrays = {}
+            with self.lock:
+                entries = [
+                    (key, entry)
+                    for key, entry in self.cache.items()
+                    if not key[0].startswith("digest:") and entry[1] is not None
+                ]
+            for i, ((template_path, backend), (shape, mtime, points, descriptors)) in enumerate(entries):
+                arrays[f"path_{i}"] = np.array(template_path)
+                arrays[f"backend_{i}"] = np.array(backend)
+                arrays[f"shape_{i}"] = np.array(shape)
+                arrays[f"mtime_{i}"] = np.array(mtime)
+                arrays[f"points_{i}"] = points
+                arrays[f"descriptors_{i}"] = (
+                    descriptors if descriptors is not None else np.empty((0, 1), np.uint8)
+                )
+            with open(path, "wb") as f:
+                np.savez_compressed(f, count=np.array(len(entries)), **arrays)
+            logger.debug(f"[CACHE] Saved {len(entries)} template features to {path}.")
+        except Exception as e:
+            logger.debug(f"[CACHE] Error saving template features: {e}")
+
+    def load_cache(self, path: str):
+        try:
+            loaded = {}
+            stale = 0
+            with np.load(path) as data:
+                for i in range(int(data["count"])):
+                    template_path = str(data[f"path_{i}"])
+                    key = (template_path, str(data[f"backend_{i}"]))
+                    mtime = float(data[f"mtime_{i}"])
+                    try:
+                        if os.path.getmtime(template_path) != mtime:
+                            stale += 1
+                            continue
+                    except OSError:
+                        stale += 1
+                        continue
+                    descriptors = data[f"descriptors_{i}"]
+                    loaded[key] = (
+                        tuple(int(v) for v in data[f"shape_{i}"]),
+                        mtime,
+                        data[f"points_{i}"],
+                        descriptors if len(descriptors) else None,
+                    )
+            with self.lock:
+                self.cache.update(loaded)
+            logger.debug(f"[CACHE] Loaded {len(loaded)} template features from {path} ({stale} stale).")
+        except Exception as e:
+            logger.debug(f"[CACHE] Error loading template features: {e}")
@@ -0,0 +1,231 @@
+"""
+frame_bus.py
+
+Shared screen capture for the whole bot.
+The game window is grabbed at most once per tick into a timestamped Frame, and every
+detection/OCR consumer crops its region from that shared frame instead of opening its own
+mss context. Frames come from a pluggable FrameSource (live mss capture or a recorded session,
+see frame_source.py). Consumers ask for "a frame no older than N ms": if the current frame is fresh
+enough it is reused, otherwise a single new capture is taken on behalf of everybody waiting.
+"""
+
+from contextlib import contextmanager
+from threading import Lock, local
+from os import getenv as env
+import time
+import numpy as np
+from shared_state import shared_state
+from .logger import logger
+
+# Default maximum age of a shared frame before a new capture is taken
+FRAME_MAX_AGE_MS = int(env("FRAME_MAX_AGE_MS", 100))
+
+
+class Frame:
+    def __init__(self, image, window, timestamp, seq):
+        """
+        A single capture of the game window.
+
+        Attributes:
+            image (np.ndarray): The BGR capture of the whole window. Shared between threads, never modify it in place.
+            window_x (int): The x-coordinate of the frame's top-left corner on screen.
+            window_y (int): The y-coordinate of the frame's top-left corner on screen.
+            timestamp (float): The time.time() at which the frame was captured.
+            seq (int): Monotonic capture counter, useful as a cache key.
+        """
+        self.image = image
+        self.window_x = window[0]
+        self.window_y = window[1]
+        self.timestamp = timestamp
+        self.seq = seq
+        # Data derived from this frame (e.g. screen features), shared by every consumer of the frame
+        self._derived = {}
+        self._derived_lock = Lock()
+
+    @property
+    def age_ms(self):
+        return (time.time() - self.timestamp) * 1000
+
+    def clip(self, bbox=None) -> tuple:
+        """
+        Clip a region to the frame bounds.
+
+        Args:
+            bbox (tuple, optional): Absolute screen coordinates (left, top, right, bottom). Defaults to the whole frame.
+
+        Returns:
+            tuple: The clipped absolute (left, top, right, bottom); crops start at its top-left corner.
+        """
+        height, width = self.image.shape[:2]
+        if bbox is None:
+            return (self.window_x, self.window_y, self.window_x + width, self.window_y + height)
+        left = min(max(int(bbox[0]) - self.window_x, 0), width)
+        top = min(max(int(bbox[1]) - self.window_y, 0), height)
+        right = min(max(int(bbox[2]) - self.window_x, left), width)
+        bottom = min(max(int(bbox[3]) - self.window_y, top), height)
+        return (left + self.window_x, top + self.window_y, right + self.window_x, bottom + self.window_y)
+
+    def crop(self, bbox=None) -> np.ndarray:
+        """
+        Crop a region from the frame without copying.
+
+        Args:
+            bbox (tuple, optional): Absolute screen coordinates (left, top, right, bottom). Defaults to the whole frame.
+
+        Returns:
+            np.ndarray: A view on the frame image, clipped to the frame bounds (may be empty).
+        """
+        if bbox is None:
+            return self.image
+        left, top, right, bottom = self.clip(bbox)
+        return self.image[
+            top - self.window_y : bottom - self.window_y,
+            left - self.window_x : right - self.window_x,
+        ]
+
+    def cached(self, key, compute):
+        """
+        Return data derived from this frame, computing it once for all consumers.
+
+        Args:
+            key (hashable): Identifies the derived data, e.g. ("sift", bbox).
+            compute (callable): Builds the data when it is not cached yet.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = self._derived[key] = compute()
+        return value
+
+    @property
+    def size(self) -> tuple:
+        """
+        The (width, height) of the frame.
+        """
+        return (self.image.shape[1], self.image.shape[0])
+
+
+class FrameBus:
+    def __init__(self, source=None, max_age_ms=FRAME_MAX_AGE_MS):
+        """
+        Captures the game window once per tick and hands out the shared frame.
+
+        Args:
+            source (FrameSource, optional): Where frames come from. Defaults to shared_state.frame_source.
+            max_age_ms (int, optional): Default maximum frame age accepted by get_frame().
+
+        Attributes:
+            source (FrameSource): The frame source.
+            max_age_ms (int): Default maximum frame age accepted by get_frame().
+            captures (int): Number of real screen grabs performed.
+            requests (int): Number of frames handed out (captured or reused).
+        """
+        self.source = source if source is not None else shared_state.frame_source
+        self.max_age_ms = max_age_ms
+        self.captures = 0
+        self.requests = 0
+        self._frame = None
+        self._seq = 0
+        self._lock = Lock()
+        # Per thread: the frame pinned by pin(), if any
+        self._pinned = local()
+
+    @property
+    def window(self):
+        """
+        The geometry (x, y, width, height) of the frames served by this bus.
+        """
+        return self.source.window
+
+    def get_frame(self, max_age_ms=None) -> Frame | None:
+        """
+        Get a frame no older than max_age_ms, capturing a new one only if needed.
+
+        Args:
+            max_age_ms (int, optional): Maximum accepted age in milliseconds. Defaults to self.max_age_ms.
+
+        Returns:
+            Frame | None: The shared frame, or None if the capture failed.
+        """
+        pinned = getattr(self._pinned, "frame", None)
+        if pinned is not None:
+            self.requests += 1
+            return pinned
+        if max_age_ms is None:
+            max_age_ms = self.max_age_ms
+        self.requests += 1
+        frame = self._frame
+        if frame is not None and frame.age_ms <= max_age_ms:
+            return frame
+        with self._lock:
+            # Another thread may have captured while we were waiting for the lock
+            frame = self._frame
+            if frame is not None and frame.age_ms <= max_age_ms:
+                return frame
+            try:
+                frame = self._capture()
+            except Exception as e:
+                logger.error(f"[FRAME-BUS] Capture failed: {e}")
+                return None
+            if frame is not None:
+                self._frame = frame
+            return frame
+
+    @contextmanager
+    def pin(self, frame):
+        """
+        Serve this frame to every get_frame() of the calling thread, whatever its age, until the block exits.
+        Used by the perception scheduler so all the tasks of a tick read the same frame.
+        """
+        previous = getattr(self._pinned, "frame", None)
+        self._pinned.frame = frame
+        try:
+            yield frame
+        finally:
+            self._pinned.frame = previous
+
+    def grab(self, bbox=None, max_age_ms=None) -> np.ndarray | None:
+        """
+        Shortcut for get_frame(max_age_ms).crop(bbox).
+
+        Returns:
+            np.ndarray | None: A view on the shared frame, or None if the capture failed.
+        """
+        frame = self.get_frame(max_age_ms)
+        if frame is None:
+            return None
+        return frame.crop(bbox)
+
+    def _capture(self) -> Frame | None:
+        image = self.source.read()
+        if image is None:
+            return None
+        self._seq += 1
+        self.captures += 1
+        return Frame(image, self.source.window, time.time(), self._seq)
+
+
+frame_bus = FrameBus()
+_frame_buses = {id(frame_bus.source): frame_bus}
+_frame_buses_lock = Lock()
+
+
+def get_frame_bus(source=None) -> FrameBus:
+    """
+    Get the shared FrameBus of a frame source, so every consumer of the same source shares its frames.
+
+    Args:
+        source (FrameSource, optional): The frame source. Defaults to the global frame bus.
+
+    Returns:
+        FrameBus: The bus serving frames from that source.
+    """
+    if source is None:
+        return frame_bus
+    with _frame_buses_lock:
+        bus = _frame_buses.get(id(source))
+        if bus is None:
+            bus = _frame_buses[id(source)] = FrameBus(source)
+        return bus
@@ -0,0 +1,206 @@
+"""
+frame_source.py
+
+Pluggable sources of game-window frames for the FrameBus.
+    - MssFrameSource: live capture of the BlueStacks window with mss (default).
+    - ImageDirFrameSource: replay of a directory of recorded PNG screenshots (e.g. debug_screenshots/).
+    - VideoFrameSource: replay of a recorded video file.
+
+Replay sources let every vision path (template matching, SIFT, OCR) run headless, away from the
+Windows box, against real recorded sessions.
+"""
+
+from threading import Lock, local
+from os import getenv as env
+import os
+import time
+import cv2
+import numpy as np
+from .logger import logger
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov", ".webm")
+# Seconds between two lookups of the live window geometry (the window may be moved or resized)
+WINDOW_POLL_S = float(env("WINDOW_POLL_S", 1))
+
+
+class FrameSource:
+    """
+    Base class for frame sources.
+
+    Attributes:
+        name (str): Human readable description of the source.
+        window (tuple): The frame geometry in screen coordinates (x, y, width, height).
+        live (bool): True if frames come from the real screen.
+    """
+
+    name = "frame-source"
+    live = False
+
+    def __init__(self):
+        self.window = (0, 0, 0, 0)
+
+    def read(self) -> np.ndarray | None:
+        """
+        Return the next BGR frame of the whole window, or None if no frame is available.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MssFrameSource(FrameSource):
+    live = True
+
+    def __init__(self, window, locate=None, poll_s=WINDOW_POLL_S):
+        """
+        Live capture of the game window with mss.
+
+        Args:
+            window (tuple): The window geometry (x, y, width, height).
+            locate (callable, optional): Returns the current window geometry (or None if unknown). Called at
+                most every poll_s seconds before a capture, so frames follow a moved or resized window.
+            poll_s (float): Seconds between two calls to locate.
+        """
+        super().__init__()
+        self.name = "live"
+        self.window = tuple(window)
+        self.locate = locate
+        self.poll_s = poll_s
+        self.located_at = time.time()
+        # mss handles are not meant to be shared between threads
+        self._local = local()
+
+    def refresh_window(self):
+        """
+        Update the window geometry from locate, if it is due.
+        """
+        if self.locate is None or time.time() - self.located_at < self.poll_s:
+            return
+        self.located_at = time.time()
+        try:
+            window = self.locate()
+        except Exception as e:
+            logger.debug(f"[FRAME-SOURCE] Window lookup failed: {e}")
+            return
+        if window is not None and tuple(window) != self.window:
+            logger.info(f"[FRAME-SOURCE] Window geometry changed {self.window} -> {tuple(window)}.")
+            self.window = tuple(window)
+
+    def read(self) -> np.ndarray | None:
+        from mss import mss
+
+        self.refresh_window()
+
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = mss()
+        monitor = {
+            "top": self.window[1],
+            "left": self.window[0],
+            "width": self.window[2],
+            "height": self.window[3],
+        }
+        sct_img = sct.grab(monitor)
+        return cv2.cvtColor(np.array(sct_img), cv2.COLOR_BGRA2BGR)
+
+
+class ImageDirFrameSource(FrameSource):
+    def __init__(self, path, loop=True, recursive=False):
+        """
+        Replay a recorded session stored as PNG screenshots, one frame per read() in file name order.
+
+        Args:
+            path (str): A directory of PNG files, or a single PNG file.
+            loop (bool): Restart from the first file when the last one has been served.
+            recursive (bool): Also collect PNG files from sub-directories.
+        """
+        super().__init__()
+        self.name = f"images:{path}"
+        self.loop = loop
+        if os.path.isfile(path):
+            self.files = [path]
+        else:
+            self.files = []
+            for root, dirs, files in os.walk(path):
+                self.files.extend(
+                    os.path.join(root, file) for file in files if file.lower().endswith(".png")
+                )
+                if not recursive:
+                    break
+            self.files.sort()
+        if not self.files:
+            raise ValueError(f"No PNG frames found in '{path}'")
+        self.index = 0
+        self._lock = Lock()
+        first = cv2.imread(self.files[0])
+        if first is None:
+            raise ValueError(f"Unable to read frame '{self.files[0]}'")
+        self.window = (0, 0, first.shape[1], first.shape[0])
+
+    def read(self) -> np.ndarray | None:
+        with self._lock:
+            if self.index >= len(self.files):
+                if not self.loop:
+                    return None
+                self.index = 0
+            file = self.files[self.index]
+            self.index += 1
+        image = cv2.imread(file)
+        if image is None:
+            logger.debug(f"[FRAME-SOURCE] Failed to read {file}.")
+        return image
+
+
+class VideoFrameSource(FrameSource):
+    def __init__(self, path, loop=True):
+        """
+        Replay a recorded session stored as a video file, one video frame per read().
+
+        Args:
+            path (str): The video file.
+            loop (bool): Rewind to the first frame at the end of the video.
+        """
+        super().__init__()
+        self.name = f"video:{path}"
+        self.loop = loop
+        self._lock = Lock()
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError(f"Unable to open video '{path}'")
+        width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.window = (0, 0, width, height)
+
+    def read(self) -> np.ndarray | None:
+        with self._lock:
+            ok, image = self.capture.read()
+            if not ok and self.loop:
+                self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ok, image = self.capture.read()
+        return image if ok else None
+
+    def close(self):
+        self.capture.release()
+
+
+def create_frame_source(spec, window, locate=None) -> FrameSource:
+    """
+    Build a frame source from a FRAME_SOURCE / --replay specification.
+
+    Args:
+        spec (str): "live" (or empty) for the mss capture, a directory or PNG file for image replay,
+            or a video file for video replay.
+        window (tuple): The live window geometry (x, y, width, height), used by the mss source.
+        locate (callable, optional): Returns the current live window geometry, see MssFrameSource.
+
+    Returns:
+        FrameSource: The frame source.
+    """
+    if not spec or spec == "live":
+        return MssFrameSource(window, locate)
+    if os.path.isdir(spec) or spec.lower().endswith(".png"):
+        return ImageDirFrameSource(spec)
+    if spec.lower().endswith(VIDEO_EXTENSIONS):
+        return VideoFrameSource(spec)
+    raise ValueError(f"Unknown frame source '{spec}'")
@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
 import pickle
+import hashlib
+from threading import Lock
 from .logger import logger
 import os
 
@@ -8,6 +10,8 @@ import os
 class ImageCache:
     def __init__(self):
         self.cache: dict[str, np.ndarray] = {}
+        # id(image) -> path, so derived caches can be keyed by template path
+        self.paths: dict[int, str] = {}
 
     def load_image(self, path: str) -> np.ndarray:
         image = self.cache.get(path)
@@ -17,10 +21,18 @@ class ImageCache:
                 image = self.cache[path] = cv2.imread(path)
                 if image is None:
                     logger.debug(f"[CACHE] Failed to load {path}.")
+                else:
+                    self.paths[id(image)] = path
             except Exception as e:
                 logger.debug(f"[CACHE] Error loading {path}: {e}")
         return image
 
+    def get_path(self, image: np.ndarray) -> str | None:
+        """
+        Return the path a cached image was loaded from, or None if the image is not in the cache.
+        """
+        return self.paths.get(id(image))
+
     def save_cache(self, path: str):
         try:
             with open(path, "wb") as f:
@@ -33,6 +45,11 @@ class ImageCache:
         try:
             with open(path, "rb") as f:
                 self.cache = pickle.load(f)
+                self.paths = {
+                    id(image): image_path
+                    for image_path, image in self.cache.items()
+                    if image is not None
+                }
                 logger.debug(f"[CACHE] Loaded cache from {path}.")
         except Exception as e:
             logger.debug(f"[CACHE] Error loading cache: {e}")
@@ -43,3 +60,98 @@ class ImageCache:
                 file_path = os.path.join(root, file)
                 if file_path.endswith(".png"):
                     self.load_image(file_path)
+
+
+class TemplatePyramidCache:
+    def __init__(self, image_cache: ImageCache):
+        """
+        Cache of resized templates for multi-scale template matching.
+
+        Entries are keyed by (template path, scale, colour mode) and built lazily on first use,
+        so the matching loop only runs cv2.matchTemplate. Templates that were not loaded through
+        the ImageCache are keyed by a digest of their pixels instead of their path.
+        The cache is shared by all threads and can be persisted next to image_cache.pkl. Like the
+        template features (see feature_cache.py), each persisted entry stores the template file's mtime
+        and entries whose file was modified since are dropped on load.
+        """
+        self.image_cache = image_cache
+        # (key, scale, colour mode) -> (source shape, source mtime, resized template)
+        self.cache: dict[tuple, tuple] = {}
+        self.lock = Lock()
+
+    def key_of(self, template: np.ndarray) -> str:
+        path = self.image_cache.get_path(template)
+        if path is not None:
+            return path
+        return "digest:" + hashlib.blake2b(template.tobytes(), digest_size=16).hexdigest()
+
+    def get(self, template: np.ndarray, scale: float, color_mode="bgr", interpolation=None) -> np.ndarray:
+        """
+        Return the template resized by scale in the given colour mode ("bgr" or "gray").
+        interpolation overrides the cv2.resize default (e.g. cv2.INTER_AREA for coarse levels).
+        """
+        key = (self.key_of(template), round(float(scale), 4), color_mode)
+        if interpolation is not None:
+            key += (interpolation,)
+        entry = self.cache.get(key)
+        # The source shape guards against a template replaced under the same path
+        if entry is not None and entry[0] == template.shape:
+            return entry[2]
+        image = template
+        if color_mode == "gray" and image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if key[1] != 1.0:
+            t_h, t_w = template.shape[:2]
+            size = (max(int(t_w * scale), 1), max(int(t_h * scale), 1))
+            if interpolation is None:
+                image = cv2.resize(image, size)
+            else:
+                image = cv2.resize(image, size, interpolation=interpolation)
+        mtime = None
+        if not key[0].startswith("digest:"):
+            try:
+                mtime = os.path.getmtime(key[0])
+            except OSError:
+                pass
+        with self.lock:
+            self.cache[key] = (template.shape, mtime, image)
+        return image
+
+    def save_cache(self, path: str):
+        try:
+            with self.lock:
+                persistent = {
+                    key: entry
+                    for key, entry in self.cache.items()
+                    if not key[0].startswith("digest:") and entry[1] is not None
+                }
+            with open(path, "wb") as f:
+                pickle.dump(persistent, f)
+                logger.debug(f"[CACHE] Saved {len(persistent)} template pyramid entries to {path}.")
+        except Exception as e:
+            logger.debug(f"[CACHE] Error saving template pyramid: {e}")
+
+    def load_cache(self, path: str):
+        try:
+            with open(path, "rb") as f:
+                cache = pickle.load(f)
+            loaded = {}
+            stale = 0
+            mtimes = {}
+            for key, entry in cache.items():
+                template_path = key[0]
+                if template_path not in mtimes:
+                    try:
+                        mtimes[template_path] = os.path.getmtime(template_path)
+                    except OSError:
+                        mtimes[template_path] = None
+                # Entries of older caches have no mtime and are rebuilt as well
+                if len(entry) != 3 or mtimes[template_path] is None or entry[1] != mtimes[template_path]:
+                    stale += 1
+                    continue
+                loaded[key] = entry
+            with self.lock:
+                self.cache.update(loaded)
+            logger.debug(f"[CACHE] Loaded {len(loaded)} template pyramid entries from {path} ({stale} stale).")
+        except Exception as e:
+            logger.debug(f"[CACHE] Error loading template pyramid: {e}")
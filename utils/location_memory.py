@@ -0,0 +1,115 @@
+"""
+location_memory.py
+
+Last known screen location of each template, for the find() fast path.
+
+Most of the elements the bot polls (GO button, home icon, autoroll indicator, build button) never move.
+After a successful find() the match is remembered here, and the next find() of the same template first
+runs a single normalized correlation of the template in a small window (LOCATION_MARGIN pixels) around
+that location. Only if the verification fails does the full SIFT/template search run.
+For templates queried as static (find(..., static=True)) a failed verification is trusted as "not on
+screen" and the full search only runs every LOCATION_RESEARCH_S seconds, in case the element moved.
+Locations are kept in memory only: they are cheap to relearn and depend on the window position.
+"""
+
+from threading import Lock
+from os import getenv as env
+import time
+
+# Extra pixels searched around the last known rectangle, on every side
+LOCATION_MARGIN = int(env("LOCATION_MARGIN", 8))
+# Seconds between full searches of a static template that is not at its last location
+LOCATION_RESEARCH_S = float(env("LOCATION_RESEARCH_S", 5))
+
+
+class LocationMemory:
+    def __init__(self, margin=LOCATION_MARGIN, research_interval=LOCATION_RESEARCH_S):
+        """
+        Attributes:
+            locations (dict): template path -> (x, y, width, height) absolute rectangle of the last match.
+            searched (dict): template path -> time.time() of the last full search.
+            hits (int): Verifications that found the template at its last location.
+            misses (int): Verifications that failed.
+        """
+        self.margin = margin
+        self.research_interval = research_interval
+        self.locations: dict[str, tuple] = {}
+        self.searched: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def recall(self, template_path) -> tuple | None:
+        """
+        Return the last known rectangle of a template, or None.
+        """
+        if template_path is None:
+            return None
+        return self.locations.get(template_path)
+
+    def search_region(self, template_path, bbox) -> tuple | None:
+        """
+        Return the absolute (left, top, right, bottom) region to verify a template in, or None
+        if its location is unknown or lies outside the queried bbox.
+        """
+        rect = self.recall(template_path)
+        if rect is None:
+            return None
+        x, y, w, h = rect
+        if x < bbox[0] or y < bbox[1] or x + w > bbox[2] or y + h > bbox[3]:
+            return None
+        return (
+            max(x - self.margin, bbox[0]),
+            max(y - self.margin, bbox[1]),
+            min(x + w + self.margin, bbox[2]),
+            min(y + h + self.margin, bbox[3]),
+        )
+
+    def remember(self, template_path, center, size):
+        """
+        Remember where a template was found.
+
+        Args:
+            template_path (str | None): The template path (uncached templates are not remembered).
+            center (tuple): The absolute center of the match.
+            size (tuple): The (width, height) of the template on screen.
+        """
+        if template_path is None:
+            return
+        w, h = size
+        with self.lock:
+            self.locations[template_path] = (int(center[0] - w / 2), int(center[1] - h / 2), w, h)
+
+    def needs_search(self, template_path) -> bool:
+        """
+        Return True if a static template that failed verification is due for a full search.
+        """
+        if template_path is None or template_path not in self.locations:
+            return True
+        return time.time() - self.searched.get(template_path, 0) >= self.research_interval
+
+    def mark_searched(self, template_path):
+        if template_path is not None:
+            self.searched[template_path] = time.time()
+
+    def record(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def forget(self, template_path=None):
+        with self.lock:
+            if template_path is None:
+                self.locations.clear()
+            else:
+                self.locations.pop(template_path, None)
+
+
+location_memory = LocationMemory()
@@ -0,0 +1,90 @@
+"""
+ocr_cache.py
+
+Memoization of OCR results.
+
+Most HUD reads (money, rolls, multiplier) see exactly the same pixels as the previous read. ocr_to_str
+hashes the preprocessed crop together with the OCR config, and an unchanged field is answered from
+this LRU cache instead of running the OCR engine again. Thresholded crops make this robust to tiny
+capture noise. xxhash is used when installed, blake2b otherwise.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from os import getenv as env
+import hashlib
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:  # optional, blake2b is only a little slower on these small crops
+    xxhash = None
+
+OCR_CACHE_SIZE = int(env("OCR_CACHE_SIZE", 256))
+
+
+def image_digest(image: np.ndarray) -> bytes:
+    """
+    Return a fast 64-bit digest of an image's pixels and shape.
+    """
+    data = np.ascontiguousarray(image)
+    if xxhash is not None:
+        hasher = xxhash.xxh3_64()
+    else:
+        hasher = hashlib.blake2b(digest_size=8)
+    hasher.update(str(data.shape).encode())
+    hasher.update(data.data)
+    return hasher.digest()
+
+
+class OCRCache:
+    def __init__(self, max_entries=OCR_CACHE_SIZE):
+        """
+        Attributes:
+            entries (OrderedDict): key -> text, least recently used first.
+            hits (int): Lookups answered from the cache.
+            misses (int): Lookups that had to run OCR.
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    @staticmethod
+    def key_for(image: np.ndarray, *config) -> tuple:
+        """
+        Build the cache key of a preprocessed crop and everything that affects its OCR result.
+        """
+        return (image_digest(image),) + config
+
+    def get(self, key) -> str | None:
+        with self.lock:
+            text = self.entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key, text):
+        with self.lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+ocr_cache = OCRCache()
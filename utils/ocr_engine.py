@@ -0,0 +1,370 @@
+"""
+ocr_engine.py
+
+OCR backends used by OCRUtils.
+
+    - TesseractCLIEngine: pytesseract, one tesseract process spawned per call (image written to a temp file).
+    - TesserocrPoolEngine: a pool of resident Tesseract instances (tesserocr), each loading the language
+      model once and reading numpy buffers straight from memory. No process spawn, no temp files.
+
+Both read batches of crops (OCRUtils.ocr_batch): the CLI engine tiles them into one image read by a
+single process when their page segmentation mode can be tiled (TILE_LAYOUTS), the pool reads them one
+after another on a single worker.
+
+tesserocr is optional: OCR_ENGINE=auto (default) uses the pool when tesserocr is installed and falls back
+to the CLI otherwise. Both engines accept the same pytesseract-style config strings
+(e.g. '--psm 7 -c tessedit_char_whitelist=x0123456789').
+"""
+
+from queue import Queue
+from threading import Lock
+from os import getenv as env
+import os
+import re
+import shlex
+import cv2
+import numpy as np
+from pytesseract import pytesseract, Output
+from .logger import logger
+
+try:
+    import tesserocr
+except ImportError:  # optional, see TesserocrPoolEngine
+    tesserocr = None
+
+OCR_ENGINE = env("OCR_ENGINE", "auto")
+OCR_WORKERS = int(env("OCR_WORKERS", 2))
+OCR_LANG = env("OCR_LANG", "eng")
+# Tesseract's own default page segmentation mode (fully automatic)
+DEFAULT_PSM = 3
+# Pixels between tiles when the CLI engine reads a batch as one image
+TILE_GAP = 20
+# How the CLI engine tiles a batch, by page segmentation mode (the batch is read with the same mode).
+# Block modes read a column of tiles as blocks of text; single-line modes read a row of tiles as one line,
+# each tile a word of it. Other modes (single word or character, sparse text, ...) would segment a tiled
+# image differently: their images are read one by one.
+TILE_LAYOUTS = {None: "column", 3: "column", 4: "column", 6: "column", 7: "row", 13: "row"}
+# Tesseract's default OCR engine mode (--oem 3)
+DEFAULT_OEM = 3
+WHITELIST = "tessedit_char_whitelist"
+
+
+def parse_config(config) -> tuple:
+    """
+    Parse a pytesseract config string.
+
+    Returns:
+        tuple: (psm or None, oem or None, {variable: value})
+    """
+    psm, oem, variables = None, None, {}
+    if not config:
+        return psm, oem, variables
+    args = shlex.split(config)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ("--psm", "--oem") and i + 1 < len(args):
+            if arg == "--psm":
+                psm = int(args[i + 1])
+            else:
+                oem = int(args[i + 1])
+            i += 2
+        elif arg == "-c" and i + 1 < len(args):
+            name, _, value = args[i + 1].partition("=")
+            variables[name] = value
+            i += 2
+        else:
+            i += 1
+    return psm, oem, variables
+
+
+class OCREngine:
+    """
+    Base class for OCR engines.
+
+    Attributes:
+        name (str): The engine name.
+    """
+
+    name = "ocr-engine"
+
+    def recognize(self, image: np.ndarray, config=None) -> str:
+        """
+        Recognize the text of a grayscale or BGR image.
+
+        Args:
+            image (np.ndarray): The (preprocessed) image.
+            config (str, optional): pytesseract-style configuration.
+
+        Returns:
+            str: The recognized text.
+        """
+        raise NotImplementedError
+
+    def recognize_batch(self, images: list, config=None) -> list:
+        """
+        Recognize several images with the same config.
+
+        Returns:
+            list: The recognized text of each image, in order.
+        """
+        return [self.recognize(image, config) for image in images]
+
+    def recognize_many(self, items: list) -> list:
+        """
+        Recognize images that may each have their own config.
+
+        Args:
+            items (list): [(image, config)]
+
+        Returns:
+            list: The recognized text of each image, in order.
+        """
+        batches = {}
+        for i, (image, config) in enumerate(items):
+            batches.setdefault(config, []).append((i, image))
+        texts = [""] * len(items)
+        for config, batch in batches.items():
+            for (i, _), text in zip(batch, self.recognize_batch([image for _, image in batch], config)):
+                texts[i] = text
+        return texts
+
+    def close(self):
+        pass
+
+
+class TesseractCLIEngine(OCREngine):
+    name = "tesseract"
+
+    def recognize(self, image: np.ndarray, config=None) -> str:
+        if config:
+            return pytesseract.image_to_string(image, config=config)
+        return pytesseract.image_to_string(image)
+
+    def recognize_batch(self, images: list, config=None) -> list:
+        """
+        Tile the images into one image and read it with a single tesseract process.
+
+        Block modes (--psm 3, 4, 6 or none) stack the tiles vertically, single-line modes (--psm 7, 13)
+        lay them out in one row; each tile sits on a band of its own background colour and the config is
+        used unchanged. Words are assigned back to the tile nearest to their center along the layout
+        axis. Other modes read the images one by one.
+        """
+        psm, _, _ = parse_config(config)
+        layout = TILE_LAYOUTS.get(psm)
+        if len(images) < 2 or layout is None:
+            return [self.recognize(image, config) for image in images]
+        canvas, spans = tile_images(images, layout)
+        data = pytesseract.image_to_data(canvas, config=config or "", output_type=Output.DICT)
+        words = [[] for _ in images]
+        for i, word in enumerate(data["text"]):
+            word = word.strip()
+            if not word:
+                continue
+            if layout == "column":
+                center = data["top"][i] + data["height"][i] / 2
+            else:
+                center = data["left"][i] + data["width"][i] / 2
+            # The tile whose center is nearest (words never straddle the gaps in practice)
+            tile = min(range(len(spans)), key=lambda t: abs(center - (spans[t][0] + spans[t][1]) / 2))
+            order = (data["block_num"][i], data["par_num"][i], data["line_num"][i], data["left"][i])
+            words[tile].append((order, word))
+        return [" ".join(word for _, word in sorted(tile_words)) for tile_words in words]
+
+    def recognize_many(self, items: list) -> list:
+        """
+        Read images with different configs in as few tesseract processes as possible.
+
+        Configs that only differ by their character whitelist share one tiled read (with the union of
+        the whitelists, or none if one of them has none); each text is then filtered by its own whitelist.
+        """
+        groups = {}
+        for i, (image, config) in enumerate(items):
+            psm, oem, variables = parse_config(config)
+            whitelist = variables.pop(WHITELIST, None)
+            key = (psm, oem if oem is not None else DEFAULT_OEM, tuple(sorted(variables.items())))
+            groups.setdefault(key, []).append((i, image, config, whitelist))
+        texts = [""] * len(items)
+        for (psm, oem, variables), group in groups.items():
+            whitelists = {whitelist for _, _, _, whitelist in group}
+            batch_config = group[0][2]
+            if len(whitelists) > 1:
+                variables = dict(variables)
+                if None not in whitelists:
+                    variables[WHITELIST] = "".join(sorted(set("".join(whitelists))))
+                batch_config = format_config(psm, oem, variables)
+            batch = self.recognize_batch([image for _, image, _, _ in group], batch_config)
+            for (i, _, _, whitelist), text in zip(group, batch):
+                if whitelist is not None and len(whitelists) > 1:
+                    text = "".join(char for char in text if char in whitelist or char.isspace())
+                texts[i] = text
+        return texts
+
+
+def format_config(psm, oem, variables: dict) -> str:
+    """
+    Build a pytesseract config string (the inverse of parse_config).
+    """
+    args = []
+    if psm is not None:
+        args += ["--psm", str(psm)]
+    if oem is not None:
+        args += ["--oem", str(oem)]
+    for name, value in variables.items():
+        args += ["-c", shlex.quote(f"{name}={value}")]
+    return " ".join(args)
+
+
+def tile_images(images: list, layout="column") -> tuple:
+    """
+    Lay images out in a column or a row with TILE_GAP pixels around each one.
+
+    Returns:
+        tuple: (grayscale canvas, [(start, end) of each tile along the layout axis])
+    """
+    grays = [image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) for image in images]
+    if layout == "row":
+        # Transpose, stack as a column and transpose back
+        canvas, spans = tile_images([gray.T for gray in grays])
+        return np.ascontiguousarray(canvas.T), spans
+    width = max(gray.shape[1] for gray in grays) + 2 * TILE_GAP
+    height = sum(gray.shape[0] for gray in grays) + TILE_GAP * (len(grays) + 1)
+    canvas = np.full((height, width), 255, np.uint8)
+    spans = []
+    top = TILE_GAP
+    for gray in grays:
+        h, w = gray.shape
+        border = np.concatenate([gray[0], gray[-1], gray[:, 0], gray[:, -1]])
+        band_top = top - TILE_GAP // 2
+        canvas[band_top : top + h + TILE_GAP // 2, :] = int(np.median(border))
+        left = (width - w) // 2
+        canvas[top : top + h, left : left + w] = gray
+        spans.append((top, top + h))
+        top += h + TILE_GAP
+    return canvas, spans
+
+
+class TesserocrPoolEngine(OCREngine):
+    name = "tesserocr"
+
+    def __init__(self, workers=OCR_WORKERS, lang=OCR_LANG, tessdata=None):
+        """
+        A pool of resident Tesseract instances.
+
+        Instances are created lazily, up to workers; a call made while all of them are busy waits for
+        the first one to be released. tesserocr releases the GIL while recognizing, so the workers run
+        in parallel across the bot's threads.
+
+        Args:
+            workers (int): Maximum number of Tesseract instances.
+            lang (str): Tesseract language.
+            tessdata (str, optional): The tessdata directory. Defaults to TESSDATA_PREFIX, else the
+                tessdata folder next to pytesseract.tesseract_cmd, else the tesserocr default.
+        """
+        if tesserocr is None:
+            raise ImportError("tesserocr is not installed")
+        self.workers = max(int(workers), 1)
+        self.lang = lang
+        self.tessdata = tessdata or self.find_tessdata()
+        # oem -> queue of idle instances; the OCR engine mode can only be chosen at init
+        self.pools: dict[int, Queue] = {}
+        self.created: dict[int, int] = {}
+        self.lock = Lock()
+
+    @staticmethod
+    def find_tessdata():
+        if env("TESSDATA_PREFIX"):
+            return env("TESSDATA_PREFIX")
+        tessdata = os.path.join(os.path.dirname(pytesseract.tesseract_cmd), "tessdata")
+        return tessdata if os.path.isdir(tessdata) else None
+
+    def acquire(self, oem):
+        with self.lock:
+            pool = self.pools.setdefault(oem, Queue())
+            if pool.empty() and self.created.get(oem, 0) < self.workers:
+                self.created[oem] = self.created.get(oem, 0) + 1
+                kwargs = {"lang": self.lang, "oem": oem}
+                if self.tessdata:
+                    kwargs["path"] = self.tessdata
+                logger.debug(f"[OCR-ENGINE] Starting Tesseract instance {self.created[oem]} (oem {oem}).")
+                return tesserocr.PyTessBaseAPI(**kwargs)
+        return pool.get()
+
+    def release(self, oem, api):
+        self.pools[oem].put(api)
+
+    def recognize(self, image: np.ndarray, config=None) -> str:
+        return self.recognize_batch([image], config)[0]
+
+    def recognize_batch(self, images: list, config=None) -> list:
+        """
+        Read every image on one worker, configured once for the whole batch.
+        """
+        psm, oem, variables = parse_config(config)
+        if oem is None:
+            oem = tesserocr.OEM.DEFAULT
+        api = self.acquire(oem)
+        try:
+            # Variables persist on the instance: set them for this call and restore them afterwards
+            previous = {name: api.GetVariableAsString(name) for name in variables}
+            for name, value in variables.items():
+                api.SetVariable(name, value)
+            api.SetPageSegMode(psm if psm is not None else DEFAULT_PSM)
+            try:
+                texts = []
+                for image in images:
+                    self.set_image(api, image)
+                    texts.append(api.GetUTF8Text())
+                return texts
+            finally:
+                for name, value in previous.items():
+                    api.SetVariable(name, value if value is not None else "")
+                api.Clear()
+        finally:
+            self.release(oem, api)
+
+    @staticmethod
+    def set_image(api, image: np.ndarray):
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, image.strides[0])
+
+    def close(self):
+        with self.lock:
+            for pool in self.pools.values():
+                while not pool.empty():
+                    pool.get().End()
+
+
+_engine = None
+_engine_lock = Lock()
+
+
+def create_ocr_engine(name=OCR_ENGINE) -> OCREngine:
+    """
+    Build an OCR engine: "tesseract" (CLI), "tesserocr" (resident pool) or "auto".
+    """
+    if name in ("auto", "tesserocr"):
+        try:
+            return TesserocrPoolEngine()
+        except ImportError:
+            if name == "tesserocr":
+                logger.warning("[OCR-ENGINE] tesserocr is not installed, falling back to the tesseract CLI.")
+    elif name != "tesseract":
+        raise ValueError(f"Unknown OCR engine '{name}'")
+    return TesseractCLIEngine()
+
+
+def get_ocr_engine() -> OCREngine:
+    """
+    Get the OCR engine shared by the whole bot.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = create_ocr_engine()
+            logger.debug(f"[OCR-ENGINE] Using {_engine.name}.")
+        return _engine
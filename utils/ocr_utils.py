@@ -1,25 +1,59 @@
-from mss import mss
-from mss.tools import to_png
 import pyscreeze
 import cv2
 import numpy as np
 from pytesseract import pytesseract
 from shared_state import shared_state
-import pyautogui
+from .frame_bus import get_frame_bus
+from .ocr_engine import get_ocr_engine
+from .glyph_ocr import glyph_ocr, text_is_bright
+from .ocr_cache import ocr_cache
+from .feature_cache import ScreenFeatures, BACKENDS, DEFAULT_BACKEND
+from .detection_strategy import detection_strategy
+from .location_memory import location_memory
+from .roi_registry import roi_registry
+from .preprocess import compile_pipeline
+from .debug_sink import debug_sink
+from .scale_calibrator import scale_calibrator, ANCHOR_TEMPLATES, CONFIRMATIONS, FULL_SWEEP_SCALES
+import os
+from os import getenv as env
 import time
 
 pytesseract.tesseract_cmd = r"C:\\Program Files\\Tesseract-OCR\\tesseract.exe"
 
+# Template matching modes (see OCRUtils.find_template)
+MATCH_MODES = ("exhaustive", "pyramid")
+# Per-template default mode, by file name. e.g. PYRAMID_TEMPLATES=go.png,in-home-icon.png
+TEMPLATE_MATCH_MODES = {
+    name.strip(): "pyramid" for name in env("PYRAMID_TEMPLATES", "").split(",") if name.strip()
+}
+# Per-template feature backend for find_sift, by file name. e.g. FEATURE_BACKENDS=go.png:orb,build.png:akaze
+TEMPLATE_FEATURE_BACKENDS = {
+    name.strip(): backend.strip()
+    for name, _, backend in (item.partition(":") for item in env("FEATURE_BACKENDS", "").split(","))
+    if name.strip() and backend.strip() in BACKENDS
+}
+# Coarse-to-fine parameters: downsample factor, candidates refined, minimum coarse score/template size
+COARSE_FACTOR = 4
+COARSE_TOP_K = 3
+COARSE_MIN_SCORE = 0.3
+MIN_COARSE_TEMPLATE_SIZE = 6
+
 
 class OCRUtils:
-    def __init__(self):
+    def __init__(self, frame_source=None):
         """
         Initialize the OCRUtils class.
 
         This class provides utility functions for performing optical character recognition (OCR) on screen captures.
         It uses various libraries such as PIL, OpenCV, NumPy, and pytesseract.
 
+        Args:
+            frame_source (FrameSource, optional): Where frames come from (live capture or a recorded session).
+                Defaults to shared_state.frame_source.
+
         Attributes:
+            frame_bus: The FrameBus all captures are cropped from.
+            ocr_engine: The OCR backend shared by the whole bot (see ocr_engine.py).
             window: A tuple representing the window coordinates (x, y, width, height).
             window_x: The x-coordinate of the window's top-left corner.
             window_y: The y-coordinate of the window's top-left corner.
@@ -28,34 +62,63 @@ class OCRUtils:
             window_coords: A tuple representing the window coordinates (left, top, right, bottom).
             window_size: The size of the window.
         """
-        self.window = shared_state.window
-        (
-            self.window_x,
-            self.window_y,
-            self.window_width,
-            self.window_height,
-        ) = self.window
-        self.window_coords = shared_state.window_coords
-        self.window_size = self.window
+        self.frame_bus = get_frame_bus(frame_source)
+        self.ocr_engine = get_ocr_engine()
+
+    # The window geometry follows the frame source (a live window may be moved or resized)
+    @property
+    def window(self):
+        return self.frame_bus.window
+
+    @property
+    def window_x(self):
+        return self.window[0]
+
+    @property
+    def window_y(self):
+        return self.window[1]
+
+    @property
+    def window_width(self):
+        return self.window[2]
+
+    @property
+    def window_height(self):
+        return self.window[3]
+
+    @property
+    def window_coords(self):
+        x, y, width, height = self.window
+        return (x, y, x + width, y + height)
+
+    @property
+    def window_size(self):
+        return self.window
 
-    def find_template(self, template: np.ndarray, bbox=None, threshold=0.50, label_name=None) -> pyscreeze.Point | None:
+    def find_template(self, template: np.ndarray, bbox=None, threshold=0.50, label_name=None, force_sweep=False, mode=None) -> pyscreeze.Point | None:
         """
         Robust Template Matching with Multi-Scale support.
         This allows finding UI elements even if the resolution differs slightly.
+        Once the window scale has been learned (see scale_calibrator.py) only that scale is matched,
+        unless force_sweep is True.
+
+        mode selects how each scale is matched:
+            - "exhaustive": TM_CCOEFF_NORMED over the whole full-resolution region.
+            - "pyramid": coarse-to-fine, see _match_coarse_to_fine().
+        Defaults to the mode set for the template with set_match_mode(), else "exhaustive".
         """
         try:
             if bbox is None:
                 bbox = self.window_coords
             
-            with mss() as sct:
-                monitor = {
-                    "top": bbox[1],
-                    "left": bbox[0],
-                    "width": bbox[2] - bbox[0],
-                    "height": bbox[3] - bbox[1]
-                }
-                sct_img = sct.grab(monitor)
-                screenshot_cv = cv2.cvtColor(np.array(sct_img), cv2.COLOR_BGRA2BGR)
+            frame = self.frame_bus.get_frame()
+            if frame is None:
+                return None
+            # Offsets below are relative to the clipped region actually cropped
+            bbox = frame.clip(bbox)
+            screenshot_cv = frame.crop(bbox)
+            if screenshot_cv.size == 0:
+                return None
 
             # --- Multi-Scale Logic ---
             best_match_val = -1
@@ -65,13 +128,15 @@ class OCRUtils:
             # Helper to get width/height
             t_h, t_w = template.shape[:2]
 
-            # Define scales to search: 80% to 120% in 10 steps (Focus on minor variations first for speed)
-            # If "different resolutions" implies big changes, we can widen to 0.5 - 1.5
-            scales = np.linspace(0.8, 1.2, 11) 
-
-            # Also check exact scale 1.0 explicitly just in case linspace misses it slightly
-            if 1.0 not in scales:
-                scales = np.append(scales, 1.0)
+            # Scales to search: the learned window scale, or 80% to 120% in 11 steps (+ exact 1.0) while uncalibrated
+            template_path = shared_state.get_image_path(template)
+            if mode is None:
+                mode = self.get_match_mode(template_path)
+            coarse_screenshot = None
+            if force_sweep:
+                scales, swept = FULL_SWEEP_SCALES, True
+            else:
+                scales, swept = scale_calibrator.scales_for(template_path, frame.size)
             
             for scale in scales:
                 # Resize template
@@ -82,16 +147,35 @@ class OCRUtils:
                 if width > screenshot_cv.shape[1] or height > screenshot_cv.shape[0]:
                     continue
                     
-                resized_template = cv2.resize(template, (width, height))
+                # Resized templates come from the shared pyramid cache
+                resized_template = shared_state.get_scaled_template(template, scale)
                 
-                res = cv2.matchTemplate(screenshot_cv, resized_template, cv2.TM_CCOEFF_NORMED)
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+                if mode == "pyramid" and min(width, height) >= COARSE_FACTOR * MIN_COARSE_TEMPLATE_SIZE:
+                    if coarse_screenshot is None:
+                        coarse_screenshot = cv2.resize(
+                            screenshot_cv,
+                            (screenshot_cv.shape[1] // COARSE_FACTOR, screenshot_cv.shape[0] // COARSE_FACTOR),
+                            interpolation=cv2.INTER_AREA,
+                        )
+                    coarse_template = shared_state.get_scaled_template(
+                        template, scale / COARSE_FACTOR, interpolation=cv2.INTER_AREA
+                    )
+                    max_val, max_loc = self._match_coarse_to_fine(
+                        screenshot_cv, coarse_screenshot, resized_template, coarse_template
+                    )
+                else:
+                    res = cv2.matchTemplate(screenshot_cv, resized_template, cv2.TM_CCOEFF_NORMED)
+                    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
                 
                 if max_val > best_match_val:
                     best_match_val = max_val
                     best_match_loc = max_loc
                     best_scale = scale
             
+            scale_calibrator.observe(
+                template_path, frame.size, best_scale, best_match_val >= threshold, swept
+            )
+
             # Check if our best match exceeds threshold
             if best_match_val >= threshold:
                 x, y = best_match_loc
@@ -126,101 +210,371 @@ class OCRUtils:
             return None
 
 
-    def find_sift(self, template: np.ndarray, bbox=None, min_match_count=10, label_name=None) -> pyscreeze.Point | None:
+    def _match_coarse_to_fine(self, screenshot, coarse_screenshot, template, coarse_template, top_k=COARSE_TOP_K):
+        """
+        Coarse-to-fine template matching.
+
+        Matches the 1/COARSE_FACTOR downsampled template on the downsampled screenshot, takes the
+        top_k peaks (suppressing each peak's neighbourhood), then refines each candidate with a
+        full-resolution match in a small window around it.
+
+        Returns:
+            tuple: (best score, best top-left location in screenshot coordinates), (-1, None) if no candidate.
+        """
+        c_h, c_w = coarse_template.shape[:2]
+        if c_w > coarse_screenshot.shape[1] or c_h > coarse_screenshot.shape[0]:
+            return -1, None
+        res = cv2.matchTemplate(coarse_screenshot, coarse_template, cv2.TM_CCOEFF_NORMED)
+
+        t_h, t_w = template.shape[:2]
+        margin = COARSE_FACTOR * 2
+        best_val, best_loc = -1, None
+        for _ in range(top_k):
+            _, peak_val, _, (px, py) = cv2.minMaxLoc(res)
+            if peak_val < COARSE_MIN_SCORE:
+                break
+            # Suppress this peak so the next iteration finds a different candidate
+            res[max(py - c_h // 2, 0) : py + c_h // 2 + 1, max(px - c_w // 2, 0) : px + c_w // 2 + 1] = -1
+
+            left = max(px * COARSE_FACTOR - margin, 0)
+            top = max(py * COARSE_FACTOR - margin, 0)
+            window = screenshot[top : top + t_h + 2 * margin, left : left + t_w + 2 * margin]
+            if window.shape[0] < t_h or window.shape[1] < t_w:
+                continue
+            fine = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+            _, val, _, (fx, fy) = cv2.minMaxLoc(fine)
+            if val > best_val:
+                best_val, best_loc = val, (left + fx, top + fy)
+        return best_val, best_loc
+
+    def get_match_mode(self, template_path) -> str:
+        """
+        Return the match mode configured for a template path ("exhaustive" if none).
+        """
+        if template_path is None:
+            return "exhaustive"
+        return TEMPLATE_MATCH_MODES.get(os.path.basename(template_path), "exhaustive")
+
+    def set_match_mode(self, template, mode):
+        """
+        Set the default match mode of a template.
+
+        Args:
+            template (np.ndarray | str): The cached template image, its path or its file name.
+            mode (str): "exhaustive" or "pyramid".
+        """
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode '{mode}'")
+        name = template if isinstance(template, str) else shared_state.get_image_path(template)
+        if name is None:
+            raise ValueError("Template is not in the image cache, pass its path instead")
+        TEMPLATE_MATCH_MODES[os.path.basename(name)] = mode
+
+    def calibrate_scale(self) -> float | None:
+        """
+        Learn the window scale now by sweeping the anchor templates (GO button, home icon) on fresh frames.
+
+        Returns:
+            float | None: The learned scale, or None if no anchor was visible.
+        """
+        for name in ANCHOR_TEMPLATES:
+            anchor = shared_state.load_image(os.path.join(shared_state.current_path, "images", name))
+            if anchor is None:
+                continue
+            for _ in range(CONFIRMATIONS):
+                if self.frame_bus.get_frame(max_age_ms=0) is None:
+                    break
+                if self.find_template(anchor, force_sweep=True) is None:
+                    break
+            if scale_calibrator.scale is not None:
+                break
+        return scale_calibrator.scale
+
+    def get_screen_features(self, frame, bbox, backend=DEFAULT_BACKEND) -> ScreenFeatures:
+        """
+        Return the features of a (clipped) region of a frame, extracted once per frame, region and backend.
+        """
+        return frame.cached(("features", backend, bbox), lambda: ScreenFeatures(frame.crop(bbox), backend))
+
+    def get_feature_backend(self, template_path) -> str:
+        """
+        Return the feature backend configured for a template path (DEFAULT_BACKEND if none).
+        """
+        if template_path is None:
+            return DEFAULT_BACKEND
+        return TEMPLATE_FEATURE_BACKENDS.get(os.path.basename(template_path), DEFAULT_BACKEND)
+
+    def set_feature_backend(self, template, backend):
+        """
+        Set the feature backend of a template.
+
+        Args:
+            template (np.ndarray | str): The cached template image, its path or its file name.
+            backend (str): "sift", "orb" or "akaze".
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown feature backend '{backend}'")
+        name = template if isinstance(template, str) else shared_state.get_image_path(template)
+        if name is None:
+            raise ValueError("Template is not in the image cache, pass its path instead")
+        TEMPLATE_FEATURE_BACKENDS[os.path.basename(name)] = backend
+
+    def find_sift(self, template: np.ndarray, bbox=None, min_match_count=10, label_name=None, backend=None) -> pyscreeze.Point | None:
         """
         Find a template image using SIFT Feature Matching.
         Robust to scale, rotation, and brightness changes.
+
+        backend selects the local features ("sift", "orb" or "akaze", see feature_cache.py).
+        Defaults to the backend set for the template with set_feature_backend(), else SIFT.
         """
         try:
             if bbox is None:
                 bbox = self.window_coords
             
-            with mss() as sct:
-                monitor = {
-                    "top": bbox[1],
-                    "left": bbox[0],
-                    "width": bbox[2] - bbox[0],
-                    "height": bbox[3] - bbox[1]
-                }
-                sct_img = sct.grab(monitor)
-                screenshot_cv = cv2.cvtColor(np.array(sct_img), cv2.COLOR_BGRA2BGR)
-
-            # Initialize SIFT detector
-            sift = cv2.SIFT_create()
-
-            # Find the keypoints and descriptors with SIFT
-            kp1, des1 = sift.detectAndCompute(template, None)
-            kp2, des2 = sift.detectAndCompute(screenshot_cv, None)
+            frame = self.frame_bus.get_frame()
+            if frame is None:
+                return None
+            # Offsets below are relative to the clipped region actually cropped
+            bbox = frame.clip(bbox)
+            if bbox[0] == bbox[2] or bbox[1] == bbox[3]:
+                return None
 
-            # FLANN parameters
-            FLANN_INDEX_KDTREE = 1
-            index_params = dict(algorithm=FLANN_INDEX_KDTREE, trees=5)
-            search_params = dict(checks=50)
+            if backend is None:
+                backend = self.get_feature_backend(shared_state.get_image_path(template))
+            # Template features are extracted once (see feature_cache.py), screen features once per frame
+            src_points, des1 = shared_state.get_template_features(template, backend)
+            screen = self.get_screen_features(frame, bbox, backend)
 
-            flann = cv2.FlannBasedMatcher(index_params, search_params)
-            
             # Need check if descriptors are None (e.g. blank images)
-            if des1 is None or des2 is None or len(des1) < 2 or len(des2) < 2:
+            if des1 is None or len(des1) < 2 or len(screen) < 2:
                 return None
 
-            matches = flann.knnMatch(des1, des2, k=2)
+            matches = screen.knn_match(des1)
+            return self._locate_sift(template, src_points, matches, screen, bbox, min_match_count, label_name)
 
-            # Store all the good matches as per Lowe's ratio test.
-            good = []
-            for m, n in matches:
-                if m.distance < 0.7 * n.distance:
-                    good.append(m)
+        except Exception as e:
+            print(f"[OCR-SIFT] Error: {e}")
+            return None
 
-            if len(good) > min_match_count:
-                src_pts = np.float32([kp1[m.queryIdx].pt for m in good]).reshape(-1, 1, 2)
-                dst_pts = np.float32([kp2[m.trainIdx].pt for m in good]).reshape(-1, 1, 2)
+    def _locate_sift(self, template, src_points, matches, screen, bbox, min_match_count, label_name, query_offset=0):
+        """
+        Locate a template from its knn matches against the screen features.
 
-                M, mask = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
-                
-                if M is not None:
-                    h, w, d = template.shape
-                    pts = np.float32([[0, 0], [0, h - 1], [w - 1, h - 1], [w - 1, 0]]).reshape(-1, 1, 2)
-                    dst = cv2.perspectiveTransform(pts, M)
-
-                    # Calculate center of the projected quad
-                    # Simple average of corners
-                    center_x = np.mean(dst[:, 0, 0])
-                    center_y = np.mean(dst[:, 0, 1])
-                    
-                    match_center_absolute = (
-                        int(center_x) + bbox[0],
-                        int(center_y) + bbox[1]
-                    )
-                    # logger.debug(f"[OCR-SIFT] Found match with {len(good)} good matches.")
-                    # Debug Overlay (SIFT uses center point usually)
-                    display_label = f"SIFT ({len(good)})"
-                    if label_name:
-                         display_label = f"{label_name} (SIFT {len(good)})"
-
-                    shared_state.debug_overlays.append(
-                        (match_center_absolute, display_label, time.time())
-                    )
-                    return match_center_absolute
+        Args:
+            query_offset (int): Row of the template's first descriptor in the matched query
+                (non-zero when several templates were matched as one stacked batch).
+
+        Returns:
+            pyscreeze.Point | None: The absolute center of the match.
+        """
+        # Store all the good matches as per Lowe's ratio test.
+        good = []
+        for pair in matches:
+            if len(pair) == 2 and pair[0].distance < screen.backend.ratio * pair[1].distance:
+                good.append(pair[0])
+
+        if len(good) > min_match_count:
+            src_pts = src_points[[m.queryIdx - query_offset for m in good]].reshape(-1, 1, 2)
+            dst_pts = screen.points[[m.trainIdx for m in good]].reshape(-1, 1, 2)
+
+            M, mask = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
             
-            # logger.debug(f"[OCR-SIFT] Not enough matches are found - {len(good)}/{min_match_count}")
+            if M is not None:
+                h, w, d = template.shape
+                pts = np.float32([[0, 0], [0, h - 1], [w - 1, h - 1], [w - 1, 0]]).reshape(-1, 1, 2)
+                dst = cv2.perspectiveTransform(pts, M)
+
+                # Calculate center of the projected quad
+                # Simple average of corners
+                center_x = np.mean(dst[:, 0, 0])
+                center_y = np.mean(dst[:, 0, 1])
+                
+                match_center_absolute = (
+                    int(center_x) + bbox[0],
+                    int(center_y) + bbox[1]
+                )
+                # logger.debug(f"[OCR-SIFT] Found match with {len(good)} good matches.")
+                # Debug Overlay (SIFT uses center point usually)
+                display_label = f"SIFT ({len(good)})"
+                if label_name:
+                     display_label = f"{label_name} (SIFT {len(good)})"
+
+                shared_state.debug_overlays.append(
+                    (match_center_absolute, display_label, time.time())
+                )
+                return match_center_absolute
+        
+        # logger.debug(f"[OCR-SIFT] Not enough matches are found - {len(good)}/{min_match_count}")
+        return None
+
+    def find(self, template: np.ndarray, bbox=None, threshold=0.65, min_match_count=8, label_name=None, mode=None, backend=None, static=False) -> pyscreeze.Point | None:
+        # static: the element never moves, so a failed check at its last location means it is not on
+        # screen (a full search still runs every LOCATION_RESEARCH_S seconds), see location_memory.py
+        # Methods: SIFT (Feature Matching) and Template Matching.
+        # The order (and which ones run at all) is learned per template, see detection_strategy.py
+        template_path = shared_state.get_image_path(template)
+        if bbox is None:
+            bbox = self.window_coords
+
+        # Fast path: static elements are usually exactly where they were last found
+        match = self.verify_location(template, template_path, bbox, threshold, label_name)
+        if match:
+            return self._filter_unsafe(match)
+        if static and not location_memory.needs_search(template_path):
             return None
+        location_memory.mark_searched(template_path)
+
+        attempts = []
+        for method in detection_strategy.order(template_path):
+            start = time.perf_counter()
+            if method == "sift":
+                match = self.find_sift(template, bbox, min_match_count=min_match_count, label_name=label_name, backend=backend)
+            else:
+                match = self.find_template(template, bbox, threshold, label_name=label_name, mode=mode)
+            attempts.append((method, (time.perf_counter() - start) * 1000, bool(match)))
+            if match:
+                break
+        detection_strategy.record(template_path, attempts)
 
+        if match:
+            t_h, t_w = template.shape[:2]
+            scale = scale_calibrator.scale or 1.0
+            location_memory.remember(template_path, match, (int(t_w * scale), int(t_h * scale)))
+        return self._filter_unsafe(match)
+
+    def verify_location(self, template, template_path, bbox, threshold, label_name=None) -> pyscreeze.Point | None:
+        """
+        Check whether a template is still at its last known location (see location_memory.py).
+
+        Runs a single TM_CCOEFF_NORMED match of the template (at the calibrated scale) in a small window
+        around the remembered rectangle.
+
+        Returns:
+            pyscreeze.Point | None: The absolute center of the match, or None if the location is unknown
+                or the template is no longer there.
+        """
+        region = location_memory.search_region(template_path, bbox)
+        if region is None:
+            return None
+        frame = self.frame_bus.get_frame()
+        if frame is None:
+            return None
+        region = frame.clip(region)
+        window = frame.crop(region)
+        scaled = shared_state.get_scaled_template(template, scale_calibrator.scale or 1.0)
+        s_h, s_w = scaled.shape[:2]
+        if window.shape[0] < s_h or window.shape[1] < s_w:
+            location_memory.record(False)
+            return None
+        res = cv2.matchTemplate(window, scaled, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, (x, y) = cv2.minMaxLoc(res)
+        hit = max_val >= threshold
+        location_memory.record(hit)
+        if not hit:
+            return None
+
+        top_left_abs = (int(x + region[0]), int(y + region[1]))
+        match_center_absolute = (top_left_abs[0] + s_w // 2, top_left_abs[1] + s_h // 2)
+        location_memory.remember(template_path, match_center_absolute, (s_w, s_h))
+
+        display_label = f"Known ({int(max_val*100)}%)"
+        if label_name:
+            display_label = f"{label_name} ({int(max_val*100)}%)"
+        shared_state.debug_overlays.append(
+            ((top_left_abs[0], top_left_abs[1], s_w, s_h), display_label, time.time())
+        )
+        return match_center_absolute
+
+    def find_many(self, templates: list, bbox=None, threshold=0.65, min_match_count=8, first_only=False) -> list:
+        """
+        find() for several templates on the same frame.
+
+        The screen features are extracted once, and the descriptors of all templates are stacked
+        and matched in a single batch against one FLANN index of the screen (one batch per
+        feature backend in use). Templates SIFT could not locate fall back to template matching,
+        in order. Methods skipped for a template by detection_strategy are not run; the batch
+        always runs before template matching.
+
+        Args:
+            templates (list): Template images (None entries are skipped).
+            first_only (bool): Stop the template matching fallback at the first template found.
+
+        Returns:
+            list: One pyscreeze.Point | None per template, in the same order.
+        """
+        results = [None] * len(templates)
+        paths = [shared_state.get_image_path(template) if template is not None else None for template in templates]
+        orders = [detection_strategy.order(path) for path in paths]
+        attempts = [[] for _ in templates]
+        if bbox is None:
+            bbox = self.window_coords
+        frame = self.frame_bus.get_frame()
+        if frame is None:
+            return results
+
+        try:
+            clipped = frame.clip(bbox)
+            if clipped[0] != clipped[2] and clipped[1] != clipped[3]:
+                # One stacked batch per feature backend
+                batches = {}
+                for i, template in enumerate(templates):
+                    if template is None or "sift" not in orders[i]:
+                        continue
+                    backend = self.get_feature_backend(paths[i])
+                    src_points, descriptors = shared_state.get_template_features(template, backend)
+                    if descriptors is not None and len(descriptors) >= 2:
+                        batches.setdefault(backend, []).append((i, src_points, descriptors))
+                for backend, batch in batches.items():
+                    start = time.perf_counter()
+                    screen = self.get_screen_features(frame, clipped, backend)
+                    if len(screen) < 2:
+                        continue
+                    matches = screen.knn_match(np.vstack([descriptors for _, _, descriptors in batch]))
+                    offset = 0
+                    for i, src_points, descriptors in batch:
+                        count = len(descriptors)
+                        results[i] = self._filter_unsafe(
+                            self._locate_sift(
+                                templates[i],
+                                src_points,
+                                matches[offset : offset + count],
+                                screen,
+                                clipped,
+                                min_match_count,
+                                None,
+                                query_offset=offset,
+                            )
+                        )
+                        offset += count
+                    # The batch cost is shared equally by its templates
+                    ms = (time.perf_counter() - start) * 1000 / len(batch)
+                    for i, _, _ in batch:
+                        attempts[i].append(("sift", ms, bool(results[i])))
         except Exception as e:
             print(f"[OCR-SIFT] Error: {e}")
-            return None
 
-    def find(self, template: np.ndarray, bbox=None, threshold=0.65, min_match_count=8, label_name=None) -> pyscreeze.Point | None:
-        # Priority: SIFT > Template Matching
-        
-        # 1. Try SIFT (Feature Matching)
-        match = self.find_sift(template, bbox, min_match_count=min_match_count, label_name=label_name)
-        
-        # 2. Fallback
-        if not match:
-             match = self.find_template(template, bbox, threshold, label_name=label_name)
-             
+        if not (first_only and any(results)):
+            for i, template in enumerate(templates):
+                if template is None or results[i] or "template" not in orders[i]:
+                    continue
+                start = time.perf_counter()
+                results[i] = self._filter_unsafe(self.find_template(template, bbox, threshold))
+                attempts[i].append(("template", (time.perf_counter() - start) * 1000, bool(results[i])))
+                if first_only and results[i]:
+                    break
+        for path, template_attempts in zip(paths, attempts):
+            detection_strategy.record(path, template_attempts)
+        return results
+
+    def _filter_unsafe(self, match):
+        """
+        Drop a match that would trigger the PyAutoGUI fail-safe (screen corners) if clicked.
+        """
         # Safety Check: PyAutoGUI Fail-Safe trigger (corners)
-        if match:
+        # Only meaningful on the live screen; replayed frames are never clicked.
+        if match and self.frame_bus.source.live:
+            import pyautogui
+
             screen_w, screen_h = pyautogui.size()
             x, y = match
             
@@ -240,55 +594,6 @@ class OCRUtils:
                  
         return match
 
-    def preprocess_image(
-        self,
-        image,
-        target_size=None,
-        threshold_value=None,
-        invert=None,
-    ):
-        """
-        Preprocess an image for OCR by resizing, converting to grayscale, and thresholding.
-
-        Args:
-            image: The input image to preprocess.
-            target_size (tuple, optional): The target size for resizing (width, height).
-            threshold_value (int, optional): The threshold value for binarization.
-            invert (bool, optional): Whether to invert the colors (black background).
-
-        Returns:
-            np.ndarray: The preprocessed image.
-        """
-        # Resize the image to the target size (if specified)
-        if target_size:
-            image = cv2.resize(image, target_size, interpolation=cv2.INTER_LANCZOS4)
-        # Convert the image to grayscale
-        gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        # Apply thresholding if threshold_value is provided\
-        if invert:
-            if threshold_value is not None:
-                _, thresholded_image = cv2.threshold(
-                    gray_image,
-                    threshold_value,
-                    255,
-                    cv2.THRESH_BINARY_INV,
-                )
-                return thresholded_image
-            if threshold_value is None:
-                gray_image_inv = 255 - gray_image
-                return gray_image_inv
-        else:
-            if threshold_value is not None:
-                _, thresholded_image = cv2.threshold(
-                    gray_image,
-                    threshold_value,
-                    255,
-                    cv2.THRESH_BINARY,
-                )
-                return thresholded_image
-            if threshold_value is None:
-                return gray_image
-
     def ocr_to_str(
         self,
         region_x_percent,
@@ -298,22 +603,149 @@ class OCRUtils:
         output_image_path=None,
         ocr_settings=None,
         process_settings=None,
+        charset=None,
     ):
         """
         Perform OCR on a specified region of the screen and return the recognized text.
 
+        Numeric HUD fields in the game font can pass charset: the glyph recognizer (see glyph_ocr.py)
+        reads them first, and Tesseract only runs if it is not confident.
+
         Args:
             region_x_percent (float): The X-coordinate percentage of the left edge of the region.
             region_y_percent (float): The Y-coordinate percentage of the top edge of the region.
             region_right_percent (float): The X-coordinate percentage of the right edge of the region.
             region_bottom_percent (float): The Y-coordinate percentage of the bottom edge of the region.
-            output_image_path (str, optional): The path to save the preprocessed image.
+            output_image_path (str, optional): Name under which the preprocessed image is sampled to the
+                debug sink (see debug_sink.py).
             ocr_settings (str, optional): Additional OCR configuration settings.
             process_settings (dict, optional): Image preprocessing settings.
+            charset (str, optional): The characters the field can contain, e.g. "0123456789/".
 
         Returns:
             str: The recognized text within the specified region.
         """
+        return self.ocr_batch(
+            {
+                "text": {
+                    "region": (region_x_percent, region_y_percent, region_right_percent, region_bottom_percent),
+                    "output_image_path": output_image_path,
+                    "ocr_settings": ocr_settings,
+                    "process_settings": process_settings,
+                    "charset": charset,
+                }
+            }
+        )["text"]
+
+    def ocr_batch(self, regions: dict) -> dict:
+        """
+        Perform OCR on several regions of the same frame with as few OCR engine calls as possible.
+
+        Every region is cropped from one shared frame. Regions read by the glyph recognizer or answered
+        from the OCR cache skip the engine; the remaining ones are passed to the engine together (the CLI
+        engine tiles compatible configs into a single image, see ocr_engine.py).
+
+        Args:
+            regions (dict): name -> settings dict with the keys:
+                "region" (tuple): (x %, y %, right %, bottom %) of the region, as in ocr_to_str,
+                    or "bbox" (tuple): its absolute (left, top, right, bottom) pixels.
+                "ocr_settings", "process_settings", "charset", "output_image_path" (optional): as in ocr_to_str.
+                "bright_text" (optional): text polarity for the glyph recognizer, see glyph_ocr.text_is_bright.
+                "pipeline" (optional): the compiled preprocessing pipeline, instead of process_settings.
+
+        Returns:
+            dict: name -> recognized text ("" if the region could not be captured).
+        """
+        results = {name: "" for name in regions}
+        frame = self.frame_bus.get_frame()
+        if frame is None:
+            return results
+
+        # [(name, preprocessed image, cache key, ocr_settings)]
+        pending = []
+        for name, settings in regions.items():
+            if "bbox" in settings:
+                left, upper, right, bottom = settings["bbox"]
+            else:
+                left, upper, right, bottom = self.region_to_bbox(*settings["region"])
+
+            # Debug Overlay for OCR Region
+            try:
+                 # Store as (left, top, w, h)
+                 # Adjust relative for visualizer if needed, but visualizer expects abs coords
+                 shared_state.debug_overlays.append(
+                    ((left, upper, right - left, bottom - upper), "OCR Region", time.time())
+                 )
+            except Exception:
+                 pass
+
+            # Crop the region from the shared frame (BGR) instead of grabbing the screen again
+            screenshot_np = frame.crop((left, upper, right, bottom))
+            if screenshot_np.size == 0:
+                continue
+
+            output_image_path = settings.get("output_image_path")
+            charset = settings.get("charset")
+            if charset:
+                text = glyph_ocr.recognize(screenshot_np, charset, bright_text=text_is_bright(settings))
+                if text is not None:
+                    if output_image_path:
+                        debug_sink.offer(output_image_path, screenshot_np)
+                    results[name] = text
+                    continue
+
+            pipeline = settings.get("pipeline") or compile_pipeline(settings.get("process_settings"))
+            screenshot_proc = pipeline(screenshot_np)
+            if output_image_path:
+                debug_sink.offer(output_image_path, screenshot_proc)
+
+            # Unchanged fields are answered from the cache (see ocr_cache.py)
+            ocr_settings = settings.get("ocr_settings")
+            cache_key = ocr_cache.key_for(screenshot_proc, ocr_settings)
+            text = ocr_cache.get(cache_key)
+            if text is not None:
+                results[name] = text
+                continue
+            # The pipeline output is a reused buffer (another region of the batch may overwrite it)
+            pending.append((name, screenshot_proc.copy(), cache_key, ocr_settings))
+
+        texts = self.ocr_engine.recognize_many([(image, ocr_settings) for _, image, _, ocr_settings in pending])
+        for (name, _, cache_key, _), text in zip(pending, texts):
+            ocr_cache.put(cache_key, text)
+            results[name] = text
+        return results
+
+    def ocr_regions(self, names, output_image_paths=None) -> dict:
+        """
+        Perform OCR on named regions of regions.json (see roi_registry.py), all from the same frame.
+
+        Args:
+            names (list): The region names.
+            output_image_paths (dict, optional): name -> path to save the preprocessed image.
+
+        Returns:
+            dict: name -> recognized text.
+        """
+        output_image_paths = output_image_paths or {}
+        regions = {}
+        for name in names:
+            settings = roi_registry.ocr_settings(name)
+            settings["bbox"] = roi_registry.rect(name, self.window)
+            settings["pipeline"] = roi_registry.pipeline(name)
+            settings["output_image_path"] = output_image_paths.get(name)
+            regions[name] = settings
+        return self.ocr_batch(regions)
+
+    def ocr_region(self, name, output_image_path=None) -> str:
+        """
+        Perform OCR on a named region of regions.json and return the recognized text.
+        """
+        return self.ocr_regions([name], {name: output_image_path})[name]
+
+    def region_to_bbox(self, region_x_percent, region_y_percent, region_right_percent, region_bottom_percent) -> tuple:
+        """
+        Convert a region in window percentages to absolute (left, top, right, bottom) screen coordinates.
+        """
         left = int(
             self.window_x + (self.window_width * (region_x_percent / 100))
         )
@@ -328,57 +760,15 @@ class OCRUtils:
             self.window_y
             + (self.window_height * (region_bottom_percent / 100))
         )
+        return left, upper, right, bottom
 
-        width = right - left
-        height = bottom - upper
-
-        # Debug Overlay for OCR Region
-        try:
-             # Store as (left, top, w, h)
-             # Adjust relative for visualizer if needed, but visualizer expects abs coords
-             shared_state.debug_overlays.append(
-                ((left, upper, width, height), "OCR Region", time.time())
-             )
-        except Exception:
-             pass
-
-        with mss() as sct:
-            monitor = {
-                "top": upper,
-                "left": left,
-                "width": width,
-                "height": height
-            }
-            sct_img = sct.grab(monitor)
-            # Convert BGRA to BGR to be consistent with previous RGB->BGR assumptions (or just BGR)
-            screenshot_np = cv2.cvtColor(np.array(sct_img), cv2.COLOR_BGRA2BGR)
-            
-            # Preprocessing: Convert to Grayscale (Helps with white text/contrast)
-            screenshot_gray = cv2.cvtColor(screenshot_np, cv2.COLOR_BGR2GRAY)
-
-        # screenshot_cropped = screenshot_np[upper:bottom, left:right]
-        if process_settings:
-            screenshot_size = (
-                screenshot_np.shape[1] * process_settings["scale_factor"],
-                screenshot_np.shape[0] * process_settings["scale_factor"],
-            )
-            screenshot_proc = self.preprocess_image(
-                image=screenshot_np,
-                target_size=screenshot_size,
-                threshold_value=process_settings["threshold_value"],
-                invert=process_settings["invert"],
-            )
-        else:
-            # Default to grayscale if no settings provided (Better for simple OCR)
-            screenshot_proc = screenshot_gray
-        if output_image_path:
-            cv2.imwrite(output_image_path, screenshot_proc)
-        if ocr_settings:
-            text = pytesseract.image_to_string(screenshot_proc, config=ocr_settings)
-        else:
-            text = pytesseract.image_to_string(screenshot_proc)
-
-        return text
+    def debug_screenshot(self, name):
+        """
+        Queue a screenshot of the entire window to the debug sink (written in the background).
+        """
+        screenshot_cv = self.frame_bus.grab(self.window_coords)
+        if screenshot_cv is not None:
+            debug_sink.submit(name, screenshot_cv, anomaly=True)
 
     def screenshot(self, name):
         """
@@ -387,11 +777,6 @@ class OCRUtils:
         Args:
             name (str): The name and path of the output screenshot file.
         """
-        with mss() as sct:
-            monitor = {
-                "top": self.window_coords[1],
-                "left": self.window_coords[0],
-                "width": self.window_coords[2] - self.window_coords[0],
-                "height": self.window_coords[3] - self.window_coords[1]
-            }
-            to_png(sct.grab(monitor).rgb, sct.grab(monitor).size, output=name)
+        screenshot_cv = self.frame_bus.grab(self.window_coords)
+        if screenshot_cv is not None:
+            cv2.imwrite(name, screenshot_cv)
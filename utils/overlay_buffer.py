@@ -0,0 +1,57 @@
+"""
+overlay_buffer.py
+
+Bounded ring buffer for the debug overlays drawn by the Visualizer.
+
+Every template/SIFT match, OCR region and click appends an overlay (rect/point, label, timestamp) to
+shared_state.debug_overlays. It used to be a list only pruned by the visualization loop (rebuilt every
+frame), so without the Visualizer it grew for as long as the bot ran. The buffer keeps the last
+OVERLAY_CAPACITY overlays in a fixed array of slots: append() overwrites the oldest slot in O(1), and
+iterating yields the overlays younger than OVERLAY_TTL_S straight from the slots, without copying or
+pruning anything.
+"""
+
+from threading import Lock
+import time
+
+# Overlays kept at most; older ones are overwritten
+OVERLAY_CAPACITY = 256
+# Overlays older than this are not drawn anymore
+OVERLAY_TTL_S = 2.0
+
+
+class OverlayBuffer:
+    def __init__(self, capacity=OVERLAY_CAPACITY, ttl_s=OVERLAY_TTL_S):
+        """
+        Attributes:
+            slots (list): The overlays, (rect/point, label, timestamp) tuples, None for an unused slot.
+            written (int): Number of overlays appended; the next one goes to slots[written % capacity].
+        """
+        self.capacity = capacity
+        self.ttl_s = ttl_s
+        self.slots = [None] * capacity
+        self.written = 0
+        self.lock = Lock()
+
+    def append(self, overlay):
+        """
+        Add an overlay, overwriting the oldest one when the buffer is full.
+        """
+        with self.lock:
+            self.slots[self.written % self.capacity] = overlay
+            self.written += 1
+
+    def __iter__(self):
+        """
+        Yield the overlays that did not expire, oldest first. An overlay appended while iterating may be
+        yielded in place of the one it overwrote.
+        """
+        now = time.time()
+        written = self.written
+        for index in range(max(written - self.capacity, 0), written):
+            overlay = self.slots[index % self.capacity]
+            if overlay is not None and now - overlay[2] < self.ttl_s:
+                yield overlay
+
+    def __len__(self):
+        return sum(1 for _ in self)
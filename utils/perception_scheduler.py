@@ -0,0 +1,289 @@
+"""
+perception_scheduler.py
+
+Single-threaded scheduler for the periodic perception work of PlayerInfo (in-home detection, rolls,
+rolling status, money, multiplier).
+
+Instead of one thread per field, each polling on its own timer and grabbing its own capture, the tasks
+live in a table ordered by priority. Every tick the scheduler takes one frame, pins it on the frame bus
+(so every detection/OCR call of the tick reads that same frame) and runs the tasks that are due:
+    - a task runs at most once per period_s,
+    - a task is skipped when it is disabled (e.g. not on the home screen), when no new frame has been
+      captured since its last run, or when none of its screen regions changed (see change_detector.py),
+    - once a tick has used TICK_BUDGET_S, lower priority tasks are postponed to the next tick unless
+      that would make them later than their deadline_s.
+A task that returns False (its read was unreliable) is re-run on its next period even if its regions
+did not change. Per-task latency, achieved rate, skips and late runs are kept in PerceptionTask and
+logged every STATS_LOG_S seconds, together with the stats of the reporters added with add_reporter().
+
+With a rate callable (see rate_governor.py) the periods follow the bot state, and wake() makes every task
+due at once after a state change. hold(until) stops the pipeline (no capture, no detection, no OCR) until
+a given time, e.g. while waiting for the dice to regenerate (see regen_timer.py). Tasks with a hold_period_s
+(the in-home check) keep running at that slower period during a hold, so a change of screen is still seen.
+"""
+
+from threading import Event, Thread
+import time
+from .logger import logger
+from .roi_registry import roi_registry
+from .change_detector import change_detector
+
+# Scheduler resolution: the loop never sleeps longer than this
+TICK_S = 0.05
+# Tick time after which low priority tasks are postponed (if their deadline allows it)
+TICK_BUDGET_S = 0.25
+# Interval between stats reports in the log
+STATS_LOG_S = 300
+
+
+class PerceptionTask:
+    def __init__(self, name, run, period_s, deadline_s=None, enabled=None, regions=(), heartbeat=None, hold_period_s=None):
+        """
+        Args:
+            name (str): The task name.
+            run (callable): Called without arguments while the tick's frame is pinned on the frame bus.
+                Returning False asks for a re-run even if unchanged.
+            period_s (float): Target interval between runs.
+            deadline_s (float, optional): Maximum acceptable delay past the due time. Defaults to period_s.
+            enabled (callable, optional): Returns False while the task should not run.
+            regions (tuple): Names of the regions (regions.json) the task reads; the task only runs when one changed.
+            heartbeat (callable, optional): Called instead of run when its regions did not change (e.g. to
+                republish the last value to consumers waiting on a Condition).
+            hold_period_s (float, optional): Period of the task while the scheduler is held. Tasks without one
+                do not run during a hold.
+
+        Attributes:
+            due (float): When the task should run next.
+            last_seq (int): Sequence number of the frame of the last run.
+            runs (int): Number of runs.
+            skipped (int): Due ticks skipped (disabled or no new frame).
+            unchanged (int): Due ticks skipped because none of its regions changed.
+            postponed (int): Due ticks postponed because the tick was over budget.
+            late (int): Runs started after their deadline.
+            total_ms (float): Total run time.
+            max_ms (float): Longest run.
+        """
+        self.name = name
+        self.run = run
+        self.period_s = period_s
+        self.deadline_s = deadline_s if deadline_s is not None else period_s
+        self.enabled = enabled
+        self.regions = tuple(regions)
+        self.heartbeat = heartbeat
+        self.hold_period_s = hold_period_s
+        self.due = 0.0
+        self.last_seq = None
+        self.runs = 0
+        self.skipped = 0
+        self.unchanged = 0
+        self.postponed = 0
+        self.late = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.first_run = None
+        self.last_run = None
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.runs if self.runs else 0.0
+
+    @property
+    def rate_hz(self) -> float:
+        """
+        Achieved run rate since the first run.
+        """
+        if self.runs < 2:
+            return 0.0
+        return (self.runs - 1) / max(self.last_run - self.first_run, 1e-6)
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "unchanged": self.unchanged,
+            "postponed": self.postponed,
+            "late": self.late,
+            "mean_ms": round(self.mean_ms, 2),
+            "max_ms": round(self.max_ms, 2),
+            "rate_hz": round(self.rate_hz, 2),
+            "target_hz": round(1 / self.period_s, 2),
+        }
+
+
+class PerceptionScheduler:
+    def __init__(self, frame_bus, name="perception", rate=None):
+        """
+        Args:
+            frame_bus (FrameBus): Where the tick frames come from.
+            name (str): Thread and log name.
+            rate (callable, optional): (task name, period_s) -> the period to use now. Defaults to period_s.
+
+        Attributes:
+            tasks (list): The PerceptionTasks, highest priority first.
+            held_until (float | None): No task runs before this time (see hold).
+            reporters (list): (label, callable returning {name: stats}) pairs logged with the task stats.
+        """
+        self.frame_bus = frame_bus
+        self.name = name
+        self.rate = rate
+        self.tasks = []
+        self.held_until = None
+        self.reporters = []
+        self.resumed = Event()
+        self.thread = None
+        self.running = False
+
+    def add(
+        self, name, run, period_s, deadline_s=None, enabled=None, regions=(), heartbeat=None, hold_period_s=None
+    ) -> PerceptionTask:
+        """
+        Append a task. Tasks added first have the highest priority.
+        """
+        task = PerceptionTask(name, run, period_s, deadline_s, enabled, regions, heartbeat, hold_period_s)
+        self.tasks.append(task)
+        return task
+
+    def add_reporter(self, label, stats):
+        """
+        Log the stats returned by stats() (name -> dict) every STATS_LOG_S seconds, e.g. the value filters.
+        """
+        self.reporters.append((label, stats))
+
+    def start(self):
+        self.running = True
+        self.thread = Thread(target=self.loop, daemon=True, name=self.name)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.resumed.set()
+
+    def hold(self, until=None):
+        """
+        Stop running tasks (except those with a hold_period_s) until the given time, or resume right away
+        (and run every task) if until is None.
+        """
+        self.held_until = until
+        if until is None:
+            self.wake()
+            self.resumed.set()
+        else:
+            self.resumed.clear()
+            logger.debug(f"[PERCEPTION] Holding {self.name} for {until - time.time():.0f}s")
+
+    def wake(self):
+        """
+        Make every task due now (e.g. the bot state changed).
+        """
+        now = time.time()
+        for task in self.tasks:
+            task.due = min(task.due, now)
+
+    def held(self) -> bool:
+        held_until = self.held_until
+        return held_until is not None and held_until > time.time()
+
+    def active_tasks(self) -> list:
+        """
+        The tasks allowed to run now: all of them, or only those with a hold_period_s during a hold.
+        """
+        if self.held():
+            return [task for task in self.tasks if task.hold_period_s is not None]
+        return self.tasks
+
+    def period(self, task) -> float:
+        if task.hold_period_s is not None and self.held():
+            return task.hold_period_s
+        return self.rate(task.name, task.period_s) if self.rate is not None else task.period_s
+
+    def loop(self):
+        next_report = time.time() + STATS_LOG_S
+        while self.running:
+            self.tick()
+            now = time.time()
+            if now >= next_report:
+                self.log_stats()
+                next_report = now + STATS_LOG_S
+            held_until = self.held_until
+            next_due = min((task.due for task in self.active_tasks()), default=now + TICK_S)
+            if held_until is not None and held_until > now:
+                # Sleep until the next task that ignores the hold, the end of the hold or hold(None)
+                self.resumed.wait(timeout=max(min(next_due, held_until) - time.time(), 0.005))
+                continue
+            time.sleep(min(max(next_due - time.time(), 0.005), TICK_S))
+
+    def tick(self):
+        """
+        Run every due task against one shared frame.
+        """
+        start = time.time()
+        due = [task for task in self.active_tasks() if task.due <= start]
+        if not due:
+            return
+        frame = self.frame_bus.get_frame()
+        if frame is None:
+            return
+        with self.frame_bus.pin(frame):
+            for task in due:
+                now = time.time()
+                if task.enabled is not None and not task.enabled():
+                    task.skipped += 1
+                    task.due = now + self.period(task)
+                    continue
+                if task.last_seq == frame.seq:
+                    # Nothing new to look at: retry on the next tick
+                    task.skipped += 1
+                    continue
+                lateness = now - task.due
+                if now - start > TICK_BUDGET_S and lateness + TICK_S < task.deadline_s:
+                    task.postponed += 1
+                    continue
+                if task.regions and not self.regions_changed(task, frame):
+                    task.unchanged += 1
+                    task.due = now + self.period(task)
+                    if task.heartbeat is not None:
+                        task.heartbeat()
+                    continue
+                if task.runs and lateness > task.deadline_s:
+                    task.late += 1
+                try:
+                    reliable = task.run()
+                except Exception as e:
+                    logger.error(f"[PERCEPTION] Task {task.name} failed: {e}")
+                    reliable = False
+                if reliable is False:
+                    for region in task.regions:
+                        change_detector.forget(region)
+                finished = time.time()
+                elapsed_ms = (finished - now) * 1000
+                task.runs += 1
+                task.total_ms += elapsed_ms
+                task.max_ms = max(task.max_ms, elapsed_ms)
+                task.first_run = task.first_run or now
+                task.last_run = now
+                task.last_seq = frame.seq
+                # Keep the cadence, but never schedule in the past after a long run
+                task.due = max(task.due + self.period(task), finished)
+
+    def regions_changed(self, task, frame) -> bool:
+        changed = False
+        for region in task.regions:
+            # Check every region so each keeps an up to date reference
+            if change_detector.changed(region, frame.crop(roi_registry.rect(region, self.frame_bus.window))):
+                changed = True
+        return changed
+
+    def stats(self) -> dict:
+        """
+        Per-task latency and achieved-rate stats.
+        """
+        return {task.name: task.stats() for task in self.tasks}
+
+    def log_stats(self):
+        for name, stats in self.stats().items():
+            logger.debug(f"[PERCEPTION] {name}: {stats}")
+        for region, stats in change_detector.stats().items():
+            logger.debug(f"[PERCEPTION] region {region}: {stats}")
+        for label, reporter in self.reporters:
+            for name, stats in reporter().items():
+                logger.debug(f"[PERCEPTION] {label} {name}: {stats}")
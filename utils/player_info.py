@@ -1,16 +1,26 @@
 from .ocr_utils import OCRUtils
 from shared_state import shared_state
-from time import sleep
 import re
 import os
 from .logger import logger
-from threading import Thread
-
-ocr_utils = OCRUtils()
+from .roi_registry import roi_registry
+from .value_filter import ValueFilter, text_confidence
+from .debug_sink import debug_sink
+from .perception_scheduler import PerceptionScheduler
+from .rate_governor import rate_governor
+from .regen_timer import regen_timer
 
+# Fastest autoroll cadence: at most one roll (costing `multiplier` dice) every ROLL_PERIOD_S seconds
+ROLL_PERIOD_S = 2
+# Multiplier steps offered by the game
+MULTIPLIER_STEPS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000)
+# Period of the in-home check while perception is held for the dice regeneration
+IN_HOME_HOLD_PERIOD_S = 5
+# HUD fields read together in one OCR batch
+HUD_REGIONS = ("money", "rolls", "multiplier")
 
 class PlayerInfo:
-    def __init__(self):
+    def __init__(self, frame_source=None):
         """
         PlayerInfo class is responsible for getting the player's money, rolls, multiplier, rolling status, and in home status.
 
@@ -20,325 +30,236 @@ class PlayerInfo:
             multiplier (int): The player's multiplier.
             rolling_status (bool): The player's rolling status.
             in_home_status (bool): The player's in home status.
-            money_condition (threading.Condition): The condition variable for the money attribute.
-            rolls_condition (threading.Condition): The condition variable for the rolls attribute.
-            multiplier_condition (threading.Condition): The condition variable for the multiplier attribute.
-            rolling_status_condition (threading.Condition): The condition variable for the rolling_status attribute.
-            in_home_condition (threading.Condition): The condition variable for the in_home_status attribute.
+            ocr_utils (OCRUtils): The OCR/vision helper reading frames from frame_source (defaults to the live window).
+            money_filter, rolls_filter, multiplier_filter (ValueFilter): Only stable reads are published (see value_filter.py).
+            scheduler (PerceptionScheduler): Runs the perception tasks (in-home, HUD, rolling status).
         """
         self.current_path = shared_state.current_path
+        self.ocr_utils = OCRUtils(frame_source)
 
         self.money = None
         self.rolls = None
         self.multiplier = None
         self.rolling_status = False
         self.in_home_status = False
-        self.money_condition = shared_state.money_condition
-        self.rolls_condition = shared_state.rolls_condition
-        self.multiplier_condition = shared_state.multiplier_condition
-        self.rolling_status_condition = shared_state.rolling_condition
-        self.in_home_condition = shared_state.in_home_condition
+        # Money moves by rents and rewards within a factor of 3; a dropped or extra digit (x10) needs a vote.
+        # No money is published before two reads agree on it.
+        self.money_filter = ValueFilter("money", initial=None, max_ratio=3)
+        # Rolling spends at most `multiplier` dice per roll; rewards and other jumps need 2 agreeing reads out of 3
+        self.multiplier_filter = ValueFilter("multiplier", initial=1, valid=lambda multiplier: multiplier in MULTIPLIER_STEPS)
+        self.rolls_filter = ValueFilter(
+            "rolls", initial=50, valid=lambda rolls: rolls >= 0,
+            max_rate=lambda: self.multiplier_filter.value / ROLL_PERIOD_S,
+        )
+        self.charsets = {
+            name: roi_registry.ocr_settings(name).get("charset", "0123456789")
+            for name in HUD_REGIONS
+        }
+        # Templates loaded once for the detection tasks
+        self.autoroll_image = shared_state.load_image(os.path.join(self.current_path, "images", "autoroll.png"))
+        self.in_home_image = shared_state.load_image(os.path.join(self.current_path, "images", "in-home-icon.png"))
+        # GO button as fallback/primary indicator per user request
+        self.go_image = shared_state.load_image(os.path.join(self.current_path, "images", "go.png"))
+        self.scheduler = PerceptionScheduler(self.ocr_utils.frame_bus, name="playerinfo.perception", rate=rate_governor.interval)
+        # Re-read everything right away when the bot state changes
+        rate_governor.subscribe(lambda old, new: self.scheduler.wake())
+        # No perception at all while waiting for the dice to regenerate; a state change (e.g. a heist) ends the wait
+        regen_timer.subscribe(self.scheduler.hold)
+        rate_governor.subscribe(lambda old, new: regen_timer.wake())
 
-    def money_thread(self):
+    def read_hud(self):
         """
-        Thread function to continuously monitor and update the player's money.
+        Perception task: read and publish the player's money, rolls and multiplier.
+
+        The three fields are read from the same frame in one OCR batch (a single engine call, see
+        OCRUtils.ocr_batch).
+
+        Returns:
+            bool: False if a read was rejected by its value filter (read again even if unchanged).
         """
-        last_known_money = 0  # Inizializza a 0
-        self.set_money(last_known_money) # Initialize immediately to unblock
-        while True:
-            if self.in_home_status:
-                x_percent = 33.5
-                y_percent = 5
-                right_percent = 62
-                bottom_percent = 9
-                money_text = ocr_utils.ocr_to_str(
-                    x_percent,
-                    y_percent,
-                    right_percent,
-                    bottom_percent,
-                    output_image_path="proc-money.png",
-                )
-                money_text = "".join(filter(str.isdigit, money_text))
+        texts = self.ocr_utils.ocr_regions(HUD_REGIONS, {"money": "proc-money.png", "multiplier": "multi.png"})
+        accepted = [self.read_money(texts["money"]), self.read_rolls(texts["rolls"]), self.read_multiplier(texts["multiplier"])]
+        return all(accepted)
 
-                if money_text.isdigit():
-                    new_money = int(money_text)
-                    self.set_money(new_money)
-                    last_known_money = self.money
-                    # Log ogni 60 secondi circa
-                    if not hasattr(self, '_money_log_counter'):
-                        self._money_log_counter = 0
-                    self._money_log_counter += 1
-                    if self._money_log_counter % 60 == 0:
-                        logger.debug(f"[PLAYER-INFO] Money updated: {new_money:,}")
-                else:
-                    self.set_money(last_known_money)
-                sleep(0.5)  # Controlla ogni 0.5 secondi
-            else:
-                logger.debug("[PLAYER-INFO] Money thread waiting for in_home_status...")
-                with self.in_home_condition:
-                    self.in_home_condition.wait_for(lambda: self.in_home_status)
-                logger.debug("[PLAYER-INFO] Money thread: in_home_status became True!")
-                sleep(1)
+    def publish_hud(self):
+        """
+        Republish the last money, rolls and multiplier (when the HUD did not change).
+        """
+        self.set_money(self.money_filter.value)
+        self.set_rolls(self.rolls_filter.value)
+        self.set_multiplier(self.multiplier_filter.value)
 
-    def rolls_thread(self):
+    def read_money(self, money_text):
         """
-        Thread function to continuously monitor and update the player's rolls.
+        Parse and publish the player's money.
+
+        Returns:
+            bool: False if the read was rejected by the value filter.
         """
-        last_known_rolls = 50  # Start with 50 to force initial roll attempt
-        last_known_roll_capacity = 50  # Inizializza a 50
-        self.set_rolls(last_known_rolls) # Initialize immediately so we aren't stuck on None
-        while True:
-            if self.in_home_status:
-                x_percent, y_percent, right_percent, bottom_percent = (
-                    43,
-                    92,
-                    57,
-                    94.5,
-                )
-                process_settings = {
-                    "threshold_value": 75,
-                    "invert": True,
-                    "scale_factor": 3,
-                }
-                # Rolls Text (Updated via Region Selector)
-                # Region Selector gave (Left, Top, Width, Height)
-                # ocr_to_str expects (Left, Top, Right, Bottom)
-                # L=39.67, T=90.71, W=19.75, H=4.55
-                rolls_text = ocr_utils.ocr_to_str(
-                    39.67, 
-                    90.71, 
-                    39.67 + 19.75, 
-                    90.71 + 4.55,
-                    ocr_settings=r'--psm 6 -c tessedit_char_whitelist="0123456789/"',
-                )
+        confidence = text_confidence(money_text, self.charsets["money"])
+        money_text = "".join(filter(str.isdigit, money_text))
 
-                #logger.debug(f"[PLAYER-INFO] Raw rolls text: '{rolls_text}'")
+        new_money = self.money_filter.update(int(money_text) if money_text.isdigit() else None, confidence)
+        if self.money_filter.last_rejected:
+            debug_sink.flag("proc-money.png")
+        self.set_money(new_money)
+        # Log ogni 60 secondi circa
+        if not hasattr(self, '_money_log_counter'):
+            self._money_log_counter = 0
+        self._money_log_counter += 1
+        if self._money_log_counter % 60 == 0 and new_money is not None:
+            logger.debug(f"[PLAYER-INFO] Money updated: {new_money:,}")
+        return not self.money_filter.last_rejected
 
-                rolls_text_e = re.sub(r"([^0-9/])", "", rolls_text)
-                rolls_parts = rolls_text_e.split("/")
+    def read_rolls(self, rolls_text):
+        """
+        Parse and publish the player's rolls (returns False like read_money).
+        """
+        #logger.debug(f"[PLAYER-INFO] Raw rolls text: '{rolls_text}'")
 
-                if len(rolls_parts) == 2:
-                    try:
-                        rolls = int(rolls_parts[0].strip())
-                        roll_capacity = int(rolls_parts[1].strip())
-                        self.set_rolls(rolls)
-                        last_known_rolls = rolls
-                        last_known_roll_capacity = roll_capacity
-                        # Log ogni volta che i rolls cambiano
-                        if not hasattr(self, '_last_logged_rolls'):
-                            self._last_logged_rolls = -1
-                        if rolls != self._last_logged_rolls:
-                            logger.debug(f"[PLAYER-INFO] Rolls updated: {rolls}/{roll_capacity}")
-                            self._last_logged_rolls = rolls
+        confidence = text_confidence(rolls_text, self.charsets["rolls"])
+        rolls_text_e = re.sub(r"([^0-9/])", "", rolls_text)
+        rolls_parts = rolls_text_e.split("/")
 
-                    except ValueError:
-                        self.set_rolls(last_known_rolls)
-                else:
-                    self.set_rolls(last_known_rolls)
-                sleep(0.5)  # Controlla ogni 0.5 secondi
-            else:
-                with self.in_home_condition:
-                    self.in_home_condition.wait_for(lambda: self.in_home_status)
-                sleep(1)
+        rolls, roll_capacity = None, None
+        if len(rolls_parts) == 2:
+            try:
+                rolls = int(rolls_parts[0].strip())
+                roll_capacity = int(rolls_parts[1].strip())
+            except ValueError:
+                rolls = None
+        rolls = self.rolls_filter.update(rolls, confidence)
+        self.set_rolls(rolls)
+        # Log ogni volta che i rolls cambiano
+        if not hasattr(self, '_last_logged_rolls'):
+            self._last_logged_rolls = -1
+        if rolls != self._last_logged_rolls:
+            logger.debug(f"[PLAYER-INFO] Rolls updated: {rolls}/{roll_capacity}")
+            self._last_logged_rolls = rolls
+        return not self.rolls_filter.last_rejected
 
-    def multiplier_thread(self):
+    def read_multiplier(self, multiplier_text):
         """
-        Thread function to continuously monitor and update the player's multiplier.
+        Parse and publish the player's multiplier (returns False like read_money).
         """
-        last_known_multiplier = 1  # Inizializza a 1
-        while True:
-            if self.in_home_status:
-                x_percent, y_percent, right_percent, bottom_percent = (
-                    53,
-                    70,
-                    57,
-                    73,
-                )
-                mp_ocr_settings = (
-                    r"--psm 7 --oem 3 -c tessedit_char_whitelist=x0123456789"
-                )
-                mp_process_settings = {
-                    "threshold_value": 75,
-                    "invert": False,
-                    "scale_factor": 3,
-                }
-                multiplier_text = ocr_utils.ocr_to_str(
-                    x_percent,
-                    y_percent,
-                    right_percent,
-                    bottom_percent,
-                    output_image_path="multi.png",
-                    ocr_settings=mp_ocr_settings,
-                    process_settings=mp_process_settings,
-                )
-                multiplier_text = "".join(filter(str.isdigit, multiplier_text))
+        confidence = text_confidence(multiplier_text, self.charsets["multiplier"])
+        multiplier_text = "".join(filter(str.isdigit, multiplier_text))
 
-                if multiplier_text.isdigit():
-                    self.set_multiplier(int(multiplier_text))
-                    last_known_multiplier = self.multiplier
-                    sleep(0.5)
-                else:
-                    self.set_multiplier(last_known_multiplier)
-                    sleep(0.5)
-            else:
-                with self.in_home_condition:
-                    self.in_home_condition.wait_for(lambda: self.in_home_status)
-                sleep(1)
+        multiplier = int(multiplier_text) if multiplier_text.isdigit() else None
+        self.set_multiplier(self.multiplier_filter.update(multiplier, confidence))
+        if self.multiplier_filter.last_rejected:
+            debug_sink.flag("multi.png")
+        return not self.multiplier_filter.last_rejected
 
-    def rolling_status_thread(self):
+    def check_rolling_status(self):
         """
-        Thread function to continuously monitor and update the player's rolling status.
+        Perception task: detect whether the autoroll is active.
         """
-        # Carica l'immagine UNA VOLTA all'inizio
-        autoroll_image_path = os.path.join(
-            self.current_path, "images", "autoroll.png"
-        )
-        autoroll_image = shared_state.load_image(autoroll_image_path)
-        
-        while True:
-            if self.in_home_status:
-                autoroll_location = ocr_utils.find(autoroll_image)
-                if autoroll_location:
-                    self.set_rolling(True)
-                else:
-                    self.set_rolling(False)
-                sleep(0.5)  # Controlla ogni 0.5 secondi
-            else:
-                with self.in_home_condition:
-                    self.in_home_condition.wait_for(lambda: self.in_home_status)
+        autoroll_location = self.ocr_utils.find(self.autoroll_image, static=True)
+        if autoroll_location:
+            self.set_rolling(True)
+        else:
+            self.set_rolling(False)
 
-    def in_home_status_thread(self):
+    def check_in_home_status(self):
         """
-        Thread function to continuously monitor and update the player's in home status.
+        Perception task: detect whether the player is on the home screen.
         """
-        check_count = 0
-        logger.debug(f"[PLAYER-INFO] In-Home thread started. Window coords: {shared_state.window_coords}")
-        
-        # Carica l'immagine UNA VOLTA all'inizio invece che ad ogni iterazione
-        in_home_image_path = os.path.join(
-            self.current_path, "images", "in-home-icon.png"
-        )
-        in_home_image = shared_state.load_image(in_home_image_path)
-        
-        # Load GO button as fallback/primary indicator per user request
-        go_image_path = os.path.join(
-            self.current_path, "images", "go.png"
-        )
-        go_image = shared_state.load_image(go_image_path)
-        
-        logger.debug(f"[PLAYER-INFO] In-Home icon loaded. GO icon loaded.")
-        
-        # Monitoraggio reale dello stato In-Home
-        while True:
-            # Check if in-home icon OR GO button is present
-            # User requested to use GO button as proof of being in home
-            is_home = False
-            if ocr_utils.find(go_image):
-                 is_home = True
-                 # logger.debug("[PLAYER-INFO] GO Button detected -> In Home")
-            elif ocr_utils.find(in_home_image):
-                 is_home = True
-                 # logger.debug("[PLAYER-INFO] Home Icon detected -> In Home")
+        # Check if in-home icon OR GO button is present
+        # User requested to use GO button as proof of being in home
+        is_home = False
+        if self.ocr_utils.find(self.go_image, static=True):
+             is_home = True
+             # logger.debug("[PLAYER-INFO] GO Button detected -> In Home")
+        elif self.ocr_utils.find(self.in_home_image, static=True):
+             is_home = True
+             # logger.debug("[PLAYER-INFO] Home Icon detected -> In Home")
+
+        if is_home:
+            if not self.in_home_status:
+                logger.debug(f"[PLAYER-INFO] Home/GO detected. Setting in_home_status = True")
+                self.set_in_home(True)
+            # Reset counter on success
+            if hasattr(self, '_fail_count'): self._fail_count = 0
+        else:
+            if self.in_home_status:
+                logger.debug("[PLAYER-INFO] Home/GO lost. Setting in_home_status = False")
+                self.set_in_home(False)
 
-            if is_home:
-                if not self.in_home_status:
-                    logger.debug(f"[PLAYER-INFO] Home/GO detected. Setting in_home_status = True")
-                    self.set_in_home(True)
-                # Reset counter on success
-                if hasattr(self, '_fail_count'): self._fail_count = 0
-            else:
-                if self.in_home_status:
-                    logger.debug("[PLAYER-INFO] Home/GO lost. Setting in_home_status = False")
-                    self.set_in_home(False)
-                
-                # Debug Panic: Capture screenshot if finding fails repeatedly for a LONG time
-                if not hasattr(self, '_fail_count'):
-                    self._fail_count = 0
-                self._fail_count += 1
-                if self._fail_count % 60 == 0: # Every 60 seconds (approx) - Reduced sensitivity
-                    logger.warning("[PLAYER-INFO] In-Home/GO icon NOT found for 60s. Saving debug screenshot...")
-                    ocr_utils.screenshot("debug_home_fail.png")
-            
-            sleep(1) # Controlla ogni secondo
+            # Debug Panic: Capture screenshot if finding fails repeatedly for a LONG time
+            if not hasattr(self, '_fail_count'):
+                self._fail_count = 0
+            self._fail_count += 1
+            if self._fail_count % 60 == 0: # Every 60 seconds (approx) - Reduced sensitivity
+                logger.warning("[PLAYER-INFO] In-Home/GO icon NOT found for 60s. Saving debug screenshot...")
+                self.ocr_utils.debug_screenshot("debug_home_fail.png")
 
     def set_money(self, money):
         """
         Sets the player's money.
         """
-        with self.money_condition:
-            self.money = money
-            shared_state.money = money
-            self.money_condition.notify_all()
+        self.money = money
+        shared_state.money = money
 
     def set_rolls(self, rolls):
         """
         Sets the player's rolls.
         """
-        with self.rolls_condition:
-            self.rolls = rolls
-            shared_state.rolls = rolls
-            self.rolls_condition.notify_all()
+        self.rolls = rolls
+        shared_state.rolls = rolls
+        rate_governor.update()
 
     def set_multiplier(self, multiplier):
         """
         Sets the player's multiplier.
         """
-        with self.multiplier_condition:
-            self.multiplier = multiplier
-            shared_state.multiplier = multiplier
-            self.multiplier_condition.notify_all()
+        self.multiplier = multiplier
+        shared_state.multiplier = multiplier
 
     def set_rolling(self, rolling_status):
         """
         Sets the player's rolling status.
         """
-        with self.rolling_status_condition:
-            self.rolling_status = rolling_status
-            shared_state.rolling_status = rolling_status
-            self.rolling_status_condition.notify_all()
+        self.rolling_status = rolling_status
+        shared_state.rolling_status = rolling_status
+        rate_governor.update()
 
     def set_in_home(self, in_home_status):
         """
         Sets the player's in home status.
         """
-        with self.in_home_condition:
-            self.in_home_status = in_home_status
-            shared_state.in_home_status = in_home_status
-            self.in_home_condition.notify_all()
+        self.in_home_status = in_home_status
+        shared_state.in_home_status = in_home_status
+        rate_governor.update()
 
     def run(self):
         """
-        Runs each thread to monitor and update the player's money, rolls, multiplier, rolling status, and in home status.
+        Starts the perception scheduler that monitors and updates the player's money, rolls, multiplier, rolling status,
+        and in home status from one shared frame per tick (see perception_scheduler.py).
         """
         logger.debug("[PLAYER-INFO] ========================================")
-        logger.debug("[PLAYER-INFO] PlayerInfo STARTING all threads...")
+        logger.debug("[PLAYER-INFO] PlayerInfo STARTING perception scheduler...")
         logger.debug("[PLAYER-INFO] ========================================")
-        
-        threads = {
-            "money": Thread(
-                target=self.money_thread, daemon=True, name="playerinfo.money"
-            ),
-            "rolls": Thread(
-                target=self.rolls_thread, daemon=True, name="playerinfo.rolls"
-            ),
-            "multiplier": Thread(
-                target=self.multiplier_thread,
-                daemon=True,
-                name="playerinfo.multiplier",
-            ),
-            "rolling_status": Thread(
-                target=self.rolling_status_thread,
-                daemon=True,
-                name="playerinfo.rolling_status",
-            ),
-            "in_home_status": Thread(
-                target=self.in_home_status_thread,
-                daemon=True,
-                name="playerinfo.in_home_status",
-            ),
-        }
-        for thread_name, thread in threads.items():
-            thread.start()
-            logger.debug(f"[PLAYER-INFO] Started thread: {thread_name}")
-        
-        logger.debug("[PLAYER-INFO] All threads started successfully")
+        logger.debug(f"[PLAYER-INFO] Window coords: {shared_state.window_coords}")
+
+        # Initialize immediately to unblock (rolls start at 50 to force initial roll attempt)
+        self.set_money(self.money_filter.value)
+        self.set_rolls(self.rolls_filter.value)
+
+        in_home = lambda: self.in_home_status
+        # Highest priority first: everything else depends on the in-home status.
+        # It also keeps running (slowly) while the regen timer holds the rest of the pipeline.
+        self.scheduler.add("in_home", self.check_in_home_status, period_s=1, deadline_s=0.5, hold_period_s=IN_HOME_HOLD_PERIOD_S)
+        # The HUD is only read when one of its regions changed (or every CHANGE_REFRESH_S), see change_detector.py;
+        # unchanged fields of the batch are answered from the OCR cache.
+        # Skipped reads still republish the last values: some handlers wait() on the conditions without a predicate
+        self.scheduler.add(
+            "hud", self.read_hud, period_s=0.5, enabled=in_home, regions=HUD_REGIONS, heartbeat=self.publish_hud,
+        )
+        self.scheduler.add("rolling", self.check_rolling_status, period_s=0.5, deadline_s=1, enabled=in_home)
+        self.scheduler.add_reporter(
+            "filter", lambda: {f.name: f.stats() for f in (self.money_filter, self.rolls_filter, self.multiplier_filter)}
+        )
+        self.scheduler.add_reporter("regen", lambda: {"timer": regen_timer.stats()})
+        self.scheduler.start()
+        logger.debug("[PLAYER-INFO] Perception scheduler started successfully")
@@ -0,0 +1,112 @@
+"""
+preprocess.py
+
+OCR preprocessing pipelines compiled once per set of process_settings.
+
+A pipeline is declared by the same process_settings dict ocr_to_str takes:
+    {"threshold_value": 75, "invert": False, "scale_factor": 3}
+and an optional "interpolation" ("nearest", "linear", "cubic", "area", "lanczos"). Compiling it fixes the
+OpenCV calls, flags and sizes up front, and every step writes into destination buffers kept per thread
+and per input shape, so the polling threads stop allocating new arrays on every read.
+
+Compared with the original preprocessing (the former OCRUtils.preprocess_image) the crop is converted to grayscale before resizing
+(one channel to resize instead of three), and thresholded fields are resized with INTER_LINEAR instead
+of Lanczos: the binarization hides the difference, at a fraction of the cost. Fields without a threshold
+keep Lanczos unless their settings ask otherwise.
+"""
+
+from threading import Lock, local
+import cv2
+import numpy as np
+
+INTERPOLATIONS = {
+    "nearest": cv2.INTER_NEAREST,
+    "linear": cv2.INTER_LINEAR,
+    "cubic": cv2.INTER_CUBIC,
+    "area": cv2.INTER_AREA,
+    "lanczos": cv2.INTER_LANCZOS4,
+}
+# Settings keys read by the pipeline; anything else (e.g. the old "contrast_reduction_percentage") is ignored
+PIPELINE_KEYS = ("scale_factor", "threshold_value", "invert", "interpolation")
+
+
+class Pipeline:
+    def __init__(self, scale_factor=1, threshold_value=None, invert=False, interpolation=None):
+        """
+        A compiled preprocessing pipeline: grayscale, resize by scale_factor, then threshold or invert.
+
+        Args:
+            scale_factor (float): Resize factor (1 = no resize).
+            threshold_value (int, optional): Binarization threshold.
+            invert (bool): For dark text in the source crop: it comes out light on a dark background
+                (THRESH_BINARY_INV / 255 - gray).
+            interpolation (str, optional): Resize interpolation, see INTERPOLATIONS. Defaults to
+                "linear" for thresholded fields and "lanczos" otherwise.
+
+        The returned image is a buffer owned by the calling thread: it stays valid until the next call of
+        the same pipeline, on the same thread, with a crop of the same shape. Copy it to keep it longer.
+        """
+        self.scale_factor = scale_factor or 1
+        self.threshold_value = threshold_value
+        self.invert = bool(invert)
+        if interpolation is None:
+            interpolation = "linear" if threshold_value is not None else "lanczos"
+        self.interpolation = INTERPOLATIONS[interpolation]
+        if threshold_value is not None:
+            self.threshold_type = cv2.THRESH_BINARY_INV if self.invert else cv2.THRESH_BINARY
+        self.buffers = local()
+
+    def get_buffers(self, shape) -> tuple:
+        """
+        Return this thread's (gray, resized, output) buffers for an input shape, allocating them once.
+        """
+        buffers = getattr(self.buffers, "by_shape", None)
+        if buffers is None:
+            buffers = self.buffers.by_shape = {}
+        entry = buffers.get(shape)
+        if entry is None:
+            height, width = shape[:2]
+            size = (int(width * self.scale_factor), int(height * self.scale_factor))
+            gray = np.empty((height, width), np.uint8)
+            resized = np.empty((size[1], size[0]), np.uint8) if self.scale_factor != 1 else gray
+            output = np.empty_like(resized) if self.threshold_value is not None or self.invert else resized
+            entry = buffers[shape] = (size, gray, resized, output)
+        return entry
+
+    def __call__(self, image: np.ndarray) -> np.ndarray:
+        size, gray, resized, output = self.get_buffers(image.shape)
+        if image.ndim == 3:
+            cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=gray)
+        else:
+            gray[:] = image
+        if resized is not gray:
+            cv2.resize(gray, size, dst=resized, interpolation=self.interpolation)
+        if self.threshold_value is not None:
+            cv2.threshold(resized, self.threshold_value, 255, self.threshold_type, dst=output)
+        elif self.invert:
+            cv2.bitwise_not(resized, dst=output)
+        return output
+
+
+# Frozen settings -> compiled pipeline
+_pipelines = {}
+_pipelines_lock = Lock()
+
+
+def settings_key(process_settings) -> tuple:
+    return tuple((key, process_settings.get(key)) for key in PIPELINE_KEYS)
+
+
+def compile_pipeline(process_settings=None) -> Pipeline:
+    """
+    Return the compiled pipeline of a process_settings dict (None = plain grayscale), shared by every caller
+    with the same settings.
+    """
+    key = settings_key(process_settings or {})
+    pipeline = _pipelines.get(key)
+    if pipeline is None:
+        with _pipelines_lock:
+            pipeline = _pipelines.get(key)
+            if pipeline is None:
+                pipeline = _pipelines[key] = Pipeline(**{name: value for name, value in key if value is not None})
+    return pipeline
@@ -0,0 +1,136 @@
+"""
+rate_governor.py
+
+Polling rates derived from what the bot is doing.
+
+Polling intervals used to be fixed (sleep(0.5), sleep(2), sleep(45), ...) whether the bot was autorolling or
+sitting out a dice regeneration. The governor classifies the bot into one state:
+    BUILDING          the builder is running
+    MINIGAME          a bank heist is in progress
+    POPUP             off the home screen (popups, menus, friends list)
+    WAITING_FOR_DICE  on the home screen with no dice left
+    ROLLING           on the home screen with dice
+and every loop asks it for its interval: base interval x the state factor (STATE_FACTORS, the waiting
+factor is GOVERNOR_WAIT_FACTOR), capped at max(base, MAX_INTERVAL_S). Right after a state change the
+intervals are halved for TRANSITION_S seconds, and governor.sleep() returns early when the state
+changes, so the loops react to transitions immediately while staying slow in steady, idle states.
+"""
+
+from threading import Condition
+from os import getenv as env
+import time
+from shared_state import shared_state
+from .logger import logger
+
+ROLLING = "ROLLING"
+BUILDING = "BUILDING"
+WAITING_FOR_DICE = "WAITING_FOR_DICE"
+MINIGAME = "MINIGAME"
+POPUP = "POPUP"
+
+GOVERNOR_WAIT_FACTOR = float(env("GOVERNOR_WAIT_FACTOR", 8))
+STATE_FACTORS = {
+    ROLLING: 1.0,
+    BUILDING: 1.0,
+    WAITING_FOR_DICE: GOVERNOR_WAIT_FACTOR,
+    MINIGAME: 1.0,
+    POPUP: 1.0,
+}
+# Per-loop overrides of STATE_FACTORS, by loop name
+LOOP_FACTORS = {
+    # Nothing to spend the money on while building or waiting: the idle actions can wait
+    "idle": {BUILDING: 2.0},
+    # A heist only happens off the home screen
+    "heist": {ROLLING: 2.0, WAITING_FOR_DICE: GOVERNOR_WAIT_FACTOR, MINIGAME: 0.5},
+}
+# Rolls below which the bot waits for dice
+WAITING_ROLLS = 1
+TRANSITION_S = 5
+TRANSITION_FACTOR = 0.5
+MAX_INTERVAL_S = 60
+
+
+class RateGovernor:
+    def __init__(self):
+        """
+        Attributes:
+            state (str): The current bot state.
+            changed_at (float): When the state last changed.
+            minigame (bool): Set by the bank heist handler while a heist is in progress.
+            listeners (list): Callables notified with (old, new) on state changes.
+        """
+        self.state = ROLLING
+        self.changed_at = time.time()
+        self.minigame = False
+        self.listeners = []
+        self.condition = Condition()
+
+    def classify(self) -> str:
+        if shared_state.builder_running:
+            return BUILDING
+        if self.minigame:
+            return MINIGAME
+        if not shared_state.in_home_status:
+            return POPUP
+        rolls = shared_state.rolls
+        if rolls is not None and rolls < WAITING_ROLLS and not shared_state.rolling_status:
+            return WAITING_FOR_DICE
+        return ROLLING
+
+    def update(self) -> str:
+        """
+        Re-classify the bot state. Called by whoever changes the inputs (PlayerInfo, the builder, the
+        heist handler); wakes every governor.sleep() on a change.
+        """
+        state = self.classify()
+        with self.condition:
+            if state == self.state:
+                return state
+            previous, self.state = self.state, state
+            self.changed_at = time.time()
+            self.condition.notify_all()
+        logger.debug(f"[GOVERNOR] {previous} -> {state}")
+        for listener in self.listeners:
+            try:
+                listener(previous, state)
+            except Exception as e:
+                logger.error(f"[GOVERNOR] Listener failed: {e}")
+        return state
+
+    def set_minigame(self, active):
+        if self.minigame != active:
+            self.minigame = active
+            self.update()
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def factor(self, name=None) -> float:
+        factor = LOOP_FACTORS.get(name, {}).get(self.state, STATE_FACTORS[self.state])
+        if time.time() - self.changed_at < TRANSITION_S:
+            factor = min(factor, 1.0) * TRANSITION_FACTOR
+        return factor
+
+    def interval(self, name, base) -> float:
+        """
+        The polling interval of a loop in the current state.
+
+        Args:
+            name (str): The loop name (see LOOP_FACTORS).
+            base (float): The loop's interval at normal speed, in seconds.
+        """
+        return min(base * self.factor(name), max(base, MAX_INTERVAL_S))
+
+    def sleep(self, name, base) -> bool:
+        """
+        Sleep for the loop's interval, returning early if the bot state changes.
+
+        Returns:
+            bool: True if woken by a state change.
+        """
+        with self.condition:
+            state = self.state
+            return self.condition.wait_for(lambda: self.state != state, timeout=self.interval(name, base))
+
+
+rate_governor = RateGovernor()
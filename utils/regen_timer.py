@@ -0,0 +1,141 @@
+"""
+regen_timer.py
+
+Dice regeneration timer.
+
+With no dice left the bot used to OCR the "57:52" countdown every minute while PlayerInfo kept reading
+rolls, money and the rest several times per second, although nothing could change before the dice came
+back. The timer reads the countdown once, projects when the dice arrive and holds the perception pipeline
+(see PerceptionScheduler.hold) until REGEN_LEAD_S seconds before then; only a slow in-home check keeps
+running, so leaving the home screen (a heist, a popup) still ends the hold. The pipeline then resumes and
+a single read of rolls (or of the next countdown) confirms the projection. Holds are counted in stats(),
+logged with the perception stats.
+"""
+
+from threading import Event, Lock
+from os import getenv as env
+import re
+import time
+from .logger import logger
+
+# The pipeline resumes this many seconds before the projected regeneration
+REGEN_LEAD_S = float(env("REGEN_LEAD_S", 20))
+# Countdowns longer than this are treated as misreads (the regeneration takes at most an hour)
+REGEN_MAX_S = 3600
+
+
+def parse_countdown(text) -> int | None:
+    """
+    Parse a countdown such as "57:52" or "57.52" (minutes:seconds) into seconds.
+
+    Returns:
+        int | None: The seconds left, or None if the text is not a plausible countdown.
+    """
+    match = re.search(r"(\d{1,2})[:.](\d{2})", text or "")
+    if not match:
+        return None
+    minutes, seconds = int(match.group(1)), int(match.group(2))
+    if seconds >= 60:
+        return None
+    total = minutes * 60 + seconds
+    return total if total <= REGEN_MAX_S else None
+
+
+class RegenTimer:
+    def __init__(self, lead_s=REGEN_LEAD_S):
+        """
+        Attributes:
+            ready_at (float | None): Projected time of the next dice regeneration.
+            listeners (list): Callables notified with the hold end time when the pipeline should sleep,
+                and with None when it should resume.
+            holds (int): Number of times the pipeline was held.
+            held_s (float): Total time the pipeline was held.
+        """
+        self.lead_s = lead_s
+        self.ready_at = None
+        self.listeners = []
+        self.holds = 0
+        self.held_s = 0.0
+        self.woken = Event()
+        self.lock = Lock()
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def notify(self, until):
+        for listener in self.listeners:
+            try:
+                listener(until)
+            except Exception as e:
+                logger.error(f"[REGEN] Listener failed: {e}")
+
+    def project(self, countdown, now=None) -> float | None:
+        """
+        Project the regeneration time from a countdown read.
+
+        Args:
+            countdown (str): The countdown text (e.g. "57:52").
+
+        Returns:
+            float | None: The projected time, or None if the countdown could not be parsed.
+        """
+        seconds = parse_countdown(countdown)
+        if seconds is None:
+            return None
+        now = now or time.time()
+        with self.lock:
+            self.ready_at = now + seconds
+        return self.ready_at
+
+    def remaining(self, now=None) -> float | None:
+        """
+        Seconds left before the projected regeneration (None if there is no projection).
+        """
+        ready_at = self.ready_at
+        if ready_at is None:
+            return None
+        return max(ready_at - (now or time.time()), 0.0)
+
+    def sleep(self) -> bool:
+        """
+        Hold the perception pipeline and sleep until lead_s seconds before the projected regeneration.
+
+        Returns:
+            bool: True if it slept (False if there is no projection or it is already too close).
+        """
+        # Cleared before the projection is read: a wake() from here on either removed the projection or
+        # leaves the event set, so it cannot be lost
+        self.woken.clear()
+        remaining = self.remaining()
+        if remaining is None or remaining <= self.lead_s:
+            return False
+        duration = remaining - self.lead_s
+        until = time.time() + duration
+        logger.debug(f"[REGEN] Dice in {remaining:.0f}s, holding perception for {duration:.0f}s.")
+        self.notify(until)
+        start = time.time()
+        try:
+            self.woken.wait(timeout=duration)
+        finally:
+            self.holds += 1
+            self.held_s += time.time() - start
+            self.notify(None)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "holds": self.holds,
+            "held_s": round(self.held_s, 1),
+            "remaining_s": None if self.ready_at is None else round(self.remaining(), 1),
+        }
+
+    def wake(self):
+        """
+        End the current sleep early (e.g. dice were gained another way).
+        """
+        with self.lock:
+            self.ready_at = None
+        self.woken.set()
+
+
+regen_timer = RegenTimer()
@@ -104,6 +104,7 @@ def select_region():
             print(f"Height(%): {hp:.2f}")
             print("-" * 20)
             print(f"Tuple format: ({lp:.2f}, {tp:.2f}, {wp:.2f}, {hp:.2f})")
+            print(f"regions.json: \"region\": [{lp:.2f}, {tp:.2f}, {lp + wp:.2f}, {tp + hp:.2f}]")
             print("="*40 + "\n")
 
     except Exception as e:
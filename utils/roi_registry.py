@@ -0,0 +1,127 @@
+"""
+roi_registry.py
+
+Named screen regions (ROIs) of the game window, loaded from regions.json.
+
+Each entry has a "region" in window percentages (left, top, right, bottom) and, for OCR regions, the
+settings ocr_to_str takes ("ocr_settings", "process_settings", "charset"). Regions are compiled to
+absolute integer pixel rectangles once per window geometry, so handlers refer to regions by name and
+OCRUtils crops them from the shared frame as zero-copy views without converting percentages again.
+"""
+
+from threading import Lock
+import json
+import os
+from shared_state import shared_state
+from .logger import logger
+from .preprocess import compile_pipeline
+
+REGIONS_FILE = os.path.join(shared_state.current_path, "regions.json")
+# Keys of a region entry passed on to OCRUtils.ocr_batch
+OCR_KEYS = ("ocr_settings", "process_settings", "charset", "bright_text")
+
+
+class ROIRegistry:
+    def __init__(self, regions_file=REGIONS_FILE):
+        """
+        Attributes:
+            regions (dict): name -> region entry, as in regions.json.
+            compiled (dict): window geometry (x, y, width, height) -> {name: (left, top, right, bottom)}.
+            pipelines (dict): name -> compiled preprocessing pipeline.
+        """
+        self.regions_file = regions_file
+        self.lock = Lock()
+        self.regions = {}
+        self.compiled = {}
+        self.pipelines = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.regions_file, "r") as f:
+                regions = json.load(f)
+        except Exception as e:
+            logger.error(f"[ROI] Failed to load {self.regions_file}: {e}")
+            regions = {}
+        with self.lock:
+            self.regions = regions
+            self.compiled = {}
+            self.pipelines = {}
+        logger.debug(f"[ROI] Loaded {len(regions)} regions from {self.regions_file}.")
+
+    def compile(self, window) -> dict:
+        """
+        Return every region as absolute (left, top, right, bottom) pixels for a window geometry.
+
+        Args:
+            window (tuple): The window geometry (x, y, width, height).
+        """
+        window = tuple(window)
+        compiled = self.compiled.get(window)
+        if compiled is None:
+            x, y, width, height = window
+            with self.lock:
+                compiled = self.compiled[window] = {
+                    name: (
+                        int(x + width * (entry["region"][0] / 100)),
+                        int(y + height * (entry["region"][1] / 100)),
+                        int(x + width * (entry["region"][2] / 100)),
+                        int(y + height * (entry["region"][3] / 100)),
+                    )
+                    for name, entry in self.regions.items()
+                }
+        return compiled
+
+    def rect(self, name, window=None) -> tuple:
+        """
+        Return the absolute (left, top, right, bottom) pixels of a region. window defaults to the game window.
+        """
+        return self.compile(window if window is not None else shared_state.window)[name]
+
+    def center(self, name, window=None) -> tuple:
+        """
+        Return the absolute (x, y) center of a region, e.g. to click it.
+        """
+        left, top, right, bottom = self.rect(name, window)
+        return (left + right) // 2, (top + bottom) // 2
+
+    def ocr_settings(self, name) -> dict:
+        """
+        Return the OCR settings of a region, in the form OCRUtils.ocr_batch takes.
+        """
+        entry = self.regions[name]
+        return {key: entry[key] for key in OCR_KEYS if key in entry}
+
+    def pipeline(self, name):
+        """
+        Return the compiled preprocessing pipeline of a region (see preprocess.py).
+        """
+        pipeline = self.pipelines.get(name)
+        if pipeline is None:
+            pipeline = self.pipelines[name] = compile_pipeline(self.regions[name].get("process_settings"))
+        return pipeline
+
+    def update(self, name, save=True, **settings):
+        """
+        Change the settings of a region (e.g. tuned OCR settings), optionally writing regions.json.
+        """
+        with self.lock:
+            self.regions.setdefault(name, {}).update(settings)
+            self.compiled = {}
+            self.pipelines = {}
+            if save:
+                self.save()
+
+    def save(self):
+        with self.lock:
+            try:
+                # Write to a temporary file first so a crash never leaves a truncated file
+                tmp_file = self.regions_file + ".tmp"
+                with open(tmp_file, "w") as f:
+                    json.dump(self.regions, f, indent=4)
+                os.replace(tmp_file, self.regions_file)
+            except Exception as e:
+                logger.error(f"[ROI] Failed to save {self.regions_file}: {e}")
+
+
+roi_registry = ROIRegistry()
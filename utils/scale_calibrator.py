@@ -0,0 +1,132 @@
+"""
+scale_calibrator.py
+
+Learns the template scale of the current BlueStacks window so find_template can match at a single scale.
+
+The emulator resolution is fixed for a given window, so every template appears at the same scale:
+one scale is learned for the window and shared by all templates (they were all cut at the same
+resolution). Until that scale is known, find_template sweeps the full range of scales. Hits of the
+anchor templates (GO button, home icon) during those sweeps are collected, and once enough of them
+agree the scale is locked and stored in the per-window data file. A new full sweep only happens when:
+    - the frame size differs from the window size the scale was learned on (resize; the live frame
+      source follows the window geometry, see MssFrameSource), or
+    - the anchors miss MISS_STREAK_LIMIT times in a row at the learned scale; one verification
+      sweep then either confirms the scale, learns a new one, or shows the anchor is simply absent.
+"""
+
+from threading import Lock
+from os import getenv as env
+import os
+import numpy as np
+from .window_data import window_data
+from .logger import logger
+
+# Scales swept when the window scale is unknown: 80% to 120% in 11 steps, plus the exact 1.0
+FULL_SWEEP_SCALES = sorted(set(np.round(np.append(np.linspace(0.8, 1.2, 11), 1.0), 4)))
+ANCHOR_TEMPLATES = ("go.png", "in-home-icon.png")
+MISS_STREAK_LIMIT = int(env("SCALE_MISS_STREAK_LIMIT", 30))
+# Number of agreeing anchor hits needed to lock a scale
+CONFIRMATIONS = 3
+
+
+class ScaleCalibrator:
+    def __init__(self, anchors=ANCHOR_TEMPLATES, miss_streak_limit=MISS_STREAK_LIMIT):
+        """
+        Attributes:
+            scale (float | None): The learned scale, None while uncalibrated.
+            window_size (tuple | None): The (width, height) the scale was learned on.
+            miss_streak (int): Consecutive anchor misses at the learned scale.
+        """
+        self.anchors = anchors
+        self.miss_streak_limit = miss_streak_limit
+        self.lock = Lock()
+        calibration = window_data.get("calibration", {})
+        self.scale = calibration.get("scale")
+        self.window_size = tuple(calibration["window_size"]) if calibration.get("window_size") else None
+        self.miss_streak = 0
+        self.verify_sweep = False
+        self.anchor_scales = []
+        if self.scale is not None:
+            logger.debug(f"[CALIBRATION] Loaded scale {self.scale:.2f} for window {self.window_size}.")
+
+    def is_anchor(self, template_path):
+        return template_path is not None and os.path.basename(template_path) in self.anchors
+
+    def scales_for(self, template_path, window_size):
+        """
+        Get the scales find_template should try.
+
+        Args:
+            template_path (str | None): The template path (None if the template is not cached).
+            window_size (tuple): The current (width, height) of the window.
+
+        Returns:
+            tuple: (list of scales, True if this is a full sweep)
+        """
+        with self.lock:
+            if self.scale is not None and tuple(window_size) != self.window_size:
+                logger.info(
+                    f"[CALIBRATION] Window size changed {self.window_size} -> {tuple(window_size)}. Recalibrating..."
+                )
+                self.reset()
+            if self.scale is None:
+                return FULL_SWEEP_SCALES, True
+            if self.verify_sweep and self.is_anchor(template_path):
+                return FULL_SWEEP_SCALES, True
+            return [self.scale], False
+
+    def observe(self, template_path, window_size, best_scale, hit, swept):
+        """
+        Record the outcome of a find_template call.
+
+        Args:
+            template_path (str | None): The template path.
+            window_size (tuple): The (width, height) of the window.
+            best_scale (float): The scale of the best match.
+            hit (bool): True if the best match exceeded the threshold.
+            swept (bool): True if the call swept all scales.
+        """
+        if not self.is_anchor(template_path):
+            return
+        with self.lock:
+            if swept:
+                if self.verify_sweep:
+                    self.verify_sweep = False
+                    self.miss_streak = 0
+                    if hit and abs(best_scale - self.scale) > 1e-3:
+                        logger.info(f"[CALIBRATION] Scale drifted {self.scale:.2f} -> {best_scale:.2f}.")
+                        self.reset()
+                    else:
+                        return
+                if hit:
+                    self.anchor_scales.append(round(float(best_scale), 4))
+                    self.anchor_scales = self.anchor_scales[-CONFIRMATIONS:]
+                    if len(self.anchor_scales) == CONFIRMATIONS and len(set(self.anchor_scales)) == 1:
+                        self.lock_scale(self.anchor_scales[0], window_size)
+            elif hit:
+                self.miss_streak = 0
+            else:
+                self.miss_streak += 1
+                if self.miss_streak >= self.miss_streak_limit:
+                    logger.debug(
+                        f"[CALIBRATION] {self.miss_streak} anchor misses at scale {self.scale:.2f}. Verifying with a full sweep..."
+                    )
+                    self.verify_sweep = True
+                    self.miss_streak = 0
+
+    def lock_scale(self, scale, window_size):
+        self.scale = scale
+        self.window_size = tuple(window_size)
+        self.anchor_scales = []
+        logger.info(f"[CALIBRATION] Learned template scale {scale:.2f} for window {self.window_size}.")
+        window_data.set("calibration", {"scale": scale, "window_size": list(self.window_size)})
+
+    def reset(self):
+        self.scale = None
+        self.window_size = None
+        self.miss_streak = 0
+        self.verify_sweep = False
+        self.anchor_scales = []
+
+
+scale_calibrator = ScaleCalibrator()
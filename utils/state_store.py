@@ -0,0 +1,165 @@
+"""
+state_store.py
+
+Observable, versioned store for the bot state shared between threads (money, rolls, running flags, ...).
+
+SharedState used to hold these as plain attributes next to one Condition per field, and consumers called
+wait() without a predicate: they could miss an update published before they started waiting, or handle
+the same value twice when it was published again. In the store every field carries:
+    - version: incremented on every change of the value (writing the same value again does not count),
+    - updated_at: when the value was last written, changed or not (how fresh it is).
+Consumers either remember the version they handled and call wait_for_change(field, since_version,
+timeout), which returns at once if they are behind, or subscribe a callback. get_snapshot() returns a
+consistent view of every field taken under a single lock.
+
+The handlers that still wait on the per-field Conditions of SharedState (shared_state.rolls_condition,
+...) get them from field_condition(field): FieldConditions the store notifies on every write of their field,
+so writers only set the field.
+"""
+
+from threading import Condition
+import time
+from .logger import logger
+
+
+class StateField:
+    def __init__(self, value, version, updated_at):
+        """
+        One version of a field. A change of the value replaces the StateField (writing the same value only
+        refreshes updated_at), so snapshots can share them.
+
+        Attributes:
+            value: The field value.
+            version (int): Number of changes of the value.
+            updated_at (float): When the value was last written.
+        """
+        self.value = value
+        self.version = version
+        self.updated_at = updated_at
+
+    def __repr__(self):
+        return f"StateField({self.value!r}, version={self.version})"
+
+
+class FieldCondition(Condition):
+    """
+    A threading.Condition notified by the store on every write of its field, changed or not (like the
+    notify_all() that used to follow each write, so plain wait() callers also see republished values).
+    """
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+
+class StateStore:
+    def __init__(self, fields):
+        """
+        Args:
+            fields (dict): name -> (type or tuple of types, initial value). None is always accepted.
+
+        Attributes:
+            types (dict): name -> accepted types.
+            fields (dict): name -> current StateField.
+            version (int): Number of changes across all fields.
+            subscribers (dict): name (None for every field) -> callables notified with (name, old, new).
+            conditions (dict): name -> FieldCondition, see field_condition().
+        """
+        now = time.time()
+        self.types = {name: types for name, (types, _) in fields.items()}
+        self.fields = {name: StateField(initial, 0, now) for name, (_, initial) in fields.items()}
+        self.version = 0
+        self.subscribers = {}
+        self.conditions = {}
+        self.condition = Condition()
+
+    def get(self, name):
+        return self.fields[name].value
+
+    def field(self, name) -> StateField:
+        return self.fields[name]
+
+    def set(self, name, value) -> bool:
+        """
+        Write a field, waking every waiter and subscriber if the value changed, and the FieldCondition
+        of the field in any case.
+
+        Returns:
+            bool: True if the value changed.
+        Raises:
+            KeyError: Unknown field.
+            TypeError: The value does not have the field type.
+        """
+        types = self.types[name]
+        if value is not None and not isinstance(value, types):
+            raise TypeError(f"State field {name} expects {types}, got {type(value).__name__}")
+        with self.condition:
+            old = self.fields[name]
+            now = time.time()
+            changed = old.value != value
+            if changed:
+                self.version += 1
+                self.fields[name] = StateField(value, old.version + 1, now)
+                self.condition.notify_all()
+            else:
+                old.updated_at = now
+            field_condition = self.conditions.get(name)
+        if field_condition is not None:
+            with field_condition:
+                field_condition.notify_all()
+        if not changed:
+            return False
+        for callback in self.subscribers.get(name, []) + self.subscribers.get(None, []):
+            try:
+                callback(name, old.value, value)
+            except Exception as e:
+                logger.error(f"[STATE] Subscriber of {name} failed: {e}")
+        return True
+
+    def get_snapshot(self) -> dict:
+        """
+        Return name -> StateField for every field, all taken at the same instant.
+        """
+        with self.condition:
+            return dict(self.fields)
+
+    def current_version(self, name=None) -> int:
+        return self.version if name is None else self.fields[name].version
+
+    def wait_for_change(self, name, since_version, timeout=None) -> int:
+        """
+        Wait until a field (or any field, if name is None) changed past since_version.
+
+        Args:
+            name (str | None): The field name, None for the whole store.
+            since_version (int): The last version the caller handled.
+            timeout (float, optional): Maximum wait in seconds.
+
+        Returns:
+            int: The current version (equal to since_version on timeout).
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.current_version(name) != since_version, timeout=timeout)
+            return self.current_version(name)
+
+    def field_condition(self, name) -> FieldCondition:
+        """
+        Return the FieldCondition of a field (always the same one).
+
+        Raises:
+            KeyError: Unknown field.
+        """
+        if name not in self.fields:
+            raise KeyError(name)
+        with self.condition:
+            if name not in self.conditions:
+                self.conditions[name] = FieldCondition(name)
+            return self.conditions[name]
+
+    def subscribe(self, name, callback):
+        """
+        Call callback(name, old, new) after every change of a field (of every field if name is None).
+        Callbacks run on the writer's thread and must not block.
+        """
+        with self.condition:
+            self.subscribers[name] = self.subscribers.get(name, []) + [callback]
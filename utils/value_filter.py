@@ -0,0 +1,119 @@
+"""
+value_filter.py
+
+Temporal filtering of the numeric HUD values read by PlayerInfo (money, rolls, multiplier).
+
+A single misread (a dropped digit, "35/50" read as "5/50") used to be published right away and could start
+the builder or flip the multiplier. Each field now has a ValueFilter:
+    - reads below min_confidence (e.g. text full of characters the field cannot contain) are dropped,
+    - a change within the plausible bounds of the field (max_rate units per second, max_ratio relative
+      change) is published at once,
+    - with no stable value yet (initial=None), the first value is only published once `votes` reads agree,
+    - any other change is only published once `votes` of the last `window` reads agree on it,
+so isolated misreads never reach shared_state while real jumps (a big reward, a build) still land
+within a couple of reads.
+"""
+
+from collections import deque
+from threading import Lock
+import time
+from .logger import logger
+
+
+def text_confidence(text, charset) -> float:
+    """
+    Fraction of the non-blank characters of an OCR result that the field can contain (0 for empty text).
+    """
+    characters = [c for c in text or "" if not c.isspace()]
+    if not characters:
+        return 0.0
+    return sum(1 for c in characters if c in charset) / len(characters)
+
+
+class ValueFilter:
+    def __init__(self, name, initial=None, max_rate=None, max_ratio=None, valid=None, votes=2, window=3, min_confidence=0.8):
+        """
+        Args:
+            name (str): The field name (for logging).
+            initial (int, optional): The value published before the first stable read.
+            max_rate (float | callable, optional): Largest plausible change per second, in units of the value,
+                or a callable returning it (for bounds that depend on another field).
+            max_ratio (float, optional): Largest plausible relative change (new / old or old / new).
+            valid (callable, optional): value -> bool, values it rejects are dropped.
+            votes (int): Agreeing reads needed to publish an implausible change.
+            window (int): Number of recent reads the votes are counted in.
+            min_confidence (float): Reads below this confidence are dropped.
+
+        Attributes:
+            value: The published (stable) value.
+            published_at (float): When value was last confirmed.
+            accepted (int): Reads published immediately or confirming the value.
+            voted (int): Changes published after a vote.
+            rejected (int): Reads dropped (low confidence, invalid or outvoted).
+            last_rejected (bool): Whether the last read was dropped.
+        """
+        self.name = name
+        self.max_rate = max_rate
+        self.max_ratio = max_ratio
+        self.valid = valid
+        self.votes = votes
+        self.min_confidence = min_confidence
+        self.value = initial
+        self.published_at = time.time()
+        self.recent = deque(maxlen=window)
+        self.accepted = 0
+        self.voted = 0
+        self.rejected = 0
+        self.last_rejected = False
+        self.lock = Lock()
+
+    def plausible(self, value, now) -> bool:
+        if self.value is None:
+            return False
+        if value == self.value:
+            return True
+        max_rate = self.max_rate() if callable(self.max_rate) else self.max_rate
+        if max_rate is not None and abs(value - self.value) <= max_rate * max(now - self.published_at, 1):
+            return True
+        if self.max_ratio is not None and self.value > 0 and value > 0:
+            ratio = value / self.value
+            return 1 / self.max_ratio <= ratio <= self.max_ratio
+        return False
+
+    def update(self, value, confidence=1.0, now=None):
+        """
+        Feed a new read (None for an unreadable field) and return the published value.
+        """
+        now = now or time.time()
+        with self.lock:
+            self.last_rejected = True
+            if value is None or confidence < self.min_confidence or (self.valid and not self.valid(value)):
+                self.rejected += 1
+                return self.value
+            self.recent.append(value)
+            if self.plausible(value, now):
+                self.accepted += 1
+            elif sum(1 for recent in self.recent if recent == value) >= self.votes:
+                logger.debug(f"[FILTER] {self.name}: {self.value} -> {value} confirmed by {self.votes} reads.")
+                self.voted += 1
+            else:
+                self.rejected += 1
+                return self.value
+            self.last_rejected = False
+            self.value = value
+            self.published_at = now
+            return self.value
+
+    @property
+    def rejection_rate(self) -> float:
+        total = self.accepted + self.voted + self.rejected
+        return self.rejected / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "value": self.value,
+            "accepted": self.accepted,
+            "voted": self.voted,
+            "rejected": self.rejected,
+            "rejection_rate": round(self.rejection_rate, 3),
+        }
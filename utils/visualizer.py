@@ -1,9 +1,8 @@
 from threading import Thread, Event
 import cv2
-import numpy as np
 import time
-from mss import mss
 from shared_state import shared_state
+from .frame_bus import frame_bus
 
 class Visualizer:
     def __init__(self):
@@ -19,95 +18,85 @@ class Visualizer:
         self._visualization_loop()
 
     def _visualization_loop(self):
-        with mss() as sct:
-            while self.running and not self.stop_event.is_set():
-                start_time = time.time()
-                
-                try:
-                    # 1. Capture Screen
-                    monitor = {
-                        "top": shared_state.window_y,
-                        "left": shared_state.window_x,
-                        "width": shared_state.window_width,
-                        "height": shared_state.window_height
-                    }
-                    if monitor["width"] <= 0 or monitor["height"] <= 0:
-                         # Skip if invalid dimensions (e.g. minimized or calculating)
-                         time.sleep(1)
-                         continue
-                         
-                    sct_img = sct.grab(monitor)
-                    frame = np.array(sct_img)
-                    frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR) # OpenCV uses BGR
+        while self.running and not self.stop_event.is_set():
+            start_time = time.time()
+            
+            try:
+                # 1. Capture Screen
+                if shared_state.window_width <= 0 or shared_state.window_height <= 0:
+                     # Skip if invalid dimensions (e.g. minimized or calculating)
+                     time.sleep(1)
+                     continue
 
-                    # 2. Draw Overlays
-                    # Clean up old overlays (older than 2 seconds)
-                    current_time = time.time()
-                    shared_state.debug_overlays = [
-                        o for o in shared_state.debug_overlays 
-                        if current_time - o[2] < 2.0
-                    ]
+                # Reuse the shared frame of the current tick; copy it since we draw on it
+                shared_frame = frame_bus.get_frame(max_age_ms=self.frame_delay * 1000)
+                if shared_frame is None:
+                     time.sleep(1)
+                     continue
+                frame = shared_frame.image.copy()
 
-                    for overlay in shared_state.debug_overlays:
-                        rect_or_point, label, timestamp = overlay
-                        
-                        # Check if it's a point (tuple of 2) or rect (tuple of 4)
-                        if len(rect_or_point) == 2:
-                             # Point
-                             x, y = rect_or_point
-                             # Adjust relative to window if needed? 
-                             # Assuming points stored are absolute (screen coords)
-                             # Convert to window relative for drawing
-                             rel_x = x - shared_state.window_x
-                             rel_y = y - shared_state.window_y
-                             
-                             cv2.circle(frame, (rel_x, rel_y), 5, (0, 0, 255), -1)
-                             cv2.putText(frame, label, (rel_x + 10, rel_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-                             
-                        elif len(rect_or_point) == 4:
-                             # Rect (x, y, w, h) - assuming absolute screen coords for x,y
-                             x, y, w, h = rect_or_point
-                             rel_x = x - shared_state.window_x
-                             rel_y = y - shared_state.window_y
-                             
-                             cv2.rectangle(frame, (rel_x, rel_y), (rel_x + w, rel_y + h), (0, 255, 0), 2)
-                             cv2.putText(frame, label, (rel_x, rel_y - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+                # 2. Draw Overlays
+                # The buffer only yields the overlays of the last OVERLAY_TTL_S seconds (see overlay_buffer.py)
+                for overlay in shared_state.debug_overlays:
+                    rect_or_point, label, timestamp = overlay
+                    
+                    # Check if it's a point (tuple of 2) or rect (tuple of 4)
+                    if len(rect_or_point) == 2:
+                         # Point
+                         x, y = rect_or_point
+                         # Adjust relative to window if needed? 
+                         # Assuming points stored are absolute (screen coords)
+                         # Convert to window relative for drawing
+                         rel_x = x - shared_state.window_x
+                         rel_y = y - shared_state.window_y
+                         
+                         cv2.circle(frame, (rel_x, rel_y), 5, (0, 0, 255), -1)
+                         cv2.putText(frame, label, (rel_x + 10, rel_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+                         
+                    elif len(rect_or_point) == 4:
+                         # Rect (x, y, w, h) - assuming absolute screen coords for x,y
+                         x, y, w, h = rect_or_point
+                         rel_x = x - shared_state.window_x
+                         rel_y = y - shared_state.window_y
+                         
+                         cv2.rectangle(frame, (rel_x, rel_y), (rel_x + w, rel_y + h), (0, 255, 0), 2)
+                         cv2.putText(frame, label, (rel_x, rel_y - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
 
-                    # 3. Draw Logs - REMOVED per user request
-                    # y_offset = frame.shape[0] - 20
-                    # for log in reversed(shared_state.recent_logs):
-                    #     ...
+                # 3. Draw Logs - REMOVED per user request
+                # y_offset = frame.shape[0] - 20
+                # for log in reversed(shared_state.recent_logs):
+                #     ...
 
-                    
-                    # Draw Status
-                    if hasattr(shared_state, "bot_status") and shared_state.bot_status:
-                         status_text = f"STATUS: {shared_state.bot_status}"
-                         # Draw black background
-                         (text_w, text_h), baseline = cv2.getTextSize(status_text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
-                         cv2.rectangle(frame, (5, 5), (5 + text_w + 10, 5 + text_h + 10), (0, 0, 0), -1)
-                         # Draw text
-                         color = (0, 255, 0) # Green
-                         if "PAUSED" in shared_state.bot_status or "WAIT" in shared_state.bot_status:
-                              color = (0, 0, 255) # Red
-                         cv2.putText(frame, status_text, (10, 5 + text_h), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+                
+                # Draw Status
+                if hasattr(shared_state, "bot_status") and shared_state.bot_status:
+                     status_text = f"STATUS: {shared_state.bot_status}"
+                     # Draw black background
+                     (text_w, text_h), baseline = cv2.getTextSize(status_text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)
+                     cv2.rectangle(frame, (5, 5), (5 + text_w + 10, 5 + text_h + 10), (0, 0, 0), -1)
+                     # Draw text
+                     color = (0, 255, 0) # Green
+                     if "PAUSED" in shared_state.bot_status or "WAIT" in shared_state.bot_status:
+                          color = (0, 0, 255) # Red
+                     cv2.putText(frame, status_text, (10, 5 + text_h), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
 
-                    # 4. Show Frame
-                    cv2.imshow(self.window_name, frame)
-                    
-                    # Handle quit
-                    if cv2.waitKey(1) & 0xFF == ord('q'):
-                        self.stop()
-                        break
+                # 4. Show Frame
+                cv2.imshow(self.window_name, frame)
+                
+                # Handle quit
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    self.stop()
+                    break
 
-                except Exception as e:
-                    print(f"[VISUALIZER] Error: {e}")
-                    time.sleep(1)
+            except Exception as e:
+                print(f"[VISUALIZER] Error: {e}")
+                time.sleep(1)
 
-                # Cap FPS
-                elapsed = time.time() - start_time
-                if elapsed < self.frame_delay:
-                    time.sleep(self.frame_delay - elapsed)
-        
+            # Cap FPS
+            elapsed = time.time() - start_time
+            if elapsed < self.frame_delay:
+                time.sleep(self.frame_delay - elapsed)
+    
         cv2.destroyAllWindows()
 
     def stop(self):
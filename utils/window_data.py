@@ -0,0 +1,62 @@
+"""
+window_data.py
+
+Per-window persistent data for the vision pipeline (learned template scale, detection statistics, ...).
+Stored as JSON next to the per-window game data file, named "<WINDOW_TITLE>_vision_data.json".
+The game data file itself is a list of boards, so vision data lives in its own file.
+"""
+
+from threading import RLock
+import json
+import os
+from shared_state import shared_state
+from .logger import logger
+
+
+class WindowData:
+    def __init__(self, data_file):
+        """
+        A JSON dictionary of named sections, shared by all threads.
+
+        Args:
+            data_file (str): The JSON file to load from and save to.
+        """
+        self.data_file = data_file
+        self.lock = RLock()
+        self.data = self.load_data()
+
+    def load_data(self):
+        try:
+            with open(self.data_file, "r") as f:
+                data = json.load(f)
+                logger.debug(f"[WINDOW-DATA] Loaded data from {self.data_file}.")
+                return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"[WINDOW-DATA] Failed to load {self.data_file}: {e}")
+            return {}
+
+    def get(self, section, default=None):
+        with self.lock:
+            return self.data.get(section, default)
+
+    def set(self, section, value, save=True):
+        with self.lock:
+            self.data[section] = value
+            if save:
+                self.save_data()
+
+    def save_data(self):
+        with self.lock:
+            try:
+                # Write to a temporary file first so a crash never leaves a truncated file
+                tmp_file = self.data_file + ".tmp"
+                with open(tmp_file, "w") as f:
+                    json.dump(self.data, f, indent=4)
+                os.replace(tmp_file, self.data_file)
+            except Exception as e:
+                logger.error(f"[WINDOW-DATA] Failed to save {self.data_file}: {e}")
+
+
+window_data = WindowData(str(shared_state.WINDOW_TITLE.strip()) + "_vision_data.json")